@@ -28,6 +28,12 @@ import { GridLoader, ClipLoader } from 'react-spinners';
 import { Link } from 'react-router-dom';
 
 const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000';
+// Enough for the first paint; logs and config are fetched separately once the page is up
+const RUN_SUMMARY_FIELDS = [
+  'dagster_run_id', 'workflow_id', 'workflow_name', 'workflow_description', 'run_name',
+  'triggered_by_email', 'triggered_by_username', 'started_at', 'finished_at', 'error_message',
+  'input_file_path', 'output_file_path'
+].join(',');
 
 // Custom Tooltip Component
 const CustomTooltip = ({ content, children }) => {
@@ -278,6 +284,7 @@ const Run = () => {
   const [downloadLoading, setDownloadLoading] = useState({});
   const [error, setError] = useState(null);
   const [expandedLogs, setExpandedLogs] = useState({});
+  const [eventDetails, setEventDetails] = useState({});
   const [activeSection, setActiveSection] = useState('summary');
 
   // Scroll spy functionality
@@ -320,7 +327,7 @@ const Run = () => {
         navigate('/login', { replace: true });
         return;
       }
-      const response = await fetch(`${API_BASE_URL}/runs/run/${runId}`, {
+      const response = await fetch(`${API_BASE_URL}/runs/run/${runId}?fields=${RUN_SUMMARY_FIELDS}&include=steps`, {
         headers: {
           'accept': 'application/json',
           'Authorization': `Bearer ${accessToken}`,
@@ -352,16 +359,7 @@ const Run = () => {
             }))
           },
           eventConnection: {
-            events: (data.logs || []).map(log => ({
-              id: log.id,
-              __typename: log.event_type || 'UnknownEvent',
-              message: log.message || 'No message',
-              timestamp: log.timestamp ? String(new Date(log.timestamp).getTime()) : null,
-              level: log.log_level || 'INFO',
-              stepKey: log.step_code,
-              dagster_run_id: log.dagster_run_id,
-              event_data: log.event_data || {}
-            }))
+            events: []
           },
           workflow_id: data.run.workflow_id,
           triggered_by_email: data.run.triggered_by_email,
@@ -372,10 +370,12 @@ const Run = () => {
           error_message: data.run.error_message,
           input_file_path: data.run.input_file_path,
           output_file_path: data.run.output_file_path,
-          config_used: data.run.config_used
+          config_used: null
         }
       };
       setRunData(transformedData.pipelineRunOrError);
+      fetchRunLogs(accessToken);
+      fetchRunConfig(accessToken);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -383,6 +383,48 @@ const Run = () => {
     }
   };
 
+  const fetchRunLogs = async (accessToken) => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/runs/run/${runId}/logs?limit=100`, {
+        headers: {
+          'accept': 'application/json',
+          'Authorization': `Bearer ${accessToken}`,
+        }
+      });
+      if (!response.ok) throw new Error(`Failed to fetch run logs: ${response.statusText}`);
+      const data = await response.json();
+      const events = (data.logs || []).map(log => ({
+        id: log.id,
+        __typename: log.event_type || 'UnknownEvent',
+        message: log.message || 'No message',
+        timestamp: log.timestamp ? String(new Date(log.timestamp).getTime()) : null,
+        level: log.log_level || 'INFO',
+        stepKey: log.step_code,
+        dagster_run_id: log.dagster_run_id,
+        event_data: log.event_data || {}
+      }));
+      setRunData(prev => prev && { ...prev, eventConnection: { events } });
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
+  const fetchRunConfig = async (accessToken) => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/runs/run/${runId}/config`, {
+        headers: {
+          'accept': 'application/json',
+          'Authorization': `Bearer ${accessToken}`,
+        }
+      });
+      if (!response.ok) throw new Error(`Failed to fetch run config: ${response.statusText}`);
+      const data = await response.json();
+      setRunData(prev => prev && { ...prev, config_used: data.config_used });
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchRunData();
   }, [runId, navigate]);
@@ -457,11 +499,28 @@ const Run = () => {
     }
   };
 
-  const toggleLogExpansion = (logId) => {
+  const toggleLogExpansion = async (event) => {
+    const expanding = !expandedLogs[event.id];
     setExpandedLogs(prev => ({
       ...prev,
-      [logId]: !prev[logId]
+      [event.id]: !prev[event.id]
     }));
+    // Payloads stored out of line are only fetched when an event is first expanded
+    if (!expanding || !event.event_data?._blob || eventDetails[event.id]) return;
+    try {
+      const accessToken = localStorage.getItem('access_token');
+      const response = await fetch(`${API_BASE_URL}/runs/run/${runId}/logs/${event.id}/event`, {
+        headers: {
+          'accept': 'application/json',
+          'Authorization': `Bearer ${accessToken}`,
+        }
+      });
+      if (!response.ok) throw new Error(`Failed to fetch event details: ${response.statusText}`);
+      const data = await response.json();
+      setEventDetails(prev => ({ ...prev, [event.id]: data.event_data || {} }));
+    } catch (err) {
+      console.error(err);
+    }
   };
 
   const getFirstNameFromEmail = (email) => {
@@ -1138,7 +1197,7 @@ const Run = () => {
                       return (
                         <div key={event.id} className="sg-dataset-tile p-0">
                           <button
-                            onClick={() => toggleLogExpansion(event.id)}
+                            onClick={() => toggleLogExpansion(event)}
                             className="w-full flex justify-between items-center p-6 hover:bg-gray-50 rounded transition-colors text-left"
                           >
                             <div className="flex items-center gap-3">
@@ -1156,7 +1215,7 @@ const Run = () => {
                             </div>
                           </button>
                           {expandedLogs[event.id] && (
-                            <LogEventDetails event={event} />
+                            <LogEventDetails event={eventDetails[event.id] ? { ...event, event_data: eventDetails[event.id] } : event} />
                           )}
                         </div>
                       );
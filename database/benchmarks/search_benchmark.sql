@@ -0,0 +1,75 @@
+-- Search index benchmark for GET /runs and GET /workflows.
+--
+-- Loads 10M synthetic runs and 50k workflows, then prints plans for the search
+-- predicates built by server/app/search.py. Everything runs in one transaction
+-- and is rolled back, so it is safe against a development database. Expect the
+-- load to take a few minutes.
+--
+--   psql "$DATABASE_URL" -f database/benchmarks/search_benchmark.sql
+--
+-- What to look for:
+--   numeric run search   -> BitmapOr over run_pkey and idx_run_workflow_id_started_at
+--   text run search      -> Bitmap Index Scan on idx_run_status_trgm
+--   workflow search      -> BitmapOr over idx_workflow_name_trgm and idx_workflow_description_trgm
+--   legacy id::text ILIKE (for comparison) -> Seq Scan
+
+\timing on
+
+BEGIN;
+
+SET LOCAL synchronous_commit = off;
+
+INSERT INTO workflow.workflow (name, description, created_by, status)
+SELECT 'Benchmark workflow ' || i,
+       'Loads ' || (ARRAY['customer', 'invoice', 'ledger', 'payroll', 'inventory'])[1 + i % 5]
+           || ' data for region ' || (i % 97),
+       (SELECT MIN(id) FROM workflow."user"),
+       'ready'
+FROM generate_series(1, 50000) AS i;
+
+INSERT INTO workflow.run (dagster_run_id, workflow_id, started_at, finished_at, status)
+SELECT md5('benchmark-' || i),
+       NULL,
+       NOW() - (i || ' seconds')::interval,
+       NOW() - (i || ' seconds')::interval + interval '90 seconds',
+       (ARRAY['Completed', 'Failed', 'Running', 'Cancelled', 'Pending'])[1 + i % 5]
+FROM generate_series(1, 10000000) AS i;
+
+ANALYZE workflow.run;
+ANALYZE workflow.workflow;
+
+-- Numeric fast path: exact id / workflow_id match
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.id FROM workflow.run a
+WHERE (a.id = 4242 OR a.workflow_id = 4242)
+ORDER BY a.started_at DESC, a.id DESC
+LIMIT 11;
+
+-- Text search on status
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.id FROM workflow.run a
+WHERE a.status ILIKE '%cancel%'
+ORDER BY a.started_at DESC, a.id DESC
+LIMIT 11;
+
+-- Workflow name/description search
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.id FROM workflow.workflow a
+WHERE (a.name ILIKE '%workflow 4242%' OR a.description ILIKE '%workflow 4242%')
+ORDER BY a.created_at DESC, a.id DESC
+LIMIT 11;
+
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.id FROM workflow.workflow a
+WHERE (a.name ILIKE '%payroll%' OR a.description ILIKE '%payroll%')
+ORDER BY a.created_at DESC, a.id DESC
+LIMIT 11;
+
+-- Previous predicate, for comparison
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.id FROM workflow.run a
+WHERE (a.id::text ILIKE '%4242%' OR a.workflow_id::text ILIKE '%4242%' OR a.status ILIKE '%4242%')
+ORDER BY a.started_at DESC, a.id DESC
+LIMIT 11;
+
+ROLLBACK;
@@ -0,0 +1,92 @@
+-- Convert workflow.run_log to a table partitioned by month on "timestamp".
+-- Requires workflow.ensure_run_log_partitions from schema.sql. Run during a quiet
+-- period: rows are copied into the new table inside one transaction.
+
+BEGIN;
+
+ALTER TABLE workflow.run_log RENAME TO run_log_unpartitioned;
+ALTER TABLE workflow.run_log_unpartitioned DROP CONSTRAINT run_log_pkey;
+ALTER TABLE workflow.run_log_unpartitioned DROP CONSTRAINT run_log_unique_event;
+ALTER TABLE workflow.run_log_unpartitioned DROP CONSTRAINT fk_run_log_run;
+ALTER TABLE workflow.run_log_unpartitioned DROP CONSTRAINT run_log_workflow_id_fkey;
+DROP INDEX IF EXISTS workflow.idx_run_log_dagster_run_id;
+DROP INDEX IF EXISTS workflow.idx_run_log_event_type;
+DROP INDEX IF EXISTS workflow.idx_run_log_run_id;
+DROP INDEX IF EXISTS workflow.idx_run_log_step_code;
+
+CREATE TABLE workflow.run_log (
+    id bigint NOT NULL,
+    dagster_run_id character varying(255) NOT NULL,
+    workflow_id integer,
+    step_code character varying(255),
+    log_level character varying(50),
+    message text NOT NULL,
+    "timestamp" timestamp with time zone DEFAULT now() NOT NULL,
+    run_id bigint,
+    event_data jsonb DEFAULT '{}'::jsonb,
+    event_type character varying(100)
+)
+PARTITION BY RANGE ("timestamp");
+
+ALTER TABLE workflow.run_log OWNER TO postgres;
+
+ALTER SEQUENCE workflow.run_log_id_seq AS bigint;
+ALTER SEQUENCE workflow.run_log_id_seq OWNED BY workflow.run_log.id;
+ALTER TABLE ONLY workflow.run_log ALTER COLUMN id SET DEFAULT nextval('workflow.run_log_id_seq'::regclass);
+
+CREATE TABLE workflow.run_log_default PARTITION OF workflow.run_log DEFAULT;
+ALTER TABLE workflow.run_log_default OWNER TO postgres;
+
+-- One partition per month that already has rows, plus the upcoming months
+DO $$
+DECLARE
+    month_start date;
+BEGIN
+    FOR month_start IN
+        SELECT DISTINCT date_trunc('month', "timestamp")::date
+        FROM workflow.run_log_unpartitioned
+        WHERE "timestamp" IS NOT NULL
+          AND "timestamp" < date_trunc('month', now())
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE workflow.%I PARTITION OF workflow.run_log FOR VALUES FROM (%L) TO (%L)',
+            format('run_log_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM')),
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+    END LOOP;
+END;
+$$;
+
+SELECT workflow.ensure_run_log_partitions(2);
+
+INSERT INTO workflow.run_log (
+    id, dagster_run_id, workflow_id, step_code, log_level, message, "timestamp", run_id, event_data, event_type
+)
+SELECT id, dagster_run_id, workflow_id, step_code, log_level, message, COALESCE("timestamp", now()),
+       run_id, event_data, event_type
+FROM workflow.run_log_unpartitioned;
+
+ALTER TABLE workflow.run_log
+    ADD CONSTRAINT run_log_pkey PRIMARY KEY (id, "timestamp");
+ALTER TABLE workflow.run_log
+    ADD CONSTRAINT run_log_unique_event UNIQUE (dagster_run_id, event_type, "timestamp");
+ALTER TABLE workflow.run_log
+    ADD CONSTRAINT fk_run_log_run FOREIGN KEY (dagster_run_id) REFERENCES workflow.run(dagster_run_id);
+ALTER TABLE workflow.run_log
+    ADD CONSTRAINT run_log_workflow_id_fkey FOREIGN KEY (workflow_id) REFERENCES workflow.workflow(id);
+CREATE INDEX idx_run_log_run_id ON workflow.run_log USING btree (run_id, "timestamp");
+
+CREATE TABLE workflow.run_log_archive (
+    partition_month date NOT NULL,
+    s3_prefix text NOT NULL,
+    row_count bigint NOT NULL,
+    archived_at timestamp with time zone DEFAULT now() NOT NULL
+);
+ALTER TABLE workflow.run_log_archive OWNER TO postgres;
+ALTER TABLE ONLY workflow.run_log_archive
+    ADD CONSTRAINT run_log_archive_pkey PRIMARY KEY (partition_month);
+
+DROP TABLE workflow.run_log_unpartitioned;
+
+COMMIT;
@@ -0,0 +1,4 @@
+-- Populate workflow.filter_option on databases created before the option-set triggers.
+-- Run after creating the filter_option table, functions and triggers from schema.sql.
+
+SELECT workflow.refresh_filter_options();
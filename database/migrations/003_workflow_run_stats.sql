@@ -0,0 +1,8 @@
+-- Populate workflow.workflow_run_stats on databases created before the run stats trigger,
+-- and swap the workflow_id index for one that also serves "latest runs of a workflow".
+-- Run after creating the workflow_run_stats table, functions and trigger from schema.sql.
+
+CREATE INDEX IF NOT EXISTS idx_run_workflow_id_started_at ON workflow.run USING btree (workflow_id, started_at DESC);
+DROP INDEX IF EXISTS workflow.idx_run_workflow_id;
+
+SELECT workflow.refresh_workflow_run_stats();
@@ -0,0 +1,8 @@
+-- Backfill workflow.run_daily_rollup and workflow.step_daily_rollup on databases created
+-- before the rollup triggers. Run after creating the rollup tables, functions, triggers
+-- and idx_run_step_status_run_id from schema.sql.
+
+SELECT workflow.rebuild_daily_rollups(
+    COALESCE((SELECT MIN(started_at AT TIME ZONE 'UTC')::date FROM workflow.run), CURRENT_DATE),
+    CURRENT_DATE
+);
@@ -0,0 +1,17 @@
+-- Add workflow.run.last_activity on databases created before it existed and backfill it
+-- from the run's own timestamps and its latest log event.
+-- Run before deploying the ingestion writer that maintains the column.
+
+ALTER TABLE workflow.run ADD COLUMN IF NOT EXISTS last_activity timestamp with time zone;
+
+UPDATE workflow.run r
+SET last_activity = COALESCE(
+    GREATEST(r.started_at, r.finished_at, (SELECT MAX(l."timestamp") FROM workflow.run_log l WHERE l.run_id = r.id)),
+    NOW()
+)
+WHERE r.last_activity IS NULL;
+
+ALTER TABLE workflow.run ALTER COLUMN last_activity SET DEFAULT now();
+ALTER TABLE workflow.run ALTER COLUMN last_activity SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_run_triggered_by_last_activity ON workflow.run USING btree (triggered_by, last_activity DESC);
@@ -0,0 +1,14 @@
+-- Add workflow.run.updated_at, which versions run API responses (ETags), on databases
+-- created before it existed. Run after creating touch_run_updated_at() from schema.sql.
+
+ALTER TABLE workflow.run ADD COLUMN IF NOT EXISTS updated_at timestamp with time zone;
+
+UPDATE workflow.run
+SET updated_at = COALESCE(GREATEST(finished_at, last_activity, started_at), NOW())
+WHERE updated_at IS NULL;
+
+ALTER TABLE workflow.run ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE workflow.run ALTER COLUMN updated_at SET NOT NULL;
+
+DROP TRIGGER IF EXISTS trg_run_updated_at ON workflow.run;
+CREATE TRIGGER trg_run_updated_at BEFORE UPDATE ON workflow.run FOR EACH ROW EXECUTE FUNCTION workflow.touch_run_updated_at();
@@ -0,0 +1,6 @@
+-- Add workflow.run.ingest_cursor, the Dagster event-log cursor after the last ingested
+-- event batch, on databases created before it existed. Syncs resume from it instead of
+-- the latest stored run_log timestamp, which missed rows archived to S3 as overflow.
+-- Runs without a cursor are read from their first event once; the writes are idempotent.
+
+ALTER TABLE workflow.run ADD COLUMN IF NOT EXISTS ingest_cursor text;
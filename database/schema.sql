@@ -29,6 +29,13 @@ CREATE SCHEMA workflow;
 
 ALTER SCHEMA workflow OWNER TO postgres;
 
+--
+-- Name: pg_trgm; Type: EXTENSION; Schema: -; Owner: -
+--
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+
 --
 -- TOC entry 442 (class 1255 OID 73560)
 -- Name: change_password(integer, text); Type: FUNCTION; Schema: workflow; Owner: postgres
@@ -52,6 +59,78 @@ END;$$;
 
 ALTER FUNCTION workflow.change_password(p_user_id integer, p_new_password text) OWNER TO postgres;
 
+--
+-- Name: ddsketch_add(jsonb, double precision, integer); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.ddsketch_add(p_sketch jsonb, p_value double precision, p_weight integer DEFAULT 1) RETURNS jsonb
+    LANGUAGE plpgsql IMMUTABLE
+    AS $$
+DECLARE
+    v_bin text := workflow.ddsketch_bin(p_value);
+    v_bins jsonb := COALESCE(p_sketch->'b', '{}'::jsonb);
+    v_count bigint;
+BEGIN
+    -- Add (or with a negative weight, remove) one value; bins that reach zero are dropped
+    IF v_bin IS NULL THEN
+        RETURN COALESCE(p_sketch, '{}'::jsonb);
+    END IF;
+    v_count := COALESCE((v_bins->>v_bin)::bigint, 0) + p_weight;
+    IF v_count > 0 THEN
+        v_bins := jsonb_set(v_bins, ARRAY[v_bin], to_jsonb(v_count), true);
+    ELSE
+        v_bins := v_bins - v_bin;
+    END IF;
+    RETURN jsonb_build_object('b', v_bins);
+END;
+$$;
+
+
+ALTER FUNCTION workflow.ddsketch_add(p_sketch jsonb, p_value double precision, p_weight integer) OWNER TO postgres;
+
+--
+-- Name: ddsketch_bin(double precision); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.ddsketch_bin(p_value double precision) RETURNS text
+    LANGUAGE sql IMMUTABLE
+    AS $$
+    -- DDSketch bin for a duration with 1% relative accuracy: gamma = 1.01 / 0.99.
+    -- Must match DDSKETCH_GAMMA in server/app/ddsketch.py.
+    SELECT CASE
+        WHEN p_value IS NULL THEN NULL
+        WHEN p_value <= 1 THEN '0'
+        ELSE ceil(ln(p_value) / ln(1.01::double precision / 0.99))::integer::text
+    END;
+$$;
+
+
+ALTER FUNCTION workflow.ddsketch_bin(p_value double precision) OWNER TO postgres;
+
+
+--
+-- Name: filter_option_bump(text, text, text, integer); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.filter_option_bump(p_scope text, p_kind text, p_value text, p_delta integer) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF p_value IS NULL THEN
+        RETURN;
+    END IF;
+    -- Rows are kept at zero rather than deleted, so concurrent writers never race an insert against a delete
+    INSERT INTO workflow.filter_option (scope, kind, value, ref_count)
+    VALUES (p_scope, p_kind, p_value, GREATEST(p_delta, 0))
+    ON CONFLICT (scope, kind, value)
+    DO UPDATE SET ref_count = GREATEST(filter_option.ref_count + p_delta, 0);
+END;
+$$;
+
+
+ALTER FUNCTION workflow.filter_option_bump(p_scope text, p_kind text, p_value text, p_delta integer) OWNER TO postgres;
+
+
 --
 -- TOC entry 409 (class 1255 OID 43190)
 -- Name: get_effective_config(integer); Type: FUNCTION; Schema: workflow; Owner: postgres
@@ -101,6 +180,41 @@ $$;
 
 ALTER FUNCTION workflow.get_effective_config(p_workflow_id integer) OWNER TO postgres;
 
+--
+-- Name: ensure_run_log_partitions(months_ahead integer); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.ensure_run_log_partitions(months_ahead integer DEFAULT 2) RETURNS integer
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    month_start date := date_trunc('month', now())::date;
+    partition_start date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    -- Create monthly run_log partitions from the current month up to months_ahead months ahead
+    FOR i IN 0..months_ahead LOOP
+        partition_start := (month_start + make_interval(months => i))::date;
+        partition_name := format('run_log_y%sm%s', to_char(partition_start, 'YYYY'), to_char(partition_start, 'MM'));
+        IF to_regclass('workflow.' || partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE workflow.%I PARTITION OF workflow.run_log FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                partition_start,
+                (partition_start + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.ensure_run_log_partitions(months_ahead integer) OWNER TO postgres;
+
+
 --
 -- TOC entry 432 (class 1255 OID 87608)
 -- Name: get_recent_activity(integer, integer); Type: FUNCTION; Schema: workflow; Owner: postgres
@@ -110,6 +224,8 @@ CREATE FUNCTION workflow.get_recent_activity(user_id integer, limit_count intege
     LANGUAGE plpgsql STABLE
     AS $$
 BEGIN
+    -- Top-N over idx_run_triggered_by_last_activity; run.last_activity is kept current by
+    -- the run log ingestion writer, so run_log itself is never scanned here
     RETURN QUERY
     SELECT
         r.id AS run_id,
@@ -117,21 +233,20 @@ BEGIN
         w.name AS workflow_name,
         w.id::TEXT AS workflow_id,
         concat(u.first_name, ' ', u.surname) AS triggered_by_username,
-        COALESCE(
-            MAX(r.finished_at),
-            MAX(r.started_at),
-            MAX(log_max.timestamp)
-        ) AS last_updated,
-        COALESCE(
-            (SELECT rs.status || ' - ' || rs.step_code FROM workflow.run_step_status rs WHERE rs.run_id = r.id ORDER BY rs.finished_at DESC LIMIT 1),
-            'No activity yet'
-        ) AS latest_activity
+        r.last_activity AS last_updated,
+        COALESCE(latest_step.status || ' - ' || latest_step.step_code, 'No activity yet') AS latest_activity
     FROM workflow.run r
     JOIN workflow.workflow w ON r.workflow_id = w.id
     JOIN workflow.user u ON r.triggered_by = u.id
-    LEFT JOIN workflow.run_log log_max ON r.id = log_max.run_id
-    GROUP BY r.id, w.name, w.id, u.first_name, u.surname
-    ORDER BY last_updated DESC NULLS LAST
+    LEFT JOIN LATERAL (
+        SELECT rs.status, rs.step_code
+        FROM workflow.run_step_status rs
+        WHERE rs.run_id = r.id
+        ORDER BY rs.finished_at DESC
+        LIMIT 1
+    ) latest_step ON true
+    WHERE r.triggered_by = get_recent_activity.user_id
+    ORDER BY r.last_activity DESC
     LIMIT get_recent_activity.limit_count;
 END;
 $$;
@@ -192,16 +307,13 @@ BEGIN
         w.resources_config,
         w.requires_file,
         w.supported_file_types,
-        COUNT(r.id) as total_runs,
-        COUNT(CASE WHEN r.status = 'SUCCESS' THEN 1 END) as successful_runs,
-        COUNT(CASE WHEN r.status IN ('FAILURE', 'ERROR') THEN 1 END) as failed_runs,
-        MAX(r.started_at) as last_run_at
+        COALESCE(s.total_runs, 0) as total_runs,
+        COALESCE(s.successful_runs, 0) as successful_runs,
+        COALESCE(s.failed_runs, 0) as failed_runs,
+        s.last_run_at
     FROM workflow.workflow w
-    LEFT JOIN workflow.run r ON w.id = r.workflow_id
-    WHERE w.id = p_workflow_id
-    GROUP BY w.id, w.name, w.description, w.status, w.parameters,
-             w.input_structure, w.config_template, w.default_parameters,
-             w.resources_config, w.requires_file, w.supported_file_types;
+    LEFT JOIN workflow.workflow_run_stats s ON w.id = s.workflow_id
+    WHERE w.id = p_workflow_id;
 END;
 $$;
 
@@ -224,6 +336,447 @@ $$;
 
 ALTER FUNCTION workflow.hash_password(plain_password text) OWNER TO postgres;
 
+--
+-- Name: refresh_workflow_run_stats(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.refresh_workflow_run_stats() RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    -- Rebuild every workflow's stats from scratch; the run trigger keeps them current afterwards
+    LOCK TABLE workflow.workflow_run_stats IN EXCLUSIVE MODE;
+    DELETE FROM workflow.workflow_run_stats;
+
+    INSERT INTO workflow.workflow_run_stats (
+        workflow_id, total_runs, successful_runs, failed_runs, last_run_id, last_run_at,
+        last_status, avg_duration_ms, updated_at
+    )
+    SELECT
+        r.workflow_id,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE r.status IN ('Completed', 'SUCCESS')),
+        COUNT(*) FILTER (WHERE r.status IN ('Failed', 'FAILURE', 'ERROR')),
+        (ARRAY_AGG(r.id ORDER BY r.started_at DESC NULLS LAST, r.id DESC))[1],
+        MAX(r.started_at),
+        (ARRAY_AGG(r.status ORDER BY r.started_at DESC NULLS LAST, r.id DESC))[1],
+        AVG(r.duration_ms),
+        NOW()
+    FROM workflow.run r
+    WHERE r.workflow_id IS NOT NULL
+    GROUP BY r.workflow_id;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.refresh_workflow_run_stats() OWNER TO postgres;
+
+
+--
+-- Name: rebuild_daily_rollups(date, date); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.rebuild_daily_rollups(p_from date, p_to date) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    -- Recompute whole days from source rows; the triggers keep them current afterwards.
+    -- The table locks wait for in-flight trigger updates and hold off new ones until commit.
+    LOCK TABLE workflow.run_daily_rollup, workflow.step_daily_rollup IN EXCLUSIVE MODE;
+
+    DELETE FROM workflow.run_daily_rollup WHERE day BETWEEN p_from AND p_to;
+    INSERT INTO workflow.run_daily_rollup (day, workflow_id, status, run_count, duration_count, duration_sum_ms, duration_sketch)
+    WITH runs AS (
+        SELECT (r.started_at AT TIME ZONE 'UTC')::date AS day, r.workflow_id, r.status, r.duration_ms,
+               workflow.ddsketch_bin(r.duration_ms) AS bin
+        FROM workflow.run r
+        WHERE r.started_at >= (p_from::timestamp AT TIME ZONE 'UTC')
+          AND r.started_at < ((p_to + 1)::timestamp AT TIME ZONE 'UTC')
+          AND r.workflow_id IS NOT NULL
+    ),
+    sketches AS (
+        SELECT day, workflow_id, status, jsonb_build_object('b', jsonb_object_agg(bin, bin_count)) AS sketch
+        FROM (
+            SELECT day, workflow_id, status, bin, COUNT(*) AS bin_count
+            FROM runs WHERE bin IS NOT NULL
+            GROUP BY day, workflow_id, status, bin
+        ) bins
+        GROUP BY day, workflow_id, status
+    )
+    SELECT runs.day, runs.workflow_id, runs.status,
+           COUNT(*), COUNT(runs.duration_ms), COALESCE(SUM(runs.duration_ms), 0),
+           COALESCE(MAX(sketches.sketch::text)::jsonb, '{}'::jsonb)
+    FROM runs
+    LEFT JOIN sketches USING (day, workflow_id, status)
+    GROUP BY runs.day, runs.workflow_id, runs.status;
+
+    DELETE FROM workflow.step_daily_rollup WHERE day BETWEEN p_from AND p_to;
+    INSERT INTO workflow.step_daily_rollup (day, workflow_id, step_code, status, execution_count, duration_count, duration_sum_ms, duration_sketch)
+    WITH steps AS (
+        SELECT (COALESCE(s.started_at, s.finished_at) AT TIME ZONE 'UTC')::date AS day,
+               COALESCE(r.workflow_id, s.workflow_id) AS workflow_id, s.step_code, s.status,
+               COALESCE(s.duration_ms, EXTRACT(EPOCH FROM (s.finished_at - s.started_at)) * 1000) AS duration_ms
+        FROM workflow.run_step_status s
+        LEFT JOIN workflow.run r ON r.id = s.run_id
+        WHERE COALESCE(s.started_at, s.finished_at) >= (p_from::timestamp AT TIME ZONE 'UTC')
+          AND COALESCE(s.started_at, s.finished_at) < ((p_to + 1)::timestamp AT TIME ZONE 'UTC')
+          AND COALESCE(r.workflow_id, s.workflow_id) IS NOT NULL
+    ),
+    sketches AS (
+        SELECT day, workflow_id, step_code, status, jsonb_build_object('b', jsonb_object_agg(bin, bin_count)) AS sketch
+        FROM (
+            SELECT day, workflow_id, step_code, status, workflow.ddsketch_bin(duration_ms) AS bin, COUNT(*) AS bin_count
+            FROM steps WHERE duration_ms IS NOT NULL
+            GROUP BY 1, 2, 3, 4, 5
+        ) bins
+        GROUP BY day, workflow_id, step_code, status
+    )
+    SELECT steps.day, steps.workflow_id, steps.step_code, steps.status,
+           COUNT(*), COUNT(steps.duration_ms), COALESCE(SUM(steps.duration_ms), 0),
+           COALESCE(MAX(sketches.sketch::text)::jsonb, '{}'::jsonb)
+    FROM steps
+    LEFT JOIN sketches USING (day, workflow_id, step_code, status)
+    GROUP BY steps.day, steps.workflow_id, steps.step_code, steps.status;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.rebuild_daily_rollups(p_from date, p_to date) OWNER TO postgres;
+
+
+--
+-- Name: refresh_filter_options(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.refresh_filter_options() RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    -- Rebuild every option set from scratch; the triggers keep it current afterwards
+    LOCK TABLE workflow.filter_option IN EXCLUSIVE MODE;
+    DELETE FROM workflow.filter_option;
+
+    INSERT INTO workflow.filter_option (scope, kind, value, ref_count)
+    SELECT 'run', 'status', status, COUNT(*) FROM workflow.run WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT 'run', 'workflow_id', workflow_id::text, COUNT(*) FROM workflow.run WHERE workflow_id IS NOT NULL GROUP BY workflow_id
+    UNION ALL
+    SELECT 'run', 'triggered_by', triggered_by::text, COUNT(*) FROM workflow.run WHERE triggered_by IS NOT NULL GROUP BY triggered_by
+    UNION ALL
+    SELECT 'workflow', 'status', status, COUNT(*) FROM workflow.workflow WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT 'workflow', 'created_by', created_by::text, COUNT(*) FROM workflow.workflow WHERE created_by IS NOT NULL GROUP BY created_by;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.refresh_filter_options() OWNER TO postgres;
+
+--
+-- Name: rollup_run(timestamp with time zone, integer, character varying, double precision, integer); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.rollup_run(p_started_at timestamp with time zone, p_workflow_id integer, p_status character varying, p_duration_ms double precision, p_sign integer) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF p_started_at IS NULL OR p_workflow_id IS NULL OR p_status IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO workflow.run_daily_rollup AS d (day, workflow_id, status, run_count, duration_count, duration_sum_ms, duration_sketch)
+    VALUES (
+        (p_started_at AT TIME ZONE 'UTC')::date, p_workflow_id, p_status, p_sign,
+        CASE WHEN p_duration_ms IS NULL THEN 0 ELSE p_sign END,
+        COALESCE(p_duration_ms, 0) * p_sign,
+        workflow.ddsketch_add('{}'::jsonb, p_duration_ms, p_sign)
+    )
+    ON CONFLICT (day, workflow_id, status) DO UPDATE SET
+        run_count = d.run_count + EXCLUDED.run_count,
+        duration_count = d.duration_count + EXCLUDED.duration_count,
+        duration_sum_ms = d.duration_sum_ms + EXCLUDED.duration_sum_ms,
+        duration_sketch = workflow.ddsketch_add(d.duration_sketch, p_duration_ms, p_sign);
+END;
+$$;
+
+
+ALTER FUNCTION workflow.rollup_run(p_started_at timestamp with time zone, p_workflow_id integer, p_status character varying, p_duration_ms double precision, p_sign integer) OWNER TO postgres;
+
+--
+-- Name: rollup_step(timestamp with time zone, integer, character varying, character varying, double precision, integer); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.rollup_step(p_started_at timestamp with time zone, p_workflow_id integer, p_step_code character varying, p_status character varying, p_duration_ms double precision, p_sign integer) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF p_started_at IS NULL OR p_workflow_id IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO workflow.step_daily_rollup AS d (day, workflow_id, step_code, status, execution_count, duration_count, duration_sum_ms, duration_sketch)
+    VALUES (
+        (p_started_at AT TIME ZONE 'UTC')::date, p_workflow_id, p_step_code, p_status, p_sign,
+        CASE WHEN p_duration_ms IS NULL THEN 0 ELSE p_sign END,
+        COALESCE(p_duration_ms, 0) * p_sign,
+        workflow.ddsketch_add('{}'::jsonb, p_duration_ms, p_sign)
+    )
+    ON CONFLICT (day, workflow_id, step_code, status) DO UPDATE SET
+        execution_count = d.execution_count + EXCLUDED.execution_count,
+        duration_count = d.duration_count + EXCLUDED.duration_count,
+        duration_sum_ms = d.duration_sum_ms + EXCLUDED.duration_sum_ms,
+        duration_sketch = workflow.ddsketch_add(d.duration_sketch, p_duration_ms, p_sign);
+END;
+$$;
+
+
+ALTER FUNCTION workflow.rollup_step(p_started_at timestamp with time zone, p_workflow_id integer, p_step_code character varying, p_status character varying, p_duration_ms double precision, p_sign integer) OWNER TO postgres;
+
+--
+-- Name: touch_run_updated_at(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.touch_run_updated_at() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    -- updated_at versions run API responses (ETags), so no-op updates must leave it alone
+    IF NEW IS DISTINCT FROM OLD THEN
+        NEW.updated_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.touch_run_updated_at() OWNER TO postgres;
+
+
+--
+-- Name: track_run_daily_rollup(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.track_run_daily_rollup() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (OLD.started_at, OLD.workflow_id, OLD.status, OLD.duration_ms)
+                            IS NOT DISTINCT FROM (NEW.started_at, NEW.workflow_id, NEW.status, NEW.duration_ms) THEN
+        RETURN NULL;
+    END IF;
+    -- Move the run's contribution from its old bucket to its new one
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM workflow.rollup_run(OLD.started_at, OLD.workflow_id, OLD.status, OLD.duration_ms, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM workflow.rollup_run(NEW.started_at, NEW.workflow_id, NEW.status, NEW.duration_ms, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.track_run_daily_rollup() OWNER TO postgres;
+
+
+--
+-- Name: track_run_filter_options(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.track_run_filter_options() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF TG_OP = 'DELETE' OR OLD.status IS DISTINCT FROM NEW.status THEN
+            PERFORM workflow.filter_option_bump('run', 'status', OLD.status, -1);
+        END IF;
+        IF TG_OP = 'DELETE' OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id THEN
+            PERFORM workflow.filter_option_bump('run', 'workflow_id', OLD.workflow_id::text, -1);
+        END IF;
+        IF TG_OP = 'DELETE' OR OLD.triggered_by IS DISTINCT FROM NEW.triggered_by THEN
+            PERFORM workflow.filter_option_bump('run', 'triggered_by', OLD.triggered_by::text, -1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM NEW.status THEN
+            PERFORM workflow.filter_option_bump('run', 'status', NEW.status, 1);
+        END IF;
+        IF TG_OP = 'INSERT' OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id THEN
+            PERFORM workflow.filter_option_bump('run', 'workflow_id', NEW.workflow_id::text, 1);
+        END IF;
+        IF TG_OP = 'INSERT' OR OLD.triggered_by IS DISTINCT FROM NEW.triggered_by THEN
+            PERFORM workflow.filter_option_bump('run', 'triggered_by', NEW.triggered_by::text, 1);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.track_run_filter_options() OWNER TO postgres;
+
+--
+-- Name: track_step_daily_rollup(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.track_step_daily_rollup() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    v_workflow_id integer;
+BEGIN
+    IF TG_OP = 'UPDATE' AND (OLD.started_at, OLD.finished_at, OLD.status, OLD.duration_ms, OLD.run_id)
+                            IS NOT DISTINCT FROM (NEW.started_at, NEW.finished_at, NEW.status, NEW.duration_ms, NEW.run_id) THEN
+        RETURN NULL;
+    END IF;
+    -- Ingestion doesn't fill run_step_status.workflow_id, so take it from the run
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT r.workflow_id INTO v_workflow_id FROM workflow.run r WHERE r.id = OLD.run_id;
+        PERFORM workflow.rollup_step(
+            COALESCE(OLD.started_at, OLD.finished_at), COALESCE(v_workflow_id, OLD.workflow_id), OLD.step_code, OLD.status,
+            COALESCE(OLD.duration_ms, EXTRACT(EPOCH FROM (OLD.finished_at - OLD.started_at)) * 1000), -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT r.workflow_id INTO v_workflow_id FROM workflow.run r WHERE r.id = NEW.run_id;
+        PERFORM workflow.rollup_step(
+            COALESCE(NEW.started_at, NEW.finished_at), COALESCE(v_workflow_id, NEW.workflow_id), NEW.step_code, NEW.status,
+            COALESCE(NEW.duration_ms, EXTRACT(EPOCH FROM (NEW.finished_at - NEW.started_at)) * 1000), 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.track_step_daily_rollup() OWNER TO postgres;
+
+
+--
+-- Name: track_workflow_filter_options(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.track_workflow_filter_options() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF TG_OP = 'DELETE' OR OLD.status IS DISTINCT FROM NEW.status THEN
+            PERFORM workflow.filter_option_bump('workflow', 'status', OLD.status, -1);
+        END IF;
+        IF TG_OP = 'DELETE' OR OLD.created_by IS DISTINCT FROM NEW.created_by THEN
+            PERFORM workflow.filter_option_bump('workflow', 'created_by', OLD.created_by::text, -1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM NEW.status THEN
+            PERFORM workflow.filter_option_bump('workflow', 'status', NEW.status, 1);
+        END IF;
+        IF TG_OP = 'INSERT' OR OLD.created_by IS DISTINCT FROM NEW.created_by THEN
+            PERFORM workflow.filter_option_bump('workflow', 'created_by', NEW.created_by::text, 1);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.track_workflow_filter_options() OWNER TO postgres;
+
+
+--
+-- Name: track_workflow_run_stats(); Type: FUNCTION; Schema: workflow; Owner: postgres
+--
+
+CREATE FUNCTION workflow.track_workflow_run_stats() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    -- Weight of the newest finished run in the rolling average duration
+    v_duration_weight CONSTANT double precision := 0.2;
+BEGIN
+    -- Take the run out of its old workflow's counts
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.workflow_id IS DISTINCT FROM NEW.workflow_id) THEN
+        UPDATE workflow.workflow_run_stats s
+        SET total_runs = GREATEST(s.total_runs - 1, 0),
+            successful_runs = GREATEST(s.successful_runs - (OLD.status IN ('Completed', 'SUCCESS'))::int, 0),
+            failed_runs = GREATEST(s.failed_runs - (OLD.status IN ('Failed', 'FAILURE', 'ERROR'))::int, 0),
+            updated_at = NOW()
+        WHERE s.workflow_id = OLD.workflow_id;
+
+        -- The latest run went away, so look up the new latest one
+        UPDATE workflow.workflow_run_stats s
+        SET (last_run_id, last_run_at, last_status) = (
+            SELECT r.id, r.started_at, r.status
+            FROM workflow.run r
+            WHERE r.workflow_id = OLD.workflow_id AND r.id <> OLD.id
+            ORDER BY r.started_at DESC NULLS LAST, r.id DESC
+            LIMIT 1
+        )
+        WHERE s.workflow_id = OLD.workflow_id AND s.last_run_id = OLD.id;
+
+        IF TG_OP = 'DELETE' THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF NEW.workflow_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Count the run against its (new) workflow
+    IF TG_OP = 'INSERT' OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id THEN
+        INSERT INTO workflow.workflow_run_stats AS s (
+            workflow_id, total_runs, successful_runs, failed_runs, last_run_id, last_run_at,
+            last_status, avg_duration_ms, updated_at
+        )
+        VALUES (
+            NEW.workflow_id, 1,
+            (NEW.status IN ('Completed', 'SUCCESS'))::int,
+            (NEW.status IN ('Failed', 'FAILURE', 'ERROR'))::int,
+            NEW.id, NEW.started_at, NEW.status, NEW.duration_ms, NOW()
+        )
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            total_runs = s.total_runs + 1,
+            successful_runs = s.successful_runs + EXCLUDED.successful_runs,
+            failed_runs = s.failed_runs + EXCLUDED.failed_runs,
+            last_run_id = CASE WHEN s.last_run_at IS NULL OR EXCLUDED.last_run_at >= s.last_run_at
+                               THEN EXCLUDED.last_run_id ELSE s.last_run_id END,
+            last_status = CASE WHEN s.last_run_at IS NULL OR EXCLUDED.last_run_at >= s.last_run_at
+                               THEN EXCLUDED.last_status ELSE s.last_status END,
+            last_run_at = GREATEST(s.last_run_at, EXCLUDED.last_run_at),
+            avg_duration_ms = CASE WHEN EXCLUDED.avg_duration_ms IS NULL THEN s.avg_duration_ms
+                                   WHEN s.avg_duration_ms IS NULL THEN EXCLUDED.avg_duration_ms
+                                   ELSE s.avg_duration_ms + v_duration_weight * (EXCLUDED.avg_duration_ms - s.avg_duration_ms) END,
+            updated_at = NOW();
+        RETURN NULL;
+    END IF;
+
+    -- Same workflow: move the run between outcome buckets and fold in a newly known duration
+    UPDATE workflow.workflow_run_stats s
+    SET successful_runs = GREATEST(s.successful_runs
+                                   - (OLD.status IN ('Completed', 'SUCCESS'))::int
+                                   + (NEW.status IN ('Completed', 'SUCCESS'))::int, 0),
+        failed_runs = GREATEST(s.failed_runs
+                               - (OLD.status IN ('Failed', 'FAILURE', 'ERROR'))::int
+                               + (NEW.status IN ('Failed', 'FAILURE', 'ERROR'))::int, 0),
+        last_status = CASE WHEN s.last_run_id = NEW.id OR s.last_run_at IS NULL OR NEW.started_at > s.last_run_at
+                           THEN NEW.status ELSE s.last_status END,
+        last_run_id = CASE WHEN s.last_run_at IS NULL OR NEW.started_at > s.last_run_at THEN NEW.id ELSE s.last_run_id END,
+        last_run_at = GREATEST(s.last_run_at, NEW.started_at),
+        avg_duration_ms = CASE WHEN NEW.duration_ms IS NULL OR NEW.duration_ms IS NOT DISTINCT FROM OLD.duration_ms
+                                   THEN s.avg_duration_ms
+                               WHEN s.avg_duration_ms IS NULL THEN NEW.duration_ms
+                               ELSE s.avg_duration_ms + v_duration_weight * (NEW.duration_ms - s.avg_duration_ms) END,
+        updated_at = NOW()
+    WHERE s.workflow_id = NEW.workflow_id;
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER FUNCTION workflow.track_workflow_run_stats() OWNER TO postgres;
+
+
 --
 -- TOC entry 399 (class 1255 OID 43191)
 -- Name: update_successful_config(); Type: FUNCTION; Schema: workflow; Owner: postgres
@@ -419,6 +972,37 @@ ALTER TABLE workflow.connection OWNER TO postgres;
 COMMENT ON COLUMN workflow.connection.type IS 'e.g., PostgreSQL, MySQL, BigQuery, CSV';
 
 
+--
+-- Name: filter_option; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.filter_option (
+    scope character varying(50) NOT NULL,
+    kind character varying(50) NOT NULL,
+    value text NOT NULL,
+    ref_count bigint DEFAULT 0 NOT NULL
+);
+
+
+ALTER TABLE workflow.filter_option OWNER TO postgres;
+
+
+--
+-- Name: job_introspection; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.job_introspection (
+    location_name character varying(255) NOT NULL,
+    job_name character varying(255) NOT NULL,
+    location_version text NOT NULL,
+    structure jsonb NOT NULL,
+    introspected_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE workflow.job_introspection OWNER TO postgres;
+
+
 --
 -- TOC entry 356 (class 1259 OID 61987)
 -- Name: refresh_tokens; Type: TABLE; Schema: workflow; Owner: postgres
@@ -478,7 +1062,11 @@ CREATE TABLE workflow.run (
     error_message text,
     duration_ms double precision,
     triggered_by bigint,
-    config_used jsonb
+    config_used jsonb,
+    log_overflow_paths jsonb,
+    last_activity timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    ingest_cursor text
 );
 
 
@@ -509,34 +1097,109 @@ ALTER SEQUENCE workflow.run_id_seq OWNER TO postgres;
 ALTER SEQUENCE workflow.run_id_seq OWNED BY workflow.run.id;
 
 
+--
+-- Name: run_daily_rollup; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.run_daily_rollup (
+    day date NOT NULL,
+    workflow_id integer NOT NULL,
+    status character varying(50) NOT NULL,
+    run_count bigint DEFAULT 0 NOT NULL,
+    duration_count bigint DEFAULT 0 NOT NULL,
+    duration_sum_ms double precision DEFAULT 0 NOT NULL,
+    duration_sketch jsonb DEFAULT '{}'::jsonb NOT NULL
+);
+
+
+ALTER TABLE workflow.run_daily_rollup OWNER TO postgres;
+
+
+--
+-- Name: run_event_blob; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.run_event_blob (
+    id bigint NOT NULL,
+    dagster_run_id character varying(255) NOT NULL,
+    run_id integer NOT NULL,
+    chunk_sha character(64) NOT NULL,
+    event_count integer NOT NULL,
+    payload bytea NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE workflow.run_event_blob OWNER TO postgres;
+
+--
+-- Name: run_event_blob_id_seq; Type: SEQUENCE; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE workflow.run_event_blob ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (
+    SEQUENCE NAME workflow.run_event_blob_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+
 --
 -- TOC entry 375 (class 1259 OID 70999)
 -- Name: run_log; Type: TABLE; Schema: workflow; Owner: postgres
 --
 
 CREATE TABLE workflow.run_log (
-    id integer NOT NULL,
+    id bigint NOT NULL,
     dagster_run_id character varying(255) NOT NULL,
     workflow_id integer,
     step_code character varying(255),
     log_level character varying(50),
     message text NOT NULL,
-    "timestamp" timestamp with time zone DEFAULT now(),
+    "timestamp" timestamp with time zone DEFAULT now() NOT NULL,
     run_id bigint,
     event_data jsonb DEFAULT '{}'::jsonb,
     event_type character varying(100)
-);
+)
+PARTITION BY RANGE ("timestamp");
 
 
 ALTER TABLE workflow.run_log OWNER TO postgres;
 
+--
+-- Name: run_log_default; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.run_log_default PARTITION OF workflow.run_log DEFAULT;
+
+
+ALTER TABLE workflow.run_log_default OWNER TO postgres;
+
+SELECT workflow.ensure_run_log_partitions(2);
+
+--
+-- Name: run_log_archive; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.run_log_archive (
+    partition_month date NOT NULL,
+    s3_prefix text NOT NULL,
+    row_count bigint NOT NULL,
+    archived_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE workflow.run_log_archive OWNER TO postgres;
+
 --
 -- TOC entry 374 (class 1259 OID 70998)
 -- Name: run_log_id_seq; Type: SEQUENCE; Schema: workflow; Owner: postgres
 --
 
 CREATE SEQUENCE workflow.run_log_id_seq
-    AS integer
+    AS bigint
     START WITH 1
     INCREMENT BY 1
     NO MINVALUE
@@ -555,6 +1218,36 @@ ALTER SEQUENCE workflow.run_log_id_seq OWNER TO postgres;
 ALTER SEQUENCE workflow.run_log_id_seq OWNED BY workflow.run_log.id;
 
 
+--
+-- Name: run_memo; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.run_memo (
+    id bigint NOT NULL,
+    fingerprint character(64) NOT NULL,
+    workflow_id integer NOT NULL,
+    run_id integer NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    expires_at timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE workflow.run_memo OWNER TO postgres;
+
+--
+-- Name: run_memo_id_seq; Type: SEQUENCE; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE workflow.run_memo ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (
+    SEQUENCE NAME workflow.run_memo_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+
 --
 -- TOC entry 377 (class 1259 OID 71014)
 -- Name: run_step_status; Type: TABLE; Schema: workflow; Owner: postgres
@@ -603,6 +1296,25 @@ ALTER SEQUENCE workflow.run_step_status_id_seq OWNER TO postgres;
 ALTER SEQUENCE workflow.run_step_status_id_seq OWNED BY workflow.run_step_status.id;
 
 
+--
+-- Name: step_daily_rollup; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.step_daily_rollup (
+    day date NOT NULL,
+    workflow_id integer NOT NULL,
+    step_code character varying(255) NOT NULL,
+    status character varying(50) NOT NULL,
+    execution_count bigint DEFAULT 0 NOT NULL,
+    duration_count bigint DEFAULT 0 NOT NULL,
+    duration_sum_ms double precision DEFAULT 0 NOT NULL,
+    duration_sketch jsonb DEFAULT '{}'::jsonb NOT NULL
+);
+
+
+ALTER TABLE workflow.step_daily_rollup OWNER TO postgres;
+
+
 --
 -- TOC entry 326 (class 1259 OID 17965)
 -- Name: user; Type: TABLE; Schema: workflow; Owner: postgres
@@ -744,6 +1456,26 @@ ALTER SEQUENCE workflow.workflow_id_seq OWNER TO postgres;
 ALTER SEQUENCE workflow.workflow_id_seq OWNED BY workflow.workflow.id;
 
 
+--
+-- Name: workflow_run_stats; Type: TABLE; Schema: workflow; Owner: postgres
+--
+
+CREATE TABLE workflow.workflow_run_stats (
+    workflow_id integer NOT NULL,
+    total_runs bigint DEFAULT 0 NOT NULL,
+    successful_runs bigint DEFAULT 0 NOT NULL,
+    failed_runs bigint DEFAULT 0 NOT NULL,
+    last_run_id integer,
+    last_run_at timestamp with time zone,
+    last_status character varying(50),
+    avg_duration_ms double precision,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE workflow.workflow_run_stats OWNER TO postgres;
+
+
 --
 -- TOC entry 327 (class 1259 OID 17986)
 -- Name: workflow_permission; Type: TABLE; Schema: workflow; Owner: postgres
@@ -878,6 +1610,22 @@ ALTER TABLE ONLY workflow.connection
     ADD CONSTRAINT connection_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: filter_option filter_option_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.filter_option
+    ADD CONSTRAINT filter_option_pkey PRIMARY KEY (scope, kind, value);
+
+
+--
+-- Name: job_introspection job_introspection_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.job_introspection
+    ADD CONSTRAINT job_introspection_pkey PRIMARY KEY (location_name, job_name);
+
+
 --
 -- TOC entry 3921 (class 2606 OID 61995)
 -- Name: refresh_tokens refresh_tokens_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
@@ -896,13 +1644,45 @@ ALTER TABLE ONLY workflow.run
     ADD CONSTRAINT run_dagster_run_id_unique UNIQUE (dagster_run_id);
 
 
+--
+-- Name: run_log_archive run_log_archive_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_log_archive
+    ADD CONSTRAINT run_log_archive_pkey PRIMARY KEY (partition_month);
+
+
+--
+-- Name: run_daily_rollup run_daily_rollup_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_daily_rollup
+    ADD CONSTRAINT run_daily_rollup_pkey PRIMARY KEY (day, workflow_id, status);
+
+
+--
+-- Name: run_event_blob run_event_blob_chunk_key; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_event_blob
+    ADD CONSTRAINT run_event_blob_chunk_key UNIQUE (dagster_run_id, chunk_sha);
+
+
+--
+-- Name: run_event_blob run_event_blob_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_event_blob
+    ADD CONSTRAINT run_event_blob_pkey PRIMARY KEY (id);
+
+
 --
 -- TOC entry 3937 (class 2606 OID 71007)
 -- Name: run_log run_log_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
 --
 
-ALTER TABLE ONLY workflow.run_log
-    ADD CONSTRAINT run_log_pkey PRIMARY KEY (id);
+ALTER TABLE workflow.run_log
+    ADD CONSTRAINT run_log_pkey PRIMARY KEY (id, "timestamp");
 
 
 --
@@ -910,10 +1690,26 @@ ALTER TABLE ONLY workflow.run_log
 -- Name: run_log run_log_unique_event; Type: CONSTRAINT; Schema: workflow; Owner: postgres
 --
 
-ALTER TABLE ONLY workflow.run_log
+ALTER TABLE workflow.run_log
     ADD CONSTRAINT run_log_unique_event UNIQUE (dagster_run_id, event_type, "timestamp");
 
 
+--
+-- Name: run_memo run_memo_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_memo
+    ADD CONSTRAINT run_memo_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: run_memo run_memo_run_id_key; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_memo
+    ADD CONSTRAINT run_memo_run_id_key UNIQUE (run_id);
+
+
 --
 -- TOC entry 3931 (class 2606 OID 70992)
 -- Name: run run_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
@@ -941,6 +1737,14 @@ ALTER TABLE ONLY workflow.run_step_status
     ADD CONSTRAINT run_step_status_unique_run_step UNIQUE (dagster_run_id, step_code);
 
 
+--
+-- Name: step_daily_rollup step_daily_rollup_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.step_daily_rollup
+    ADD CONSTRAINT step_daily_rollup_pkey PRIMARY KEY (day, workflow_id, step_code, status);
+
+
 --
 -- TOC entry 3906 (class 2606 OID 61958)
 -- Name: user user_email_key; Type: CONSTRAINT; Schema: workflow; Owner: postgres
@@ -986,6 +1790,14 @@ ALTER TABLE ONLY workflow.workflow_permission
     ADD CONSTRAINT workflow_permission_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: workflow_run_stats workflow_run_stats_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.workflow_run_stats
+    ADD CONSTRAINT workflow_run_stats_pkey PRIMARY KEY (workflow_id);
+
+
 --
 -- TOC entry 3924 (class 2606 OID 70982)
 -- Name: workflow workflow_pkey; Type: CONSTRAINT; Schema: workflow; Owner: postgres
@@ -1028,35 +1840,39 @@ CREATE INDEX idx_run_dagster_run_id ON workflow.run USING btree (dagster_run_id)
 
 
 --
--- TOC entry 3932 (class 1259 OID 71029)
--- Name: idx_run_log_dagster_run_id; Type: INDEX; Schema: workflow; Owner: postgres
+-- Name: idx_run_event_blob_run_id; Type: INDEX; Schema: workflow; Owner: postgres
 --
 
-CREATE INDEX idx_run_log_dagster_run_id ON workflow.run_log USING btree (dagster_run_id);
+CREATE INDEX idx_run_event_blob_run_id ON workflow.run_event_blob USING btree (run_id);
 
 
 --
--- TOC entry 3933 (class 1259 OID 86970)
--- Name: idx_run_log_event_type; Type: INDEX; Schema: workflow; Owner: postgres
+-- TOC entry 3934 (class 1259 OID 86969)
+-- Name: idx_run_log_run_id; Type: INDEX; Schema: workflow; Owner: postgres
 --
 
-CREATE INDEX idx_run_log_event_type ON workflow.run_log USING btree (event_type);
+CREATE INDEX idx_run_log_run_id ON workflow.run_log USING btree (run_id, "timestamp");
 
 
 --
--- TOC entry 3934 (class 1259 OID 86969)
--- Name: idx_run_log_run_id; Type: INDEX; Schema: workflow; Owner: postgres
+-- Name: idx_run_memo_expires_at; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_run_memo_expires_at ON workflow.run_memo USING btree (expires_at);
+
+
+--
+-- Name: idx_run_memo_fingerprint; Type: INDEX; Schema: workflow; Owner: postgres
 --
 
-CREATE INDEX idx_run_log_run_id ON workflow.run_log USING btree (run_id);
+CREATE INDEX idx_run_memo_fingerprint ON workflow.run_memo USING btree (fingerprint, created_at DESC);
 
 
 --
--- TOC entry 3935 (class 1259 OID 87166)
--- Name: idx_run_log_step_code; Type: INDEX; Schema: workflow; Owner: postgres
+-- Name: idx_run_started_at_id; Type: INDEX; Schema: workflow; Owner: postgres
 --
 
-CREATE INDEX idx_run_log_step_code ON workflow.run_log USING btree (step_code);
+CREATE INDEX idx_run_started_at_id ON workflow.run USING btree (started_at DESC, id DESC);
 
 
 --
@@ -1075,6 +1891,13 @@ CREATE INDEX idx_run_status ON workflow.run USING btree (status);
 CREATE INDEX idx_run_step_status_dagster_run_id ON workflow.run_step_status USING btree (dagster_run_id);
 
 
+--
+-- Name: idx_run_step_status_run_id; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_run_step_status_run_id ON workflow.run_step_status USING btree (run_id);
+
+
 --
 -- TOC entry 3941 (class 1259 OID 87123)
 -- Name: idx_run_step_status_step_code; Type: INDEX; Schema: workflow; Owner: postgres
@@ -1084,11 +1907,45 @@ CREATE INDEX idx_run_step_status_step_code ON workflow.run_step_status USING btr
 
 
 --
--- TOC entry 3927 (class 1259 OID 72246)
--- Name: idx_run_workflow_id; Type: INDEX; Schema: workflow; Owner: postgres
+-- Name: idx_run_status_trgm; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_run_status_trgm ON workflow.run USING gin (status public.gin_trgm_ops);
+
+
+--
+-- Name: idx_run_triggered_by_last_activity; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_run_triggered_by_last_activity ON workflow.run USING btree (triggered_by, last_activity DESC);
+
+
+--
+-- Name: idx_run_workflow_id_started_at; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_run_workflow_id_started_at ON workflow.run USING btree (workflow_id, started_at DESC);
+
+
+--
+-- Name: idx_workflow_created_at_id; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_workflow_created_at_id ON workflow.workflow USING btree (created_at DESC, id DESC);
+
+
+--
+-- Name: idx_workflow_description_trgm; Type: INDEX; Schema: workflow; Owner: postgres
 --
 
-CREATE INDEX idx_run_workflow_id ON workflow.run USING btree (workflow_id);
+CREATE INDEX idx_workflow_description_trgm ON workflow.workflow USING gin (description public.gin_trgm_ops);
+
+
+--
+-- Name: idx_workflow_name_trgm; Type: INDEX; Schema: workflow; Owner: postgres
+--
+
+CREATE INDEX idx_workflow_name_trgm ON workflow.workflow USING gin (name public.gin_trgm_ops);
 
 
 --
@@ -1099,6 +1956,48 @@ CREATE INDEX idx_run_workflow_id ON workflow.run USING btree (workflow_id);
 CREATE INDEX idx_workflow_status ON workflow.workflow USING btree (status);
 
 
+--
+-- Name: run trg_run_daily_rollup; Type: TRIGGER; Schema: workflow; Owner: postgres
+--
+
+CREATE TRIGGER trg_run_daily_rollup AFTER INSERT OR DELETE OR UPDATE OF status, workflow_id, started_at, duration_ms ON workflow.run FOR EACH ROW EXECUTE FUNCTION workflow.track_run_daily_rollup();
+
+
+--
+-- Name: run trg_run_filter_options; Type: TRIGGER; Schema: workflow; Owner: postgres
+--
+
+CREATE TRIGGER trg_run_filter_options AFTER INSERT OR DELETE OR UPDATE OF status, workflow_id, triggered_by ON workflow.run FOR EACH ROW EXECUTE FUNCTION workflow.track_run_filter_options();
+
+
+--
+-- Name: run trg_run_updated_at; Type: TRIGGER; Schema: workflow; Owner: postgres
+--
+
+CREATE TRIGGER trg_run_updated_at BEFORE UPDATE ON workflow.run FOR EACH ROW EXECUTE FUNCTION workflow.touch_run_updated_at();
+
+
+--
+-- Name: run trg_workflow_run_stats; Type: TRIGGER; Schema: workflow; Owner: postgres
+--
+
+CREATE TRIGGER trg_workflow_run_stats AFTER INSERT OR DELETE OR UPDATE OF status, workflow_id, started_at, duration_ms ON workflow.run FOR EACH ROW EXECUTE FUNCTION workflow.track_workflow_run_stats();
+
+
+--
+-- Name: run_step_status trg_step_daily_rollup; Type: TRIGGER; Schema: workflow; Owner: postgres
+--
+
+CREATE TRIGGER trg_step_daily_rollup AFTER INSERT OR DELETE OR UPDATE OF status, started_at, finished_at, duration_ms, run_id ON workflow.run_step_status FOR EACH ROW EXECUTE FUNCTION workflow.track_step_daily_rollup();
+
+
+--
+-- Name: workflow trg_workflow_filter_options; Type: TRIGGER; Schema: workflow; Owner: postgres
+--
+
+CREATE TRIGGER trg_workflow_filter_options AFTER INSERT OR DELETE OR UPDATE OF status, created_by ON workflow.workflow FOR EACH ROW EXECUTE FUNCTION workflow.track_workflow_filter_options();
+
+
 --
 -- TOC entry 3946 (class 2606 OID 18221)
 -- Name: connection connection_created_by_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
@@ -1108,12 +2007,20 @@ ALTER TABLE ONLY workflow.connection
     ADD CONSTRAINT connection_created_by_fkey FOREIGN KEY (created_by) REFERENCES workflow."user"(id);
 
 
+--
+-- Name: run_event_blob run_event_blob_run_id_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_event_blob
+    ADD CONSTRAINT run_event_blob_run_id_fkey FOREIGN KEY (run_id) REFERENCES workflow.run(id) ON DELETE CASCADE;
+
+
 --
 -- TOC entry 3951 (class 2606 OID 73492)
 -- Name: run_log fk_run_log_run; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
 --
 
-ALTER TABLE ONLY workflow.run_log
+ALTER TABLE workflow.run_log
     ADD CONSTRAINT fk_run_log_run FOREIGN KEY (dagster_run_id) REFERENCES workflow.run(dagster_run_id);
 
 
@@ -1140,10 +2047,26 @@ ALTER TABLE ONLY workflow.refresh_tokens
 -- Name: run_log run_log_workflow_id_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
 --
 
-ALTER TABLE ONLY workflow.run_log
+ALTER TABLE workflow.run_log
     ADD CONSTRAINT run_log_workflow_id_fkey FOREIGN KEY (workflow_id) REFERENCES workflow.workflow(id);
 
 
+--
+-- Name: run_memo run_memo_run_id_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_memo
+    ADD CONSTRAINT run_memo_run_id_fkey FOREIGN KEY (run_id) REFERENCES workflow.run(id) ON DELETE CASCADE;
+
+
+--
+-- Name: run_memo run_memo_workflow_id_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.run_memo
+    ADD CONSTRAINT run_memo_workflow_id_fkey FOREIGN KEY (workflow_id) REFERENCES workflow.workflow(id);
+
+
 --
 -- TOC entry 3954 (class 2606 OID 71023)
 -- Name: run_step_status run_step_status_workflow_id_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
@@ -1180,6 +2103,14 @@ ALTER TABLE ONLY workflow.workflow_permission
     ADD CONSTRAINT workflow_permission_user_id_fkey FOREIGN KEY (user_id) REFERENCES workflow."user"(id);
 
 
+--
+-- Name: workflow_run_stats workflow_run_stats_workflow_id_fkey; Type: FK CONSTRAINT; Schema: workflow; Owner: postgres
+--
+
+ALTER TABLE ONLY workflow.workflow_run_stats
+    ADD CONSTRAINT workflow_run_stats_workflow_id_fkey FOREIGN KEY (workflow_id) REFERENCES workflow.workflow(id) ON DELETE CASCADE;
+
+
 --
 -- TOC entry 4110 (class 0 OID 61959)
 -- Dependencies: 353
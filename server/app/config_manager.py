@@ -2,56 +2,236 @@ import json
 import logging
 import os
 import requests
-from typing import Dict, Any, Optional
+import threading
+from typing import Callable, Dict, Any, Optional
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from app.dagster_workspace import dagster_graphql_url, get_location_version, on_location_change, start_location_watcher
 import uuid
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_LOCATION_NAME = "server.app.dagster.repo"
+
+# Job structures by location name: {"version": location version, "jobs": {job_name: structure}}
+_introspection_cache: Dict[str, Dict[str, Any]] = {}
+_introspection_lock = threading.Lock()
+
+def start_introspection_prewarm(session_factory: Callable[[], Session]) -> None:
+    """Introspect workflow jobs as soon as the code location loads or reloads, not on first use.
+
+    Structures are persisted through a session from session_factory, so other workers
+    pick them up from workflow.job_introspection instead of introspecting again.
+    """
+    def prewarm_on_location_change(location_name: str, version: str) -> None:
+        if location_name != DEFAULT_LOCATION_NAME:
+            return
+        db = session_factory()
+        try:
+            ConfigTemplateManager(os.getenv("DAGSTER_API_URL"), location_name).prewarm(version, db)
+        except Exception as e:
+            logger.warning(f"Failed to prewarm job introspection for {location_name}: {str(e)}")
+        finally:
+            db.close()
+
+    on_location_change(prewarm_on_location_change)
+    start_location_watcher()
+
 class ConfigTemplateManager:
     """Handles config template generation and validation"""
     
-    def __init__(self, dagster_api_url: str):
-        self.dagster_api_url = dagster_api_url
+    def __init__(self, dagster_api_url: str, location_name: str = DEFAULT_LOCATION_NAME):
+        self.dagster_api_url = dagster_graphql_url(dagster_api_url)
+        self.location_name = location_name
     
-    async def generate_template(self, workflow_id: int) -> Dict[str, Any]:
-        """Generate config template by introspecting Dagster job"""
+    async def generate_template(self, workflow_id: int, db: Optional[Session] = None) -> Dict[str, Any]:
+        """Generate config template from the cached structure of the Dagster job.
+
+        Structures are introspected for every workflow job at once whenever the code
+        location reloads, so this is normally a local lookup.
+        """
         job_name = f"workflow_job_{workflow_id}"
         try:
-            # Query Dagster for job structure
-            response = requests.post(
-                self.dagster_api_url,
-                json={
-                    "query": self._get_introspection_query(),
-                    "variables": {"pipelineName": job_name}
-                },
-                timeout=10
-            )
-            if response.status_code != 200:
-                raise Exception(f"Dagster API error: {response.status_code}")
-            
-            data = response.json()
-            if "errors" in data:
-                raise Exception(f"GraphQL errors: {data['errors']}")
-            
-            return self._parse_job_structure(data, workflow_id)
+            structure = await self.get_job_structure(job_name, db)
+            if structure is None:
+                logger.warning(f"No introspection available for {job_name}, using default template")
+                return self._create_default_template(workflow_id)
+            return self._parse_job_structure(structure, workflow_id)
             
         except Exception as e:
             logger.warning(f"Couldn't introspect job: {str(e)}")
             return self._create_default_template(workflow_id)
+
+    async def get_job_structure(self, job_name: str, db: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+        """Look up a job's structure in memory, then the DB, then re-introspect the whole location"""
+        version = await run_in_threadpool(get_location_version, self.location_name)
+
+        with _introspection_lock:
+            cached = _introspection_cache.get(self.location_name)
+        if cached and (version is None or cached["version"] == version):
+            return cached["jobs"].get(job_name)
+
+        if db is not None:
+            stored = await run_in_threadpool(self._load_stored_structure, db, job_name, version)
+            if stored is not None:
+                return stored
+
+        if version is None:
+            # Dagster is unreachable and nothing is cached
+            return None
+
+        jobs = await run_in_threadpool(self.prewarm, version, db)
+        return jobs.get(job_name)
+
+    def prewarm(self, version: str, db: Optional[Session] = None) -> Dict[str, Dict[str, Any]]:
+        """Introspect every workflow job in the location with one query and cache the results.
+
+        With a db, structures another worker already stored for this version are reused,
+        and fresh introspections are persisted.
+        """
+        with _introspection_lock:
+            cached = _introspection_cache.get(self.location_name)
+            if cached and cached["version"] == version:
+                return cached["jobs"]
+
+        if db is not None:
+            stored = self._load_stored_structures(db, version)
+            if stored:
+                with _introspection_lock:
+                    _introspection_cache[self.location_name] = {"version": version, "jobs": stored}
+                logger.info(f"Loaded {len(stored)} stored workflow job structures at location version {version}")
+                return stored
+
+        response = requests.post(
+            self.dagster_api_url,
+            json={"query": self._get_introspection_query()},
+            timeout=10
+        )
+        if response.status_code != 200:
+            raise Exception(f"Dagster API error: {response.status_code}")
+
+        data = response.json()
+        if "errors" in data:
+            raise Exception(f"GraphQL errors: {data['errors']}")
+
+        jobs = self._extract_job_structures(data)
+        with _introspection_lock:
+            _introspection_cache[self.location_name] = {"version": version, "jobs": jobs}
+        logger.info(f"Introspected {len(jobs)} workflow jobs at location version {version}")
+
+        if db is not None:
+            self._store_structures(db, version, jobs)
+        return jobs
+
+    def _extract_job_structures(self, data: Dict) -> Dict[str, Dict[str, Any]]:
+        jobs = {}
+        repositories = data.get('data', {}).get('repositoriesOrError', {}).get('nodes', [])
+        for repository in repositories:
+            if repository.get('location', {}).get('name') != self.location_name:
+                continue
+            for job in repository.get('jobs', []):
+                if not job['name'].startswith("workflow_job_"):
+                    continue
+                ops = []
+                for solid in job.get('solids', []):
+                    config_field = (solid.get('definition') or {}).get('configField') or {}
+                    config_type = config_field.get('configType') or {}
+                    ops.append({
+                        "name": solid['name'],
+                        "config_type": config_type.get('key'),
+                        "config_fields": [field['name'] for field in config_type.get('fields') or []]
+                    })
+                jobs[job['name']] = {"ops": ops}
+        return jobs
+
+    def _load_stored_structure(self, db: Session, job_name: str, version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Read a persisted structure; any version is accepted when the current one is unknown"""
+        try:
+            row = db.execute(
+                text("""
+                    SELECT structure, location_version
+                    FROM workflow.job_introspection
+                    WHERE location_name = :location_name AND job_name = :job_name
+                      AND (CAST(:version AS text) IS NULL OR location_version = :version)
+                """),
+                {"location_name": self.location_name, "job_name": job_name, "version": version}
+            ).fetchone()
+        except Exception as e:
+            logger.warning(f"Failed to read stored introspection for {job_name}: {str(e)}")
+            db.rollback()
+            return None
+        if not row:
+            return None
+        structure = row.structure
+        return json.loads(structure) if isinstance(structure, str) else structure
+
+    def _load_stored_structures(self, db: Session, version: str) -> Dict[str, Dict[str, Any]]:
+        """Every persisted structure for the location at exactly this version"""
+        try:
+            rows = db.execute(
+                text("""
+                    SELECT job_name, structure
+                    FROM workflow.job_introspection
+                    WHERE location_name = :location_name AND location_version = :version
+                """),
+                {"location_name": self.location_name, "version": version}
+            ).fetchall()
+        except Exception as e:
+            logger.warning(f"Failed to read stored introspection at version {version}: {str(e)}")
+            db.rollback()
+            return {}
+        return {
+            row.job_name: json.loads(row.structure) if isinstance(row.structure, str) else row.structure
+            for row in rows
+        }
+
+    def _store_structures(self, db: Session, version: str, jobs: Dict[str, Dict[str, Any]]) -> None:
+        if not jobs:
+            return
+        try:
+            db.execute(
+                text("""
+                    INSERT INTO workflow.job_introspection (location_name, job_name, location_version, structure, introspected_at)
+                    SELECT :location_name, j.key, :version, j.value, NOW()
+                    FROM jsonb_each(CAST(:jobs AS jsonb)) AS j
+                    ON CONFLICT (location_name, job_name) DO UPDATE
+                    SET location_version = EXCLUDED.location_version,
+                        structure = EXCLUDED.structure,
+                        introspected_at = EXCLUDED.introspected_at
+                """),
+                {"location_name": self.location_name, "version": version, "jobs": json.dumps(jobs)}
+            )
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist job introspection: {str(e)}")
+            db.rollback()
     
     def _get_introspection_query(self) -> str:
         return """
-        query GetJobStructure($pipelineName: String!) {
-            pipeline(pipelineName: $pipelineName) {
-                solids {
-                    name
-                    definition {
-                        configField {
-                            configType {
-                                key
-                                fields { name }
+        query GetJobStructures {
+            repositoriesOrError {
+                ... on RepositoryConnection {
+                    nodes {
+                        name
+                        location {
+                            name
+                        }
+                        jobs {
+                            name
+                            solids {
+                                name
+                                definition {
+                                    configField {
+                                        configType {
+                                            key
+                                            ... on CompositeConfigType {
+                                                fields { name }
+                                            }
+                                        }
+                                    }
+                                }
                             }
                         }
                     }
@@ -60,11 +240,11 @@ class ConfigTemplateManager:
         }
         """
     
-    def _parse_job_structure(self, data: Dict, workflow_id: int) -> Dict:
-        """Convert Dagster job structure to config template"""
+    def _parse_job_structure(self, structure: Dict, workflow_id: int) -> Dict:
+        """Convert a cached job structure to config template"""
         template = {}
-        for solid in data.get('data', {}).get('pipeline', {}).get('solids', []):
-            op_name = solid['name']
+        for op in structure.get('ops', []):
+            op_name = op['name']
             template[op_name] = self._create_op_config(op_name, workflow_id)
         return template or self._create_default_template(workflow_id)
     
@@ -0,0 +1,167 @@
+# Loaded by repo.load_jobs_and_schedules_from_local: op, job, text, pd, boto3,
+# ScheduleDefinition and OpExecutionContext are injected into this module's namespace.
+import io
+import re
+from datetime import date
+
+RUN_LOG_PARTITIONS_AHEAD = int(os.getenv("RUN_LOG_PARTITIONS_AHEAD", "2"))
+RUN_LOG_RETENTION_MONTHS = int(os.getenv("RUN_LOG_RETENTION_MONTHS", "6"))
+RUN_LOG_ARCHIVE_PREFIX = "run-log-archive"
+RUN_LOG_ARCHIVE_BUCKETS = 16
+
+PARTITION_NAME = re.compile(r"^run_log_y(\d{4})m(\d{2})$")
+
+def retention_cutoff(today: date) -> date:
+    """First day of the oldest month that stays in Postgres"""
+    months = today.year * 12 + (today.month - 1) - RUN_LOG_RETENTION_MONTHS
+    return date(months // 12, months % 12 + 1, 1)
+
+def archive_partition(context, engine, s3_client, bucket: str, partition: str, month: date) -> int:
+    """Copy one monthly partition and its event blobs to Parquet, record it, then detach and drop it"""
+    prefix = f"{RUN_LOG_ARCHIVE_PREFIX}/month={month:%Y-%m}"
+    row_count = 0
+
+    # One object per run bucket keeps memory bounded and lets readers fetch a single file per run
+    for run_bucket in range(RUN_LOG_ARCHIVE_BUCKETS):
+        with engine.connect() as conn:
+            df = pd.read_sql(
+                text(f"""
+                    SELECT id, dagster_run_id, workflow_id, run_id, step_code, event_type,
+                           log_level, message, "timestamp", event_data::text AS event_data
+                    FROM workflow.{partition}
+                    WHERE COALESCE(run_id, 0) % :buckets = :run_bucket
+                    ORDER BY run_id, "timestamp"
+                """),
+                conn,
+                params={"buckets": RUN_LOG_ARCHIVE_BUCKETS, "run_bucket": run_bucket}
+            )
+        if df.empty:
+            continue
+
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False, compression="zstd")
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=f"{prefix}/run_bucket={run_bucket:02d}/data.parquet",
+            Body=buffer.getvalue()
+        )
+        row_count += len(df)
+
+        # Event blobs the archived rows point at go alongside them, so archived events still expand
+        with engine.connect() as conn:
+            blobs = pd.read_sql(
+                text(f"""
+                    SELECT b.dagster_run_id, b.run_id, b.chunk_sha, b.event_count, b.payload
+                    FROM workflow.run_event_blob b
+                    WHERE COALESCE(b.run_id, 0) % :buckets = :run_bucket
+                      AND EXISTS (
+                          SELECT 1 FROM workflow.{partition} l
+                          WHERE l.run_id = b.run_id
+                            AND l.dagster_run_id = b.dagster_run_id
+                            AND l.event_data->'_blob'->>'chunk' = b.chunk_sha
+                      )
+                """),
+                conn,
+                params={"buckets": RUN_LOG_ARCHIVE_BUCKETS, "run_bucket": run_bucket}
+            )
+        if not blobs.empty:
+            blobs["payload"] = blobs["payload"].map(bytes)
+            buffer = io.BytesIO()
+            blobs.to_parquet(buffer, index=False)
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=f"{prefix}/run_bucket={run_bucket:02d}/blobs.parquet",
+                Body=buffer.getvalue()
+            )
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO workflow.run_log_archive (partition_month, s3_prefix, row_count, archived_at)
+                VALUES (:month, :prefix, :row_count, NOW())
+                ON CONFLICT (partition_month) DO UPDATE SET
+                    s3_prefix = EXCLUDED.s3_prefix,
+                    row_count = EXCLUDED.row_count,
+                    archived_at = EXCLUDED.archived_at
+            """),
+            {"month": month, "prefix": prefix, "row_count": row_count}
+        )
+        conn.execute(text(f"ALTER TABLE workflow.run_log DETACH PARTITION workflow.{partition}"))
+        # Blobs now live in the archive; keep any a still-attached month also points at
+        # (a run's chunk can straddle a month boundary)
+        deleted_blobs = conn.execute(
+            text(f"""
+                DELETE FROM workflow.run_event_blob b
+                USING (
+                    SELECT DISTINCT run_id, dagster_run_id, event_data->'_blob'->>'chunk' AS chunk_sha
+                    FROM workflow.{partition}
+                    WHERE event_data->'_blob' IS NOT NULL
+                ) p
+                WHERE b.dagster_run_id = p.dagster_run_id
+                  AND b.chunk_sha = p.chunk_sha
+                  AND NOT EXISTS (
+                      SELECT 1 FROM workflow.run_log l
+                      WHERE l.run_id = b.run_id
+                        AND l.event_data->'_blob'->>'chunk' = b.chunk_sha
+                  )
+            """)
+        ).rowcount
+        conn.execute(text(f"DROP TABLE workflow.{partition}"))
+
+    context.log.info(
+        f"Archived {row_count} rows from {partition} to s3://{bucket}/{prefix} "
+        f"and removed {deleted_blobs} event blobs"
+    )
+    return row_count
+
+@op(required_resource_keys={"db_engine"})
+def create_run_log_partitions(context: OpExecutionContext) -> int:
+    with context.resources.db_engine.begin() as conn:
+        created = conn.execute(
+            text("SELECT workflow.ensure_run_log_partitions(:months_ahead)"),
+            {"months_ahead": RUN_LOG_PARTITIONS_AHEAD}
+        ).scalar()
+    context.log.info(f"Created {created} run_log partitions")
+    return created
+
+@op(required_resource_keys={"db_engine", "s3"})
+def archive_run_log_partitions(context: OpExecutionContext, created: int) -> int:
+    engine = context.resources.db_engine
+    # Same default as app/s3_storage.py, which the API reads the archive back through
+    bucket = os.getenv("S3_BUCKET", "workflow-files")
+    cutoff = retention_cutoff(date.today())
+
+    with engine.connect() as conn:
+        partitions = [
+            row[0] for row in conn.execute(text("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'workflow.run_log'::regclass
+                ORDER BY c.relname
+            """))
+        ]
+
+    archived = 0
+    for partition in partitions:
+        match = PARTITION_NAME.match(partition)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if month >= cutoff:
+            continue
+        archive_partition(context, engine, context.resources.s3, bucket, partition, month)
+        archived += 1
+
+    context.log.info(f"Archived {archived} run_log partitions older than {cutoff}")
+    return archived
+
+@job
+def maintenance_job_partitions():
+    archive_run_log_partitions(create_run_log_partitions())
+
+run_log_partitions_schedule = ScheduleDefinition(
+    job=maintenance_job_partitions,
+    cron_schedule="0 2 * * *",
+    name="run_log_partitions_schedule"
+)
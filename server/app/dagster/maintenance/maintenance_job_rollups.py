@@ -0,0 +1,28 @@
+# Loaded by repo.load_jobs_and_schedules_from_local: op, job, text, ScheduleDefinition
+# and OpExecutionContext are injected into this module's namespace.
+from datetime import date, timedelta
+
+# Triggers keep the rollups current; this nightly pass only repairs recent days,
+# e.g. after manual edits or a rollup row that drifted during a failed deploy
+RUN_ROLLUP_REBUILD_DAYS = int(os.getenv("RUN_ROLLUP_REBUILD_DAYS", "3"))
+
+@op(required_resource_keys={"db_engine"})
+def rebuild_recent_rollups(context: OpExecutionContext) -> None:
+    end_day = date.today()
+    start_day = end_day - timedelta(days=RUN_ROLLUP_REBUILD_DAYS)
+    with context.resources.db_engine.begin() as conn:
+        conn.execute(
+            text("SELECT workflow.rebuild_daily_rollups(:from_day, :to_day)"),
+            {"from_day": start_day, "to_day": end_day}
+        )
+    context.log.info(f"Rebuilt daily rollups from {start_day} to {end_day}")
+
+@job
+def maintenance_job_rollups():
+    rebuild_recent_rollups()
+
+daily_rollups_schedule = ScheduleDefinition(
+    job=maintenance_job_rollups,
+    cron_schedule="30 2 * * *",
+    name="daily_rollups_schedule"
+)
@@ -1,6 +1,7 @@
 import os
 import sys
 import logging
+from pathlib import Path
 from typing import List, Optional
 from github import Github, GithubException
 from dagster import (
@@ -18,6 +19,11 @@ from dagster import (
     SensorEvaluationContext,
     SensorResult,
     RunsFilter,
+    run_status_sensor,
+    run_failure_sensor,
+    RunStatusSensorContext,
+    RunFailureSensorContext,
+    DefaultSensorStatus,
     DagsterRunStatus,
     job,
     op,
@@ -68,6 +74,16 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Dagster loads this module as a standalone file (dagster dev -f repo.py), so there is no
+# parent package; put the server directory on sys.path to reach the shared app modules.
+# Imported after load_dotenv() so their module-level settings see .env
+SERVER_DIR = str(Path(__file__).resolve().parents[2])
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+from app.run_events import notify_run_event
+from app.run_ingestion import write_run_events
+
 # Configuration
 GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
 GITHUB_REPO_OWNER = os.getenv("GITHUB_REPO_OWNER", "seanjnugent")
@@ -76,6 +92,8 @@ GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
 DAGSTER_HOST = os.getenv("DAGSTER_HOST", "localhost")
 DAGSTER_PORT = os.getenv("DAGSTER_PORT", "3500")
 DAGSTER_URL = f"http://{DAGSTER_HOST}:{DAGSTER_PORT}/graphql"
+# How often step and log events of in-flight runs are pulled into the database
+RUN_PROGRESS_SYNC_SECONDS = int(os.getenv("RUN_PROGRESS_SYNC_SECONDS", "5"))
 
 # Validate environment variables
 required_core_vars = [
@@ -183,16 +201,6 @@ def log_failure(context: OpExecutionContext):
     except Exception as e:
         logger.error(f"Failed to log failure for op {context.op.name}: {str(e)}")
 
-# Event types for sensor, excluding LogMessageEvent
-RELEVANT_EVENT_TYPES = {
-    "MessageEvent",
-    "ExecutionStepFailureEvent",
-    "ExecutionStepInputEvent",
-    "ExecutionStepOutputEvent",
-    "ExecutionStepStartEvent",
-    "ExecutionStepSuccessEvent",
-}
-
 # Dynamic Output Path Extraction Functions
 def substitute_template_variables_sensor(template: str, variables: dict) -> str:
     """Substitute template variables in a string"""
@@ -346,170 +354,251 @@ def extract_dynamic_output_paths_sensor(db_engine, dagster_run_id: str, run_conf
         logger.error(f"Failed to extract dynamic output paths for {dagster_run_id}: {str(e)}")
         return extract_legacy_output_paths_sensor(run_config)
 
-def insert_run_logs_and_steps(db, dagster_run_id: str, logs: list, db_run_id: int) -> int:
-    """Insert or update logs and step statuses in the database for new events only, excluding LogMessageEvent."""
+def insert_run_logs_and_steps(db, dagster_run_id: str, logs: list, db_run_id: int,
+                              event_cursor: Optional[str] = None) -> int:
+    """Insert or update logs and step statuses for new events in one batched transaction, excluding LogMessageEvent.
+
+    event_cursor is stored as the run's ingestion resume point in the same transaction.
+    """
     logger.info(f"Starting log insertion for run {dagster_run_id} with {len(logs)} logs")
-    log_count = 0
     start_time = time.time()
 
     with db.connect() as conn:
-        for log in logs:
-            event_type = log.get("__typename", "UnknownEvent")
-            if event_type not in RELEVANT_EVENT_TYPES:
-                logger.debug(f"Skipping irrelevant event type {event_type} for run {dagster_run_id}")
-                continue
+        try:
+            log_count = write_run_events(conn, dagster_run_id, db_run_id, logs, event_cursor)
+            if log_count:
+                notify_run_event(conn, db_run_id, "logs")
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to write logs for run {dagster_run_id}: {str(e)}")
+            conn.rollback()
+            raise
 
-            step_key = log.get("stepKey")
-            timestamp = None
-            try:
-                raw_ts = log.get("timestamp")
-                if raw_ts:
-                    timestamp = float(raw_ts) / 1000  # Convert ms to seconds
-            except (TypeError, ValueError):
-                logger.debug(f"Invalid timestamp for event {event_type} in run {dagster_run_id}")
-                continue
+    logger.info(f"Processed {log_count} logs for run {dagster_run_id} in {time.time() - start_time:.2f} seconds")
+    return log_count
 
-            # Step status updates
-            if step_key:
-                try:
-                    if event_type == "ExecutionStepStartEvent":
-                        conn.execute(
-                            text("""
-                                INSERT INTO workflow.run_step_status (
-                                    dagster_run_id, step_code, status, started_at, run_id
-                                ) VALUES (
-                                    :dagster_run_id, :step_code, 'STARTED', 
-                                    TO_TIMESTAMP(:timestamp), 
-                                    :run_id
-                                ) ON CONFLICT (dagster_run_id, step_code) 
-                                DO UPDATE SET
-                                    status = EXCLUDED.status,
-                                    started_at = EXCLUDED.started_at,
-                                    run_id = EXCLUDED.run_id
-                            """),
-                            {
-                                "dagster_run_id": dagster_run_id,
-                                "step_code": step_key,
-                                "timestamp": timestamp,
-                                "run_id": db_run_id,
-                            },
-                        )
-                    elif event_type in ["ExecutionStepSuccessEvent", "ExecutionStepOutputEvent"]:
-                        conn.execute(
-                            text("""
-                                UPDATE workflow.run_step_status
-                                SET status = 'SUCCESS',
-                                    finished_at = TO_TIMESTAMP(:timestamp),
-                                    end_time = TO_TIMESTAMP(:timestamp)
-                                WHERE dagster_run_id = :dagster_run_id AND step_code = :step_code
-                            """),
-                            {
-                                "dagster_run_id": dagster_run_id,
-                                "step_code": step_key,
-                                "timestamp": timestamp,
-                            },
-                        )
-                    elif event_type == "ExecutionStepFailureEvent":
-                        error = log.get("error", {})
-                        conn.execute(
-                            text("""
-                                UPDATE workflow.run_step_status
-                                SET status = 'FAILURE',
-                                    finished_at = TO_TIMESTAMP(:timestamp),
-                                    end_time = TO_TIMESTAMP(:timestamp),
-                                    error_message = :error_message
-                                WHERE dagster_run_id = :dagster_run_id AND step_code = :step_code
-                            """),
-                            {
-                                "dagster_run_id": dagster_run_id,
-                                "step_code": step_key,
-                                "timestamp": timestamp,
-                                "error_message": error.get("message", "Unknown error"),
-                            },
-                        )
-                    logger.debug(f"Updated step status for event {event_type}, step {step_key} in run {dagster_run_id}")
-                    conn.commit()
-                except Exception as e:
-                    logger.error(f"Failed to update step status for run {dagster_run_id}, step {step_key}: {str(e)}")
-                    conn.rollback()
-                    continue
+# Dagster run status -> workflow.run status
+STATUS_MAPPING = {
+    "SUCCESS": "Completed",
+    "FAILURE": "Failed",
+    "CANCELED": "Cancelled",
+    "QUEUED": "Queued",
+    "STARTED": "Running",
+    "RUNNING": "Running",
+    "STARTING": "Running",
+    "CANCELING": "Cancelling",
+}
+TERMINAL_WORKFLOW_STATUSES = ["Completed", "Failed", "Cancelled"]
+
+RUN_LOGS_QUERY = """
+query RunLogsQuery($runId: ID!, $afterCursor: String) {
+    pipelineRunOrError(runId: $runId) {
+        __typename
+        ... on Run {
+            runId
+            status
+            startTime
+            endTime
+            runConfig
+            tags {
+                key
+                value
+            }
+            pipeline {
+                name
+            }
+            executionPlan {
+                steps {
+                    key
+                }
+            }
+            eventConnection(afterCursor: $afterCursor) {
+                cursor
+                events {
+                    __typename
+                    ... on MessageEvent {
+                        message
+                        timestamp
+                        level
+                        stepKey
+                    }
+                    ... on ExecutionStepFailureEvent {
+                        error {
+                            message
+                            stack
+                        }
+                        stepKey
+                        timestamp
+                    }
+                    ... on ExecutionStepInputEvent {
+                        inputName
+                        typeCheck {
+                            label
+                            description
+                            success
+                        }
+                        timestamp
+                    }
+                    ... on ExecutionStepOutputEvent {
+                        outputName
+                        typeCheck {
+                            label
+                            description
+                            success
+                        }
+                        timestamp
+                    }
+                    ... on ExecutionStepStartEvent {
+                        stepKey
+                        timestamp
+                    }
+                    ... on ExecutionStepSuccessEvent {
+                        stepKey
+                        timestamp
+                    }
+                }
+            }
+        }
+        ... on RunNotFoundError {
+            message
+        }
+        ... on PythonError {
+            message
+            stack
+        }
+    }
+}
+"""
 
-            # Log message
-            if event_type == "MessageEvent":
-                message = log.get("message", "No message")
-                level = log.get("level", "INFO").lower()
-            elif event_type == "ExecutionStepFailureEvent":
-                error = log.get("error", {})
-                message = error.get("message", "Step failed")
-                level = "ERROR"
-            elif event_type in ["ExecutionStepInputEvent", "ExecutionStepOutputEvent"]:
-                name = log.get("inputName") or log.get("outputName", "unknown")
-                type_check = log.get("typeCheck", {})
-                success = type_check.get("success", False)
-                message = f"{event_type} for {name}: {'Success' if success else 'Failed'}"
-                level = "INFO" if success else "ERROR"
-            else:
-                message = f"{event_type} occurred"
-                level = "INFO"
+def fetch_run_data(dagster_run_id: str, after_cursor: Optional[str] = None, max_retries: int = 3) -> Optional[dict]:
+    """Fetch status, config and events for a Dagster run via GraphQL, retrying transient failures.
 
-            # Insert log with upsert to handle unique constraint
-            try:
-                conn.execute(
-                    text("""
-                        INSERT INTO workflow.run_log (
-                            dagster_run_id, run_id, step_code, event_type, message, log_level, timestamp, event_data
-                        ) VALUES (
-                            :dagster_run_id, :run_id, :step_code, :event_type, :message, :log_level,
-                            TO_TIMESTAMP(:timestamp),
-                            :event_data
-                        ) ON CONFLICT (dagster_run_id, event_type, timestamp)
-                        DO UPDATE SET
-                            message = EXCLUDED.message,
-                            log_level = EXCLUDED.log_level,
-                            event_data = EXCLUDED.event_data
-                    """),
-                    {
-                        "dagster_run_id": dagster_run_id,
-                        "run_id": db_run_id,
-                        "step_code": step_key,
-                        "event_type": event_type,
-                        "message": message,
-                        "log_level": level,
-                        "timestamp": timestamp,
-                        "event_data": json.dumps(log),
-                    },
-                )
-                conn.commit()
-                log_count += 1
-                logger.debug(f"Inserted/Updated log for event {event_type}, step {step_key} in run {dagster_run_id}")
-            except Exception as e:
-                logger.error(f"Failed to insert log for run {dagster_run_id}, event {event_type}, step {step_key}, timestamp {timestamp}: {str(e)}")
-                conn.rollback()
-                continue
+    Only events after ``after_cursor`` (a previous response's eventConnection.cursor) are returned.
+    """
+    result = None
+    for attempt in range(max_retries):
+        try:
+            response = requests.post(
+                DAGSTER_URL,
+                json={"query": RUN_LOGS_QUERY, "variables": {"runId": dagster_run_id, "afterCursor": after_cursor}},
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+            response.raise_for_status()
+            result = response.json()
+            break
+        except RequestException as e:
+            logger.warning(f"Attempt {attempt + 1} failed for run {dagster_run_id}: {str(e)}")
+            if attempt == max_retries - 1:
+                logger.error(f"Failed to fetch GraphQL data for run {dagster_run_id} after {max_retries} attempts")
+                return None
+            time.sleep(2)
+
+    if "errors" in result:
+        logger.error(f"GraphQL errors for run {dagster_run_id}: {result['errors']}")
+        return None
+
+    run_data = result.get("data", {}).get("pipelineRunOrError", {})
+    if run_data.get("__typename") != "Run":
+        logger.error(f"Unexpected response for run {dagster_run_id}: {run_data.get('__typename')}")
+        return None
+
+    return run_data
+
+def sync_run_to_database(db_engine, dagster_run_id: str, db_run_id: int, after_cursor: Optional[str] = None) -> bool:
+    """Sync a Dagster run's status, new events and output paths into workflow.run.
+
+    Only events after ``after_cursor`` (the run's stored ingest_cursor) are written,
+    and the cursor advances with them. Returns False if the run could not be synced.
+    """
+    run_data = fetch_run_data(dagster_run_id, after_cursor)
+    if run_data is None:
+        return False
+
+    # Extract run details
+    status = run_data.get("status")
+    start_time_ms = run_data.get("startTime")
+    end_time_ms = run_data.get("endTime")
+    run_config = run_data.get("runConfig")
+    event_connection = run_data.get("eventConnection") or {}
+    logs = event_connection.get("events", [])
+    logger.info(f"Processing run {dagster_run_id}: status={status}, new_events={len(logs)}")
+
+    # Process logs and step statuses
+    try:
+        log_count = insert_run_logs_and_steps(db_engine, dagster_run_id, logs, db_run_id, event_connection.get("cursor"))
+    except Exception as e:
+        logger.error(f"Failed to process logs for run {dagster_run_id}: {str(e)}")
+        return False
 
-    logger.info(f"Processed {log_count} logs for run {dagster_run_id} in {time.time() - start_time:.2f} seconds")
-    return log_count
+    # Update workflow.run table
+    workflow_status = STATUS_MAPPING.get(status, status)
+    logger.debug(f"Mapping Dagster status {status} to workflow status {workflow_status} for run {dagster_run_id}")
+
+    duration_ms = None
+    if start_time_ms and end_time_ms:
+        try:
+            duration_ms = (float(end_time_ms) - float(start_time_ms)) * 1000
+        except (TypeError, ValueError):
+            logger.debug(f"Failed to calculate duration for run {dagster_run_id}")
+
+    # ENHANCED DYNAMIC OUTPUT PATH EXTRACTION - This is the key change!
+    output_file_paths = []
+    if status == "SUCCESS" and run_config:
+        output_file_paths = extract_dynamic_output_paths_sensor(db_engine, dagster_run_id, run_config)
+        logger.debug(f"Extracted {len(output_file_paths)} dynamic output paths for run {dagster_run_id}: {output_file_paths}")
+
+    try:
+        with db_engine.connect() as conn:
+            conn.execute(
+                text("""
+                    UPDATE workflow.run
+                    SET status = :status,
+                        finished_at = TO_TIMESTAMP(:end_time),
+                        duration_ms = :duration_ms,
+                        output_file_path = CAST(:output_file_path AS jsonb),
+                        updated_at = NOW()
+                    WHERE dagster_run_id = :dagster_run_id
+                """),
+                {
+                    "status": workflow_status,
+                    "end_time": end_time_ms,
+                    "duration_ms": duration_ms,
+                    "output_file_path": json.dumps(output_file_paths),
+                    "dagster_run_id": dagster_run_id,
+                },
+            )
+            notify_run_event(conn, db_run_id, "status")
+            conn.commit()
+        logger.info(f"Updated run {dagster_run_id} to status {workflow_status}, processed {log_count} logs, stored {len(output_file_paths)} output paths")
+    except Exception as e:
+        logger.error(f"Failed to update run {dagster_run_id}: {str(e)}")
+        return False
+
+    return True
 
 @sensor(
-    minimum_interval_seconds=60, # 2.5 minutes
+    minimum_interval_seconds=300, # 5 minutes
     required_resource_keys={"db_engine"}
 )
 def workflow_run_status_sensor(context: SensorEvaluationContext):
-    """Sensor that syncs Dagster run status and logs to the database, processing only new events for non-terminal runs."""
+    """Safety-net sweep that syncs Dagster run status and logs to the database.
+
+    Status transitions are pushed by the run status sensors below; this sweep only
+    catches runs they missed (e.g. while the daemon was down).
+    """
     logger.info("Starting workflow_run_status_sensor evaluation")
     instance = context.instance
     db_engine = context.resources.db_engine
 
-    # Parse cursor: {run_id: last_event_timestamp}
-    cursor = context.cursor or json.dumps({"last_check": 0, "run_timestamps": {}})
+    # Parse cursor: {last_check}; per-run event cursors live in workflow.run.ingest_cursor
+    cursor = context.cursor or json.dumps({"last_check": 0})
     try:
         cursor_data = json.loads(cursor)
         last_check = cursor_data.get("last_check", 0)
-        run_timestamps = cursor_data.get("run_timestamps", {})
     except json.JSONDecodeError:
         logger.warning(f"Invalid cursor value: {cursor}. Resetting.")
         last_check = 0
-        run_timestamps = {}
 
     # Convert last_check to datetime for run filtering
     last_check_datetime = (
@@ -547,89 +636,8 @@ def workflow_run_status_sensor(context: SensorEvaluationContext):
 
     # Process runs
     runs_processed = 0
-    new_run_timestamps = run_timestamps.copy()
     latest_check = last_check
 
-    # GraphQL query
-    query = """
-    query RunLogsQuery($runId: ID!) {
-        pipelineRunOrError(runId: $runId) {
-            __typename
-            ... on Run {
-                runId
-                status
-                startTime
-                endTime
-                runConfig
-                tags {
-                    key
-                    value
-                }
-                pipeline {
-                    name
-                }
-                executionPlan {
-                    steps {
-                        key
-                    }
-                }
-                eventConnection {
-                    events {
-                        __typename
-                        ... on MessageEvent {
-                            message
-                            timestamp
-                            level
-                            stepKey
-                        }
-                        ... on ExecutionStepFailureEvent {
-                            error {
-                                message
-                                stack
-                            }
-                            stepKey
-                            timestamp
-                        }
-                        ... on ExecutionStepInputEvent {
-                            inputName
-                            typeCheck {
-                                label
-                                description
-                                success
-                            }
-                            timestamp
-                        }
-                        ... on ExecutionStepOutputEvent {
-                            outputName
-                            typeCheck {
-                                label
-                                description
-                                success
-                            }
-                            timestamp
-                        }
-                        ... on ExecutionStepStartEvent {
-                            stepKey
-                            timestamp
-                        }
-                        ... on ExecutionStepSuccessEvent {
-                            stepKey
-                            timestamp
-                        }
-                    }
-                }
-            }
-            ... on RunNotFoundError {
-                message
-            }
-            ... on PythonError {
-                message
-                stack
-            }
-        }
-    }
-    """
-
     try:
         with db_engine.connect() as conn:
             for run_record in runs:
@@ -642,132 +650,24 @@ def workflow_run_status_sensor(context: SensorEvaluationContext):
 
                 # Check database status to skip terminal runs
                 run_info = conn.execute(
-                    text("SELECT id, workflow_id, status FROM workflow.run WHERE dagster_run_id = :dagster_run_id"),
+                    text("SELECT id, workflow_id, status, ingest_cursor FROM workflow.run WHERE dagster_run_id = :dagster_run_id"),
                     {"dagster_run_id": dagster_run_id},
                 ).fetchone()
                 if not run_info:
                     logger.warning(f"No run record found for {dagster_run_id}, skipping")
                     continue
 
-                db_run_id, workflow_id, current_status = run_info
+                db_run_id, workflow_id, current_status, ingest_cursor = run_info
                 logger.debug(f"Found run record for {dagster_run_id} with workflow_id {workflow_id}, status {current_status}")
 
-                if current_status in ["Completed", "Failed", "Cancelled"]:
+                if current_status in TERMINAL_WORKFLOW_STATUSES:
                     logger.info(f"Run {dagster_run_id} already in terminal state {current_status}, skipping")
                     continue
 
                 logger.info(f"Processing run {dagster_run_id} with status {run.status} updated at {update_timestamp}")
 
-                # Fetch run data via GraphQL with retries
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        response = requests.post(
-                            DAGSTER_URL,
-                            json={"query": query, "variables": {"runId": dagster_run_id}},
-                            headers={"Content-Type": "application/json"},
-                            timeout=30,
-                        )
-                        response.raise_for_status()
-                        result = response.json()
-                        break
-                    except RequestException as e:
-                        logger.warning(f"Attempt {attempt + 1} failed for run {dagster_run_id}: {str(e)}")
-                        if attempt == max_retries - 1:
-                            logger.error(f"Failed to fetch GraphQL data for run {dagster_run_id} after {max_retries} attempts")
-                            continue
-                        time.sleep(2)
-                else:
-                    continue
-
-                if "errors" in result:
-                    logger.error(f"GraphQL errors for run {dagster_run_id}: {result['errors']}")
-                    continue
-
-                run_data = result.get("data", {}).get("pipelineRunOrError", {})
-                if run_data.get("__typename") != "Run":
-                    logger.error(f"Unexpected response for run {dagster_run_id}: {run_data.get('__typename')}")
-                    continue
-
-                # Extract run details
-                status = run_data.get("status")
-                start_time_ms = run_data.get("startTime")
-                end_time_ms = run_data.get("endTime")
-                run_config = run_data.get("runConfig")
-                logs = run_data.get("eventConnection", {}).get("events", [])
-
-                # Filter logs by timestamp
-                last_run_timestamp = new_run_timestamps.get(dagster_run_id, 0)
-                filtered_logs = [
-                    log for log in logs
-                    if log.get("timestamp") and float(log["timestamp"]) / 1000 > last_run_timestamp
-                ]
-                logger.info(f"Processing run {dagster_run_id}: status={status}, filtered_logs={len(filtered_logs)}/{len(logs)}")
-
-                # Process logs and step statuses
-                try:
-                    log_count = insert_run_logs_and_steps(db_engine, dagster_run_id, filtered_logs, db_run_id)
-                except Exception as e:
-                    logger.error(f"Failed to process logs for run {dagster_run_id}: {str(e)}")
+                if not sync_run_to_database(db_engine, dagster_run_id, db_run_id, ingest_cursor):
                     continue
-
-                # Update workflow.run table
-                status_mapping = {
-                    "SUCCESS": "Completed",
-                    "FAILURE": "Failed",
-                    "CANCELED": "Cancelled",
-                    "QUEUED": "Queued",
-                    "STARTED": "Running",
-                    "RUNNING": "Running",
-                    "STARTING": "Running",
-                    "CANCELING": "Cancelling",
-                }
-                workflow_status = status_mapping.get(status, status)
-                logger.debug(f"Mapping Dagster status {status} to workflow status {workflow_status} for run {dagster_run_id}")
-
-                duration_ms = None
-                if start_time_ms and end_time_ms:
-                    try:
-                        duration_ms = (float(end_time_ms) - float(start_time_ms)) * 1000
-                    except (TypeError, ValueError):
-                        logger.debug(f"Failed to calculate duration for run {dagster_run_id}")
-
-                # ENHANCED DYNAMIC OUTPUT PATH EXTRACTION - This is the key change!
-                output_file_paths = []
-                if status == "SUCCESS" and run_config:
-                    output_file_paths = extract_dynamic_output_paths_sensor(db_engine, dagster_run_id, run_config)
-                    logger.debug(f"Extracted {len(output_file_paths)} dynamic output paths for run {dagster_run_id}: {output_file_paths}")
-
-                try:
-                    conn.execute(
-                        text("""
-                            UPDATE workflow.run
-                            SET status = :status,
-                                finished_at = TO_TIMESTAMP(:end_time),
-                                duration_ms = :duration_ms,
-                                output_file_path = CAST(:output_file_path AS jsonb),
-                                updated_at = NOW()
-                            WHERE dagster_run_id = :dagster_run_id
-                        """),
-                        {
-                            "status": workflow_status,
-                            "end_time": end_time_ms,
-                            "duration_ms": duration_ms,
-                            "output_file_path": json.dumps(output_file_paths),
-                            "dagster_run_id": dagster_run_id,
-                        },
-                    )
-                    conn.commit()
-                    logger.info(f"Updated run {dagster_run_id} to status {workflow_status}, processed {log_count} logs, stored {len(output_file_paths)} output paths")
-                except Exception as e:
-                    logger.error(f"Failed to update run {dagster_run_id}: {str(e)}")
-                    conn.rollback()
-                    continue
-
-                # Update run timestamp
-                if filtered_logs:
-                    latest_log_timestamp = max(float(log["timestamp"]) / 1000 for log in filtered_logs if log.get("timestamp"))
-                    new_run_timestamps[dagster_run_id] = latest_log_timestamp
                 runs_processed += 1
 
                 if update_timestamp.timestamp() > latest_check:
@@ -781,7 +681,7 @@ def workflow_run_status_sensor(context: SensorEvaluationContext):
         )
 
     # Update cursor
-    new_cursor = json.dumps({"last_check": latest_check, "run_timestamps": new_run_timestamps})
+    new_cursor = json.dumps({"last_check": latest_check})
     logger.info(f"Processed {runs_processed} runs. Updated cursor to: {new_cursor}")
 
     return SensorResult(
@@ -789,6 +689,236 @@ def workflow_run_status_sensor(context: SensorEvaluationContext):
         run_requests=[]
     )
 
+def push_run_started(db_engine, dagster_run_id: str) -> None:
+    """Mark a run as Running as soon as Dagster reports it has started."""
+    try:
+        with db_engine.connect() as conn:
+            result = conn.execute(
+                text("""
+                    UPDATE workflow.run
+                    SET status = 'Running',
+                        updated_at = NOW()
+                    WHERE dagster_run_id = :dagster_run_id
+                      AND status NOT IN ('Running', 'Completed', 'Failed', 'Cancelled')
+                    RETURNING id
+                """),
+                {"dagster_run_id": dagster_run_id},
+            )
+            updated = result.fetchone()
+            if updated:
+                notify_run_event(conn, updated.id, "status")
+            conn.commit()
+        if updated:
+            logger.info(f"Pushed start transition for run {dagster_run_id}")
+    except Exception as e:
+        logger.error(f"Failed to push start transition for run {dagster_run_id}: {str(e)}")
+
+def find_run_to_sync(db_engine, dagster_run_id: str):
+    """workflow.run id, status and ingestion resume point (Dagster event cursor) for a Dagster run"""
+    try:
+        with db_engine.connect() as conn:
+            return conn.execute(
+                text("""
+                    SELECT r.id, r.status, r.ingest_cursor
+                    FROM workflow.run r
+                    WHERE r.dagster_run_id = :dagster_run_id
+                """),
+                {"dagster_run_id": dagster_run_id},
+            ).fetchone()
+    except Exception as e:
+        logger.error(f"Failed to look up run {dagster_run_id}: {str(e)}")
+        return None
+
+def push_run_progress(db_engine, dagster_run_id: str) -> None:
+    """Write the step and log events a running run has emitted since the last sync."""
+    run_info = find_run_to_sync(db_engine, dagster_run_id)
+    if not run_info or run_info.status in TERMINAL_WORKFLOW_STATUSES:
+        return
+
+    run_data = fetch_run_data(dagster_run_id, run_info.ingest_cursor)
+    if run_data is None:
+        return
+    event_connection = run_data.get("eventConnection") or {}
+    if not event_connection.get("events"):
+        return
+    try:
+        insert_run_logs_and_steps(
+            db_engine, dagster_run_id, event_connection["events"], run_info.id, event_connection.get("cursor")
+        )
+    except Exception as e:
+        logger.error(f"Failed to push progress for run {dagster_run_id}: {str(e)}")
+
+def push_run_finished(db_engine, dagster_run_id: str) -> None:
+    """Sync a run that reached a terminal Dagster status, resuming after the last ingested event."""
+    run_info = find_run_to_sync(db_engine, dagster_run_id)
+    if not run_info:
+        logger.debug(f"No run record found for {dagster_run_id}, skipping push sync")
+        return
+    if run_info.status in TERMINAL_WORKFLOW_STATUSES:
+        logger.debug(f"Run {dagster_run_id} already in terminal state {run_info.status}, skipping push sync")
+        return
+
+    if sync_run_to_database(db_engine, dagster_run_id, run_info.id, run_info.ingest_cursor):
+        logger.info(f"Pushed terminal transition for run {dagster_run_id}")
+
+@sensor(
+    minimum_interval_seconds=RUN_PROGRESS_SYNC_SECONDS,
+    default_status=DefaultSensorStatus.RUNNING,
+    required_resource_keys={"db_engine"}
+)
+def workflow_run_progress_sensor(context: SensorEvaluationContext):
+    """Push step statuses and logs of in-flight runs every few seconds.
+
+    Status sensors only fire on transitions, so without this a running run's progress
+    would wait for the safety-net sweep. Idle ticks cost one run-storage query.
+    """
+    runs = context.instance.get_run_records(
+        filters=RunsFilter(statuses=[DagsterRunStatus.STARTED]),
+        limit=50,
+    )
+    for run_record in runs:
+        push_run_progress(context.resources.db_engine, run_record.dagster_run.run_id)
+    return SensorResult(run_requests=[])
+
+# Push-based status propagation: these fire within a daemon tick of the transition,
+# so workflow.run no longer waits for the periodic sweep above.
+@run_status_sensor(
+    run_status=DagsterRunStatus.STARTED,
+    minimum_interval_seconds=1,
+    default_status=DefaultSensorStatus.RUNNING,
+    required_resource_keys={"db_engine"}
+)
+def workflow_run_started_sensor(context: RunStatusSensorContext):
+    push_run_started(context.resources.db_engine, context.dagster_run.run_id)
+
+@run_status_sensor(
+    run_status=DagsterRunStatus.SUCCESS,
+    minimum_interval_seconds=1,
+    default_status=DefaultSensorStatus.RUNNING,
+    required_resource_keys={"db_engine"}
+)
+def workflow_run_success_sensor(context: RunStatusSensorContext):
+    push_run_finished(context.resources.db_engine, context.dagster_run.run_id)
+
+@run_failure_sensor(
+    minimum_interval_seconds=1,
+    default_status=DefaultSensorStatus.RUNNING,
+    required_resource_keys={"db_engine"}
+)
+def workflow_run_failure_sensor(context: RunFailureSensorContext):
+    push_run_finished(context.resources.db_engine, context.dagster_run.run_id)
+
+@run_status_sensor(
+    run_status=DagsterRunStatus.CANCELED,
+    minimum_interval_seconds=1,
+    default_status=DefaultSensorStatus.RUNNING,
+    required_resource_keys={"db_engine"}
+)
+def workflow_run_canceled_sensor(context: RunStatusSensorContext):
+    push_run_finished(context.resources.db_engine, context.dagster_run.run_id)
+
+def load_definitions_from_source(file_content: str, module_name: str, source_path: str,
+                                  directory: str) -> tuple[List[JobDefinition], List[ScheduleDefinition]]:
+    """Execute a job/schedule file and register the definitions it declares."""
+    jobs = []
+    schedules = []
+
+    # Create a clean module namespace
+    module_globals = {
+        '__name__': module_name,
+        '__file__': source_path,
+        'sys': sys,
+        'os': os,
+        'json': __import__('json'),
+        'io': __import__('io'),
+        'datetime': __import__('datetime'),
+        'timezone': timezone,
+        'load_dotenv': load_dotenv,
+        'pd': __import__('pandas'),
+        'boto3': boto3,
+        'create_engine': create_engine,
+        'text': text,
+        'job': job,
+        'op': op,
+        'graph': graph,
+        'GraphDefinition': GraphDefinition,
+        'OpExecutionContext': OpExecutionContext,
+        'ScheduleDefinition': ScheduleDefinition,
+        'Out': __import__('dagster').Out,
+        'In': __import__('dagster').In,
+        'Field': Field,
+        'Int': __import__('dagster').Int,
+        'String': __import__('dagster').String,
+        'Permissive': __import__('dagster').Permissive,
+        'Dict': dict,
+        'Optional': type(None),
+        'List': list,
+    }
+
+    try:
+        from botocore.config import Config as BotoConfig
+        module_globals['BotoConfig'] = BotoConfig
+    except ImportError:
+        pass
+
+    # Execute the file content
+    exec(file_content, module_globals)
+
+    # Look for JobDefinition and ScheduleDefinition objects
+    found_job = False
+    found_schedule = False
+
+    for name, obj in module_globals.items():
+        # Handle JobDefinition objects
+        if isinstance(obj, JobDefinition):
+            # Set job name based on directory
+            if directory == "maintenance":
+                job_prefix = "maintenance_job"
+            else:
+                job_prefix = "workflow_job"
+            workflow_id = module_name.split('_')[-1] if module_name.startswith(f'{job_prefix}_') else name
+            obj._name = f"{job_prefix}_{workflow_id}"
+
+            # Assign resources
+            obj._resource_defs = {
+                "s3": s3_resource,
+                "db_engine": db_engine_resource
+            }
+
+            # Assign hooks
+            obj._hooks = {log_success, log_failure}
+
+            # Assign tags
+            obj.tags = obj.tags or {}
+            obj.tags["workflow_id"] = workflow_id
+            obj.tags["job_type"] = job_prefix
+
+            jobs.append(obj)
+            logger.info(f"Successfully loaded job: {obj.name} from {source_path}")
+            found_job = True
+
+        # Handle ScheduleDefinition objects
+        elif isinstance(obj, ScheduleDefinition):
+            # Update schedule to use resources if the job doesn't have them
+            if hasattr(obj.job, '_resource_defs') and not obj.job._resource_defs:
+                obj.job._resource_defs = {
+                    "s3": s3_resource,
+                    "db_engine": db_engine_resource
+                }
+
+            # Add hooks if not present
+            if hasattr(obj.job, '_hooks') and not obj.job._hooks:
+                obj.job._hooks = {log_success, log_failure}
+
+            schedules.append(obj)
+            logger.info(f"Successfully loaded schedule: {obj.name} from {source_path}")
+            found_schedule = True
+
+    if not found_job and not found_schedule:
+        logger.warning(f"No JobDefinition or ScheduleDefinition found in {source_path}")
+
+    return jobs, schedules
+
 def load_jobs_and_schedules_from_github(directories: List[str] = ["DAGs", "maintenance"]) -> tuple[List[JobDefinition], List[ScheduleDefinition]]:
     """Load Dagster job and schedule definitions from GitHub repository directories."""
     jobs = []
@@ -823,99 +953,11 @@ def load_jobs_and_schedules_from_github(directories: List[str] = ["DAGs", "maint
                         file_content = content.decoded_content.decode('utf-8')
                         logger.debug(f"Loading job/schedule from {content.path}")
 
-                        # Create a clean module namespace
-                        module_globals = {
-                            '__name__': module_name,
-                            '__file__': f'<github:{content.path}>',
-                            'sys': sys,
-                            'os': os,
-                            'json': __import__('json'),
-                            'io': __import__('io'),
-                            'datetime': __import__('datetime'),
-                            'timezone': timezone,
-                            'load_dotenv': load_dotenv,
-                            'pd': __import__('pandas'),
-                            'boto3': boto3,
-                            'create_engine': create_engine,
-                            'text': text,
-                            'job': job,
-                            'op': op,
-                            'graph': graph,
-                            'GraphDefinition': GraphDefinition,
-                            'OpExecutionContext': OpExecutionContext,
-                            'ScheduleDefinition': ScheduleDefinition,
-                            'Out': __import__('dagster').Out,
-                            'In': __import__('dagster').In,
-                            'Field': Field,
-                            'Int': __import__('dagster').Int,
-                            'String': __import__('dagster').String,
-                            'Permissive': __import__('dagster').Permissive,
-                            'Dict': dict,
-                            'Optional': type(None),
-                            'List': list,
-                        }
-
-                        try:
-                            from botocore.config import Config as BotoConfig
-                            module_globals['BotoConfig'] = BotoConfig
-                        except ImportError:
-                            pass
-
-                        # Execute the file content
-                        exec(file_content, module_globals)
-
-                        # Look for JobDefinition and ScheduleDefinition objects
-                        found_job = False
-                        found_schedule = False
-                        
-                        for name, obj in module_globals.items():
-                            # Handle JobDefinition objects
-                            if isinstance(obj, JobDefinition):
-                                # Set job name based on directory
-                                if directory == "maintenance":
-                                    job_prefix = "maintenance_job"
-                                else:
-                                    job_prefix = "workflow_job"
-                                workflow_id = module_name.split('_')[-1] if module_name.startswith(f'{job_prefix}_') else name
-                                obj._name = f"{job_prefix}_{workflow_id}"
-
-                                # Assign resources
-                                obj._resource_defs = {
-                                    "s3": s3_resource,
-                                    "db_engine": db_engine_resource
-                                }
-
-                                # Assign hooks
-                                obj._hooks = {log_success, log_failure}
-
-                                # Assign tags
-                                obj.tags = obj.tags or {}
-                                obj.tags["workflow_id"] = workflow_id
-                                obj.tags["job_type"] = job_prefix
-
-                                jobs.append(obj)
-                                logger.info(f"Successfully loaded job: {obj.name} from {content.path}")
-                                found_job = True
-                                
-                            # Handle ScheduleDefinition objects
-                            elif isinstance(obj, ScheduleDefinition):
-                                # Update schedule to use resources if the job doesn't have them
-                                if hasattr(obj.job, '_resource_defs') and not obj.job._resource_defs:
-                                    obj.job._resource_defs = {
-                                        "s3": s3_resource,
-                                        "db_engine": db_engine_resource
-                                    }
-                                
-                                # Add hooks if not present
-                                if hasattr(obj.job, '_hooks') and not obj.job._hooks:
-                                    obj.job._hooks = {log_success, log_failure}
-
-                                schedules.append(obj)
-                                logger.info(f"Successfully loaded schedule: {obj.name} from {content.path}")
-                                found_schedule = True
-
-                        if not found_job and not found_schedule:
-                            logger.warning(f"No JobDefinition or ScheduleDefinition found in {content.path}")
+                        file_jobs, file_schedules = load_definitions_from_source(
+                            file_content, module_name, f"<github:{content.path}>", directory
+                        )
+                        jobs.extend(file_jobs)
+                        schedules.extend(file_schedules)
 
                     except Exception as e:
                         logger.error(f"Failed to load job/schedule from {content.path}: {str(e)}")
@@ -934,14 +976,49 @@ def load_jobs_and_schedules_from_github(directories: List[str] = ["DAGs", "maint
 
     return jobs, schedules
 
+def load_jobs_and_schedules_from_local(directories: List[str] = ["maintenance"]) -> tuple[List[JobDefinition], List[ScheduleDefinition]]:
+    """Load Dagster job and schedule definitions shipped alongside this repository."""
+    jobs = []
+    schedules = []
+    base_dir = Path(__file__).parent
+
+    for directory in directories:
+        local_dir = base_dir / directory
+        if not local_dir.is_dir():
+            logger.warning(f"Local directory {local_dir} not found")
+            continue
+
+        for path in sorted(local_dir.glob("*.py")):
+            if path.name.startswith("__"):
+                continue
+            try:
+                logger.debug(f"Loading job/schedule from {path}")
+                file_jobs, file_schedules = load_definitions_from_source(
+                    path.read_text(encoding="utf-8"), path.stem, str(path), directory
+                )
+                jobs.extend(file_jobs)
+                schedules.extend(file_schedules)
+            except Exception as e:
+                logger.error(f"Failed to load job/schedule from {path}: {str(e)}")
+                import traceback
+                logger.error(f"Traceback: {traceback.format_exc()}")
+                continue
+
+    return jobs, schedules
+
 def get_all_jobs_and_schedules() -> tuple[List[JobDefinition], List[ScheduleDefinition]]:
-    """Get all jobs and schedules from GitHub sources (DAGs and maintenance directories)."""
+    """Get all jobs and schedules from GitHub (DAGs and maintenance directories) and local maintenance jobs."""
     try:
         jobs, schedules = load_jobs_and_schedules_from_github(directories=["DAGs", "maintenance"])
+        # Platform maintenance (e.g. run_log partitioning) ships with this repository
+        local_jobs, local_schedules = load_jobs_and_schedules_from_local(directories=["maintenance"])
+        loaded_names = {j.name for j in jobs}
+        jobs.extend(j for j in local_jobs if j.name not in loaded_names)
+        schedules.extend(schedule for schedule in local_schedules if schedule.job.name not in loaded_names)
         if not jobs and not schedules:
             logger.warning("No jobs or schedules loaded from GitHub, check GITHUB_ACCESS_TOKEN or directories")
         else:
-            logger.info(f"Successfully loaded {len(jobs)} jobs and {len(schedules)} schedules from GitHub")
+            logger.info(f"Successfully loaded {len(jobs)} jobs and {len(schedules)} schedules")
         return jobs, schedules
     except Exception as e:
         logger.error(f"Failed to load jobs and schedules: {str(e)}")
@@ -975,5 +1052,12 @@ defs = Definitions(
         "s3": s3_resource,
         "db_engine": db_engine_resource
     },
-    sensors=[workflow_run_status_sensor]
+    sensors=[
+        workflow_run_status_sensor,
+        workflow_run_progress_sensor,
+        workflow_run_started_sensor,
+        workflow_run_success_sensor,
+        workflow_run_failure_sensor,
+        workflow_run_canceled_sensor,
+    ]
 )
\ No newline at end of file
@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import requests
+
+logger = logging.getLogger(__name__)
+
+DAGSTER_API_URL = os.getenv('DAGSTER_API_URL', 'http://localhost:3500')
+LOCATION_VERSION_TTL_SECONDS = float(os.getenv("DAGSTER_LOCATION_VERSION_TTL_SECONDS", "10"))
+# Background reload detection between requests, per API worker; 0 disables it
+LOCATION_WATCH_SECONDS = float(os.getenv("DAGSTER_LOCATION_WATCH_SECONDS", "60"))
+
+WORKSPACE_QUERY = """
+query WorkspaceLocations {
+    workspaceOrError {
+        __typename
+        ... on Workspace {
+            locationEntries {
+                name
+                updatedTimestamp
+            }
+        }
+    }
+}
+"""
+
+_lock = threading.Lock()
+_location_versions: Dict[str, str] = {}
+# Last versions actually read from Dagster; unlike _location_versions it survives failed
+# fetches, so a Dagster blip doesn't make every location look reloaded afterwards
+_known_versions: Dict[str, str] = {}
+_fetched_at = 0.0
+# Called as callback(location_name, version) when a location's version changes
+_change_listeners: List[Callable[[str, str], None]] = []
+_watcher: Optional[threading.Thread] = None
+
+def dagster_graphql_url(url: Optional[str] = None) -> str:
+    """GraphQL endpoint for DAGSTER_API_URL, whether or not it was configured with the /graphql suffix"""
+    base = (url or DAGSTER_API_URL).rstrip("/")
+    return base if base.endswith("/graphql") else f"{base}/graphql"
+
+def _fetch_location_versions() -> Dict[str, str]:
+    response = requests.post(
+        dagster_graphql_url(),
+        json={"query": WORKSPACE_QUERY},
+        timeout=5
+    )
+    response.raise_for_status()
+    data = response.json()
+    if data.get("errors"):
+        raise Exception(f"GraphQL errors: {data['errors']}")
+
+    workspace = data.get("data", {}).get("workspaceOrError", {})
+    if workspace.get("__typename") != "Workspace":
+        raise Exception(f"Unexpected workspace response: {workspace.get('__typename')}")
+
+    # updatedTimestamp changes whenever a code location is (re)loaded
+    return {
+        entry["name"]: str(entry["updatedTimestamp"])
+        for entry in workspace.get("locationEntries", [])
+    }
+
+def _notify_listeners(location_name: str, version: str) -> None:
+    for callback in list(_change_listeners):
+        try:
+            callback(location_name, version)
+        except Exception as e:
+            logger.warning(f"Location change listener failed for {location_name}: {str(e)}")
+
+def get_location_version(location_name: str) -> Optional[str]:
+    """Return a token that changes whenever the code location reloads, or None if unknown.
+
+    The workspace is queried at most once every DAGSTER_LOCATION_VERSION_TTL_SECONDS.
+    """
+    global _location_versions, _known_versions, _fetched_at
+    changed = {}
+    with _lock:
+        if time.time() - _fetched_at >= LOCATION_VERSION_TTL_SECONDS:
+            try:
+                _location_versions = _fetch_location_versions()
+                changed = {
+                    name: version for name, version in _location_versions.items()
+                    if _known_versions.get(name) != version
+                }
+                _known_versions = dict(_location_versions)
+            except Exception as e:
+                logger.warning(f"Could not read Dagster code location versions: {str(e)}")
+                _location_versions = {}
+            _fetched_at = time.time()
+        version = _location_versions.get(location_name)
+
+    for name, new_version in changed.items():
+        # Listeners may be slow (e.g. introspection), so never hold up the caller
+        threading.Thread(
+            target=_notify_listeners, args=(name, new_version), name="dagster-location-change", daemon=True
+        ).start()
+    return version
+
+def on_location_change(callback: Callable[[str, str], None]) -> None:
+    """Register callback(location_name, version) to run when a code location loads or reloads"""
+    if callback not in _change_listeners:
+        _change_listeners.append(callback)
+
+def start_location_watcher() -> None:
+    """Poll the workspace every LOCATION_WATCH_SECONDS so reloads are noticed without waiting for a request"""
+    global _watcher
+    if LOCATION_WATCH_SECONDS <= 0 or (_watcher and _watcher.is_alive()):
+        return
+
+    def watch() -> None:
+        while True:
+            get_location_version("")
+            time.sleep(LOCATION_WATCH_SECONDS)
+
+    _watcher = threading.Thread(target=watch, name="dagster-location-watcher", daemon=True)
+    _watcher.start()
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Replica reads fall back to the primary when the replica is further behind than this
+DB_READ_MAX_LAG_SECONDS = float(os.getenv("DB_READ_MAX_LAG_SECONDS", "5"))
+DB_READ_LAG_CHECK_SECONDS = float(os.getenv("DB_READ_LAG_CHECK_SECONDS", "5"))
+# Bounds how long a lag check (or a read) can hang on an unreachable replica
+DB_READ_CONNECT_TIMEOUT = int(os.getenv("DB_READ_CONNECT_TIMEOUT", "3"))
+
+def pool_settings(prefix: str, pool_size: int, max_overflow: int) -> Dict[str, int]:
+    """Engine pool kwargs, each overridable as <prefix>_POOL_SIZE, <prefix>_MAX_OVERFLOW, ..."""
+    return {
+        "pool_size": int(os.getenv(f"{prefix}_POOL_SIZE", str(pool_size))),
+        "max_overflow": int(os.getenv(f"{prefix}_MAX_OVERFLOW", str(max_overflow))),
+        "pool_timeout": int(os.getenv(f"{prefix}_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv(f"{prefix}_POOL_RECYCLE", "1800")),
+    }
+
+class PoolStats:
+    """How long requests waited for a pooled connection, and how often they gave up"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+pool_stats: Dict[str, PoolStats] = {}
+
+def timed_pool_class(base, name: str):
+    """Subclass of a SQLAlchemy queue pool that records checkout wait times under name"""
+    stats = pool_stats.setdefault(name, PoolStats())
+
+    class TimedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except Exception:
+                stats.record(time.perf_counter() - started, timed_out=True)
+                raise
+            stats.record(time.perf_counter() - started)
+            return connection
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+def pool_metrics(name: str, engine) -> Dict[str, Any]:
+    pool = engine.pool
+    return {
+        "pool": name,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        **(pool_stats[name].snapshot() if name in pool_stats else {}),
+    }
+
+class ReplicaLagMonitor:
+    """Decides whether reads may go to the replica, re-checking its lag at most every check_interval"""
+
+    def __init__(self, engine, max_lag_seconds: float = DB_READ_MAX_LAG_SECONDS,
+                 check_interval: float = DB_READ_LAG_CHECK_SECONDS):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.lag_seconds: Optional[float] = None
+        self.usable = False
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() - self.checked_at >= self.check_interval
+
+    def refresh(self) -> None:
+        # Callers that lose the race keep the last verdict instead of queueing behind a
+        # check that may be stuck connecting to an unreachable replica
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            if not self.needs_refresh():
+                return
+            try:
+                with self.engine.connect() as conn:
+                    # An idle primary stops advancing the replay timestamp, so a replica that
+                    # has replayed everything it received counts as caught up, but only while
+                    # it is still streaming; otherwise "everything received" may be stale.
+                    # NULL means nothing has been replayed yet, i.e. the lag is unknown
+                    lag = conn.execute(text("""
+                        SELECT CASE
+                            WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+                                 AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+                            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+                        END
+                    """)).scalar()
+                self.lag_seconds = float(lag) if lag is not None else None
+                usable = self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+                lag_text = f"{self.lag_seconds:.1f}s" if self.lag_seconds is not None else "unknown"
+                if usable and not self.usable:
+                    logger.info(f"Replica lag {lag_text}; routing reads to the replica")
+                elif not usable and self.usable:
+                    logger.warning(f"Replica lag {lag_text}; routing reads to the primary")
+                self.usable = usable
+            except Exception as e:
+                if self.usable:
+                    logger.error(f"Replica lag check failed, routing reads to the primary: {str(e)}")
+                self.lag_seconds = None
+                self.usable = False
+            self.checked_at = time.monotonic()
+        finally:
+            self.lock.release()
+
+    def replica_usable(self) -> bool:
+        if self.needs_refresh():
+            self.refresh()
+        return self.usable
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "replica_in_use": self.usable,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
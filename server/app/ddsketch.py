@@ -0,0 +1,44 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+# Relative accuracy 1%; must match workflow.ddsketch_bin() in database/schema.sql
+DDSKETCH_GAMMA = 1.01 / 0.99
+
+def merge_sketches(sketches: Iterable[Any]) -> Dict[int, int]:
+    """Merge DDSketch jsonb values ({"b": {bin: count}}) by adding their bin counts"""
+    merged: Dict[int, int] = {}
+    for sketch in sketches:
+        if isinstance(sketch, str):
+            sketch = json.loads(sketch)
+        for bin_key, count in ((sketch or {}).get("b") or {}).items():
+            merged[int(bin_key)] = merged.get(int(bin_key), 0) + int(count)
+    return {bin_index: count for bin_index, count in merged.items() if count > 0}
+
+def bin_value(bin_index: int) -> float:
+    """Representative value of a bin, within the sketch's relative accuracy of every value in it"""
+    if bin_index <= 0:
+        return 1.0
+    return 2 * DDSKETCH_GAMMA ** bin_index / (DDSKETCH_GAMMA + 1)
+
+def quantile(bins: Dict[int, int], q: float) -> Optional[float]:
+    """Approximate q-quantile of the values counted in merged bins"""
+    total = sum(bins.values())
+    if total == 0:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for bin_index in sorted(bins):
+        seen += bins[bin_index]
+        if seen > rank:
+            return bin_value(bin_index)
+    return bin_value(max(bins))
+
+def duration_percentiles(sketches: Iterable[Any], quantiles: List[float] = [0.5, 0.95, 0.99]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 (by default) in seconds from duration sketches recorded in milliseconds"""
+    bins = merge_sketches(sketches)
+    result = {}
+    for q in quantiles:
+        value = quantile(bins, q)
+        label = f"p{q * 100:g}".replace(".", "_")
+        result[f"{label}_duration_seconds"] = round(value / 1000, 2) if value is not None else None
+    return result
@@ -0,0 +1,49 @@
+from typing import Any, Callable, Dict, List, Optional
+
+def split_values(value: Optional[str], convert: Callable[[str], Any] = str) -> List[Any]:
+    """Values of a comma-separated filter param, stripped, with empties dropped"""
+    if not value:
+        return []
+    return [convert(item.strip()) for item in value.split(",") if item.strip()]
+
+class ListQuery:
+    """FROM/WHERE builder shared by a list endpoint's page and count queries.
+
+    Statement text depends only on which filters are set, never on how many values
+    they carry: multi-value filters bind one array (`col = ANY(:param)`). That keeps
+    the set of statements small enough for the driver's prepared statement cache
+    and the server's cached plans to be reused across requests.
+
+    Joins are declared up front and only added to the count query when a filter
+    needs them; the page query always has them for its columns.
+    """
+
+    def __init__(self, base: str, joins: Dict[str, str]):
+        self.base = base
+        self.joins = joins
+        self.required_joins: List[str] = []
+        self.clauses: List[str] = []
+        self.params: Dict[str, Any] = {}
+
+    def where(self, clause: str, params: Optional[Dict[str, Any]] = None, joins: tuple = ()) -> "ListQuery":
+        self.clauses.append(clause)
+        self.params.update(params or {})
+        for join in joins:
+            if join not in self.required_joins:
+                self.required_joins.append(join)
+        return self
+
+    def any_of(self, expression: str, param: str, values: List[Any], joins: tuple = ()) -> "ListQuery":
+        """Filter on expression being one of values; a no-op when values is empty"""
+        if values:
+            self.where(f"{expression} = ANY(:{param})", {param: list(values)}, joins)
+        return self
+
+    def from_where(self, all_joins: bool = True) -> str:
+        joins = [self.joins[name] for name in self.joins if all_joins or name in self.required_joins]
+        where = " WHERE " + " AND ".join(self.clauses) if self.clauses else " WHERE true"
+        return " ".join([self.base] + joins) + where
+
+    def count_query(self, id_column: str = "a.id") -> str:
+        """Filtered SELECT for pagination.count_rows, with only the joins the filters use"""
+        return f"SELECT {id_column} {self.from_where(all_joins=False)}"
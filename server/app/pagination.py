@@ -0,0 +1,106 @@
+import base64
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Below this many estimated rows an exact count is cheap enough to run anyway
+COUNT_ESTIMATE_EXACT_BELOW = int(os.getenv("COUNT_ESTIMATE_EXACT_BELOW", "10000"))
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+def encode_cursor(sort_key: str, sort_value: Any, row_id: int, direction: str) -> str:
+    """Build an opaque cursor pointing just past (sort_value, row_id)"""
+    payload = {"s": sort_key, "v": sort_value, "id": row_id, "d": direction}
+    if isinstance(sort_value, datetime):
+        # Tagged so decode_cursor can hand the driver a datetime rather than a string
+        payload.update({"v": sort_value.isoformat(), "t": "datetime"})
+    payload = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort_key: str) -> Dict[str, Any]:
+    """Decode a cursor, raising ValueError if it is malformed or was issued for another sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or payload.get("d") not in ("next", "prev") or "id" not in payload:
+        raise ValueError("Invalid cursor")
+    if payload.get("s") != sort_key:
+        raise ValueError("Cursor does not match the requested sort order")
+    if payload.get("t") == "datetime":
+        try:
+            payload["v"] = datetime.fromisoformat(payload["v"])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    return payload
+
+def keyset_clauses(sort_column: str, id_column: str, descending: bool,
+                   cursor: Optional[Dict[str, Any]]) -> Tuple[str, str, Dict[str, Any], bool]:
+    """Return (where, order_by, params, backwards) for one keyset page.
+
+    A "prev" cursor walks the index in the opposite direction; the caller reverses
+    the fetched rows (see keyset_page) so pages always come back in display order.
+    """
+    backwards = bool(cursor) and cursor["d"] == "prev"
+    walk_descending = descending != backwards
+    order = "DESC" if walk_descending else "ASC"
+    order_by = f"{sort_column} {order}, {id_column} {order}"
+    if not cursor:
+        return "", order_by, {}, False
+
+    comparison = "<" if walk_descending else ">"
+    where = f" AND ({sort_column}, {id_column}) {comparison} (:cursor_value, :cursor_id)"
+    return where, order_by, {"cursor_value": cursor["v"], "cursor_id": cursor["id"]}, backwards
+
+def keyset_page(rows: List[Dict[str, Any]], limit: int, sort_key: str, sort_field: str,
+                cursor: Optional[Dict[str, Any]], backwards: bool) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """Trim a limit+1 fetch to one page and build its next/prev cursors"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    first, last = rows[0], rows[-1]
+    # Walking forward, a further row means a next page; any cursor means we came from somewhere
+    has_next = has_more if not backwards else True
+    has_prev = bool(cursor) if not backwards else has_more
+    next_cursor = encode_cursor(sort_key, last[sort_field], last["id"], "next") if has_next else None
+    prev_cursor = encode_cursor(sort_key, first[sort_field], first["id"], "prev") if has_prev else None
+    return rows, next_cursor, prev_cursor
+
+async def estimate_count(db: AsyncSession, query: str, params: Dict[str, Any]) -> int:
+    """Row estimate for a query from the planner, without running it"""
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def count_rows(db: AsyncSession, query: str, params: Dict[str, Any], mode: str) -> Tuple[Optional[int], bool]:
+    """Count the rows a query returns; returns (total, is_estimate).
+
+    query is the filtered SELECT without ORDER BY or LIMIT. Estimates that come out
+    small are replaced by an exact count, since those are cheap and estimates on
+    small tables are least reliable.
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        try:
+            estimate = await estimate_count(db, query, params)
+            if estimate >= COUNT_ESTIMATE_EXACT_BELOW:
+                return estimate, True
+        except Exception as e:
+            logger.warning(f"Count estimate failed, falling back to exact count: {str(e)}")
+            # A failed statement aborts the transaction; list endpoints only read, so nothing is lost
+            await db.rollback()
+    total = (await db.execute(text(f"SELECT COUNT(*) FROM ({query}) AS counted"), params)).scalar()
+    return total, False
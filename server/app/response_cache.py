@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from .response_encoding import render_json
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+# Optional shared backend (e.g. redis://localhost:6379/0) so every worker serves the same entries
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+
+RUN_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RUN_RESPONSE_CACHE_MAX_ENTRIES", "256"))
+# Terminal run payloads also carry joined fields (workflow name, user name) that can be
+# renamed later, so they are cached, in process and by clients, for a bounded time only
+RUN_RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RUN_RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Once a run reaches one of these (case-insensitive) its own columns never change
+TERMINAL_RUN_STATUSES = {"completed", "failed", "cancelled", "success", "failure", "error"}
+
+# GET endpoints whose responses are the same for every user and safe to serve up to a TTL stale
+CACHED_PATHS = [
+    r"/analytics/[^/]+$",
+    r"/(runs|workflows)/filter-options$",
+]
+
+class MemoryCacheBackend:
+    """Per-process cache; entries expire after their TTL and the oldest are dropped past max_entries"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        cached = self.entries.get(key)
+        if not cached:
+            return None
+        if cached[0] < time.time():
+            self.entries.pop(key, None)
+            return None
+        return cached[1]
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        self.entries[key] = (time.time() + ttl, entry)
+        if len(self.entries) > self.max_entries:
+            for stale_key, _ in sorted(self.entries.items(), key=lambda item: item[1][0])[:len(self.entries) - self.max_entries]:
+                self.entries.pop(stale_key, None)
+
+class RedisCacheBackend:
+    """Cache shared by all workers; Redis errors are treated as misses so the API never depends on it"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = await self.client.get(f"response_cache:{key}")
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            return None
+        if value is None:
+            return None
+        entry = json.loads(value)
+        entry["body"] = entry["body"].encode("utf-8")
+        return entry
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        value = json.dumps({**entry, "body": entry["body"].decode("utf-8")})
+        try:
+            await self.client.set(f"response_cache:{key}", value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+def create_cache_backend():
+    if RESPONSE_CACHE_URL:
+        try:
+            return RedisCacheBackend(RESPONSE_CACHE_URL)
+        except ImportError:
+            logger.error("redis is not installed; falling back to the in-process response cache")
+    return MemoryCacheBackend()
+
+def cache_key(request: Request) -> str:
+    """Route plus query params, sorted and with empty values dropped, so equivalent URLs share an entry"""
+    params = sorted((name, value) for name, value in parse_qsl(request.url.query) if value != "")
+    key = f"{request.url.path}?{urlencode(params)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """TTL cache for the GET endpoints matched by paths, with ETag/304 support.
+
+    Concurrent requests for the same key share one computation: the first request runs
+    the endpoint and the rest wait for its result. Only 200 responses are cached.
+    """
+
+    def __init__(self, app, paths: List[str] = CACHED_PATHS, ttl: int = RESPONSE_CACHE_TTL_SECONDS):
+        super().__init__(app)
+        self.paths = [re.compile(path) for path in paths]
+        self.ttl = ttl
+        self.backend = create_cache_backend()
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "GET" or self.ttl <= 0 or not any(path.search(request.url.path) for path in self.paths):
+            return await call_next(request)
+
+        key = cache_key(request)
+        entry = await self.backend.get(key)
+        cache_status = "HIT"
+        if entry is None:
+            entry, response = await self._fill(key, request, call_next)
+            if entry is None:
+                return response
+            cache_status = "MISS"
+
+        headers = {
+            "ETag": entry["etag"],
+            "Cache-Control": f"max-age={self.ttl}",
+            "X-Cache": cache_status,
+        }
+        if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry["body"], media_type=entry["media_type"], headers=headers)
+
+    async def _fill(self, key: str, request: Request, call_next) -> Tuple[Optional[Dict[str, Any]], Optional[Response]]:
+        """Compute an entry, or wait for the request already computing it; returns (entry, uncached response)"""
+        pending = self.inflight.get(key)
+        if pending is not None:
+            entry = await asyncio.shield(pending)
+            if entry is not None:
+                return entry, None
+            # The leader's response wasn't cacheable (error or non-200); answer this request on its own
+            return None, await call_next(request)
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        entry = None
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            if response.status_code != 200:
+                headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+                return None, Response(content=body, status_code=response.status_code, headers=headers)
+
+            entry = {
+                "body": body,
+                "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                "media_type": response.headers.get("content-type", "application/json"),
+            }
+            await self.backend.set(key, entry, self.ttl)
+            return entry, None
+        finally:
+            future.set_result(entry)
+            self.inflight.pop(key, None)
+
+class LRUCache:
+    """Small in-process LRU whose entries also expire after ttl seconds"""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+# Terminal run responses for GET /runs/run/{run_id} and /status/{run_id}
+run_response_cache = LRUCache(RUN_RESPONSE_CACHE_MAX_ENTRIES, RUN_RESPONSE_CACHE_TTL_SECONDS)
+
+def is_terminal_run_status(status: Optional[str]) -> bool:
+    return (status or "").lower() in TERMINAL_RUN_STATUSES
+
+def run_etag(run_id: int, updated_at: Any, variant: str = "") -> str:
+    """ETag for a run response; changes whenever the run row is updated or the query params differ"""
+    version = updated_at.isoformat() if hasattr(updated_at, "isoformat") else str(updated_at)
+    digest = hashlib.sha256(f"{run_id}:{version}:{variant}".encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+def run_response_headers(etag: str, terminal: bool) -> Dict[str, str]:
+    # Terminal runs can be reused for a while, then revalidated by ETag; live runs revalidate on every request
+    cache_control = f"public, max-age={RUN_RESPONSE_CACHE_TTL_SECONDS}" if terminal else "no-cache"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+def conditional_run_response(request: Request, body: bytes, etag: str, terminal: bool) -> Response:
+    """JSON response for an encoded run payload, or 304 if the client already holds this version"""
+    headers = run_response_headers(etag, terminal)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def cache_run_response(key: str, payload: Dict[str, Any], etag: str, status: Optional[str]) -> Tuple[bytes, str, bool]:
+    """Encode a run payload, keeping the encoded body in the LRU if the run is terminal.
+
+    A terminal run's row no longer changes, but its joined fields can, so its ETag is
+    taken from the encoded body instead: a rename yields a new ETag once the cached
+    entry expires. Returns (body, etag, terminal).
+    """
+    body = render_json(payload)
+    terminal = is_terminal_run_status(status)
+    if terminal:
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        run_response_cache.set(key, {"body": body, "etag": etag})
+    return body, etag, terminal
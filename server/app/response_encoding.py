@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logger.warning("orjson is not installed; falling back to the standard library JSON encoder")
+
+# Responses smaller than this aren't worth the CPU to compress
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_COMPRESSION_LEVEL = int(os.getenv("RESPONSE_COMPRESSION_LEVEL", "6"))
+
+def _default(value: Any) -> Any:
+    """Types orjson doesn't serialise natively (datetime, date, UUID and numpy are native)"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+def render_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; handles datetime, Decimal and UUID values without jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+class CompressionMiddleware:
+    """Compress responses above RESPONSE_COMPRESSION_MIN_BYTES.
+
+    Uses brotli when brotli-asgi is installed and the client accepts it, gzip otherwise.
+    Server-sent event streams are passed through untouched so events aren't held in the
+    compressor's buffer.
+    """
+
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_BYTES):
+        self.app = app
+        try:
+            from brotli_asgi import BrotliMiddleware
+            # gzip_fallback serves clients that don't send Accept-Encoding: br
+            self.compressed_app = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        except ImportError:
+            self.compressed_app = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=RESPONSE_COMPRESSION_LEVEL)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._is_event_stream(scope):
+            await self.app(scope, receive, send)
+            return
+        await self.compressed_app(scope, receive, send)
+
+    @staticmethod
+    def _is_event_stream(scope) -> bool:
+        accept = dict(scope.get("headers") or []).get(b"accept", b"")
+        return b"text/event-stream" in accept or scope.get("path", "").endswith("/stream")
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from typing import Dict, Optional, Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+RUN_EVENTS_CHANNEL = "workflow_run_events"
+
+def notify_run_event(conn, run_id: int, kind: str = "logs") -> None:
+    """Queue a NOTIFY for subscribers of run_id.
+
+    Postgres delivers the notification when the surrounding transaction commits,
+    so call this before the writer's commit. The payload only carries the run id;
+    listeners read the new rows themselves.
+    """
+    conn.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": RUN_EVENTS_CHANNEL, "payload": json.dumps({"run_id": run_id, "kind": kind})}
+    )
+
+class RunEventBroker:
+    """One LISTEN connection per API worker, fanned out to per-run asyncio queues"""
+
+    def __init__(self, dsn: str, channel: str = RUN_EVENTS_CHANNEL):
+        self.dsn = dsn
+        self.channel = channel
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def subscribe(self, run_id: int) -> asyncio.Queue:
+        """Register a queue that receives the kind of every change to run_id"""
+        self._ensure_started()
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(run_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, run_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            queues = self._subscribers.get(run_id)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[run_id]
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _ensure_started(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="run-event-listener", daemon=True)
+        self._thread.start()
+
+    def _listen(self) -> None:
+        while not self._stopping.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel};")
+                logger.info(f"Listening for run events on channel {self.channel}")
+                # Anything sent while we were disconnected is lost, so make subscribers re-read
+                self._broadcast("resync")
+
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except psycopg2.Error as e:
+                logger.error(f"Run event listener connection failed: {str(e)}")
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            run_id = int(event["run_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed run event payload: {payload}")
+            return
+
+        with self._lock:
+            queues = list(self._subscribers.get(run_id, ()))
+        for queue in queues:
+            self._loop.call_soon_threadsafe(queue.put_nowait, event.get("kind", "logs"))
+
+    def _broadcast(self, kind: str) -> None:
+        with self._lock:
+            queues = [queue for queues in self._subscribers.values() for queue in queues]
+        for queue in queues:
+            self._loop.call_soon_threadsafe(queue.put_nowait, kind)
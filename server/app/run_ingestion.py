@@ -0,0 +1,445 @@
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import text
+from .s3_storage import get_s3_client, S3_BUCKET
+
+logger = logging.getLogger(__name__)
+
+# Event types we care about
+RELEVANT_EVENT_TYPES = {
+    "MessageEvent",
+    "ExecutionStepFailureEvent",
+    "ExecutionStepInputEvent",
+    "ExecutionStepOutputEvent",
+    "ExecutionStepStartEvent",
+    "ExecutionStepSuccessEvent",
+}
+
+TYPE_CHECK_EVENT_TYPES = {"ExecutionStepInputEvent", "ExecutionStepOutputEvent"}
+TYPE_CHECK_SUMMARY_EVENT_TYPE = "StepTypeCheckSummary"
+
+# Log volume governor; a cap of 0 disables it
+RUN_LOG_MAX_ROWS_PER_RUN = int(os.getenv("RUN_LOG_MAX_ROWS_PER_RUN", "20000"))
+RUN_LOG_MAX_ROWS_PER_STEP = int(os.getenv("RUN_LOG_MAX_ROWS_PER_STEP", "5000"))
+RUN_LOG_TAIL_ROWS = int(os.getenv("RUN_LOG_TAIL_ROWS", "200"))
+RUN_LOG_SAMPLE_RATE = float(os.getenv("RUN_LOG_SAMPLE_RATE", "0.01"))
+ALWAYS_KEPT_LOG_LEVELS = {"WARN", "WARNING", "ERROR", "CRITICAL"}
+
+# How raw Dagster payloads are kept in run_log.event_data:
+#   full    - the whole event, as received
+#   compact - only fields not already stored in their own columns
+#   blob    - a pointer into a zlib-compressed NDJSON chunk in workflow.run_event_blob
+RUN_LOG_EVENT_DATA_MODE = os.getenv("RUN_LOG_EVENT_DATA_MODE", "compact").lower()
+EVENT_DATA_COLUMN_KEYS = {"__typename", "message", "level", "stepKey", "timestamp", "runId"}
+
+LOG_STAGE_COLUMNS = ("seq", "step_code", "event_type", "message", "log_level", "ts", "event_data")
+STEP_STAGE_COLUMNS = ("step_code", "status", "started_ts", "finished_ts", "error_message")
+
+def _parse_timestamp(log: Dict[str, Any]) -> Optional[float]:
+    raw_ts = log.get("timestamp")
+    if not raw_ts:
+        return None
+    return float(raw_ts) / 1000  # Convert ms to seconds
+
+def _log_message(event_type: str, log: Dict[str, Any]) -> Tuple[str, str]:
+    if event_type == "MessageEvent":
+        return log.get("message", "No message"), log.get("level", "INFO").lower()
+    if event_type == "ExecutionStepFailureEvent":
+        return log.get("error", {}).get("message", "Step failed"), "ERROR"
+    if event_type in TYPE_CHECK_EVENT_TYPES:
+        name = log.get("inputName") or log.get("outputName", "unknown")
+        success = log.get("typeCheck", {}).get("success", False)
+        return f"{event_type} for {name}: {'Success' if success else 'Failed'}", "INFO" if success else "ERROR"
+    return f"{event_type} occurred", "INFO"
+
+def fold_step_states(step_events: Iterable[Tuple[str, str, Optional[float], Optional[str]]]) -> Dict[str, Dict[str, Any]]:
+    """Fold (step_code, event_type, timestamp, error) events, in order, into one final state per step"""
+    states: Dict[str, Dict[str, Any]] = {}
+    for step_code, event_type, timestamp, error_message in step_events:
+        state = states.setdefault(step_code, {
+            "status": None, "started_ts": None, "finished_ts": None, "error_message": None
+        })
+        if event_type == "ExecutionStepStartEvent":
+            # A retry restarts the step; clear the previous attempt's outcome
+            state.update({"status": "STARTED", "started_ts": timestamp, "finished_ts": None, "error_message": None})
+        elif event_type == "ExecutionStepSuccessEvent":
+            state.update({"status": "SUCCESS", "finished_ts": timestamp})
+        elif event_type == "ExecutionStepFailureEvent":
+            state.update({"status": "FAILURE", "finished_ts": timestamp, "error_message": error_message})
+    return {step_code: state for step_code, state in states.items() if state["status"]}
+
+def _type_check_summary(step_code: str, checks: List[Dict[str, Any]]) -> Tuple[str, str, Dict[str, Any]]:
+    failed = [check["name"] for check in checks if not check["success"]]
+    inputs = sum(1 for check in checks if check["kind"] == "input")
+    outputs = len(checks) - inputs
+    message = f"Type checks for {inputs} inputs and {outputs} outputs: "
+    message += f"{len(failed)} failed ({', '.join(failed)})" if failed else "all passed"
+    event_data = {
+        "stepKey": step_code,
+        "checks": checks,
+        "passed": len(checks) - len(failed),
+        "failed": len(failed)
+    }
+    return message, "ERROR" if failed else "INFO", event_data
+
+def build_ingestion_rows(dagster_run_id: str, logs: Iterable[Dict[str, Any]]) -> Tuple[List[tuple], List[tuple]]:
+    """Turn a batch of Dagster events into run_log rows and one final state row per step.
+
+    Input/output type-check events are collapsed into one StepTypeCheckSummary row per
+    step; failed checks are also kept as individual rows so their details stay visible.
+    """
+    log_rows = []
+    step_events = []
+    type_checks: Dict[str, Dict[str, Any]] = {}
+
+    for seq, log in enumerate(logs):
+        event_type = log.get("__typename", "UnknownEvent")
+        if event_type not in RELEVANT_EVENT_TYPES:
+            continue
+
+        try:
+            timestamp = _parse_timestamp(log)
+        except (TypeError, ValueError):
+            logger.debug(f"Invalid timestamp for event {event_type} in run {dagster_run_id}")
+            continue
+
+        step_key = log.get("stepKey")
+        if step_key:
+            error_message = log.get("error", {}).get("message", "Unknown error") if event_type == "ExecutionStepFailureEvent" else None
+            step_events.append((step_key, event_type, timestamp, error_message))
+
+        if event_type in TYPE_CHECK_EVENT_TYPES:
+            success = log.get("typeCheck", {}).get("success", False)
+            summary = type_checks.setdefault(step_key or "", {"seq": seq, "ts": timestamp, "checks": []})
+            summary["seq"] = seq
+            summary["ts"] = timestamp if timestamp is not None else summary["ts"]
+            summary["checks"].append({
+                "kind": "input" if event_type == "ExecutionStepInputEvent" else "output",
+                "name": log.get("inputName") or log.get("outputName", "unknown"),
+                "success": success
+            })
+            if success:
+                continue
+
+        message, level = _log_message(event_type, log)
+        log_rows.append((seq, step_key, event_type, message, level, timestamp, log))
+
+    for step_key, summary in type_checks.items():
+        message, level, event_data = _type_check_summary(step_key, summary["checks"])
+        log_rows.append((
+            summary["seq"], step_key or None, TYPE_CHECK_SUMMARY_EVENT_TYPE,
+            message, level, summary["ts"], event_data
+        ))
+
+    step_rows = [
+        (step_code, state["status"], state["started_ts"], state["finished_ts"], state["error_message"])
+        for step_code, state in fold_step_states(step_events).items()
+    ]
+    return log_rows, step_rows
+
+def _sampled(dagster_run_id: str, row: tuple) -> bool:
+    """Deterministic sample, so replaying a batch keeps the same rows"""
+    key = f"{dagster_run_id}:{row[5]}:{row[3]}".encode("utf-8")
+    return zlib.crc32(key) % 10000 < RUN_LOG_SAMPLE_RATE * 10000
+
+def govern_log_rows(conn, dagster_run_id: str, run_id: int, log_rows: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+    """Split log rows into rows to store and overflow rows to archive.
+
+    Only MessageEvent rows are governed. Below the per-run and per-step caps every row
+    is kept; above them we keep WARN/ERROR rows, the last RUN_LOG_TAIL_ROWS of the batch
+    (so the end of the run is always stored) and a deterministic sample.
+    """
+    if not RUN_LOG_MAX_ROWS_PER_RUN and not RUN_LOG_MAX_ROWS_PER_STEP:
+        return log_rows, []
+
+    counts = conn.execute(
+        text("""
+            SELECT COALESCE(step_code, '') AS step_code, COUNT(*) AS row_count
+            FROM workflow.run_log
+            WHERE run_id = :run_id AND event_type = 'MessageEvent'
+            GROUP BY 1
+        """),
+        {"run_id": run_id}
+    ).fetchall()
+    step_counts = {row.step_code: row.row_count for row in counts}
+    run_count = sum(step_counts.values())
+
+    kept, candidates = [], []
+    for row in log_rows:
+        seq, step_code, event_type, message, level = row[:5]
+        if event_type != "MessageEvent" or (level or "").upper() in ALWAYS_KEPT_LOG_LEVELS:
+            kept.append(row)
+            continue
+        step = step_code or ""
+        under_run_cap = not RUN_LOG_MAX_ROWS_PER_RUN or run_count < RUN_LOG_MAX_ROWS_PER_RUN
+        under_step_cap = not RUN_LOG_MAX_ROWS_PER_STEP or step_counts.get(step, 0) < RUN_LOG_MAX_ROWS_PER_STEP
+        if under_run_cap and under_step_cap:
+            kept.append(row)
+            run_count += 1
+            step_counts[step] = step_counts.get(step, 0) + 1
+        else:
+            candidates.append(row)
+
+    if not candidates:
+        return kept, []
+
+    tail = candidates[-RUN_LOG_TAIL_ROWS:] if RUN_LOG_TAIL_ROWS else []
+    tail_seqs = {row[0] for row in tail}
+    overflow = []
+    for row in candidates:
+        if row[0] in tail_seqs or _sampled(dagster_run_id, row):
+            kept.append(row)
+        else:
+            overflow.append(row)
+
+    logger.info(f"Log governor for run {dagster_run_id}: kept {len(kept)} rows, {len(overflow)} rows overflowed")
+    return kept, overflow
+
+def archive_overflow_rows(conn, dagster_run_id: str, run_id: int, overflow: List[tuple]) -> None:
+    """Write overflow rows as gzipped NDJSON to S3 and link the object from workflow.run"""
+    timestamps = [row[5] for row in overflow if row[5] is not None]
+    first_ts = min(timestamps) if timestamps else 0
+    last_ts = max(timestamps) if timestamps else 0
+    # Key depends only on the batch contents, so a replayed batch overwrites its own object
+    key = f"run-logs/{dagster_run_id}/overflow_{int(first_ts * 1000)}_{int(last_ts * 1000)}_{len(overflow)}.ndjson.gz"
+
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+        for row in overflow:
+            gz.write(json.dumps(row[6]).encode("utf-8"))
+            gz.write(b"\n")
+
+    get_s3_client().put_object(
+        Bucket=S3_BUCKET,
+        Key=key,
+        Body=buffer.getvalue(),
+        ContentType="application/x-ndjson",
+        ContentEncoding="gzip"
+    )
+
+    entry = {"path": f"{S3_BUCKET}/{key}", "rows": len(overflow), "from": first_ts, "to": last_ts}
+    conn.execute(
+        text("""
+            UPDATE workflow.run
+            SET log_overflow_paths = COALESCE(log_overflow_paths, '[]'::jsonb) || jsonb_build_array(CAST(:entry AS jsonb))
+            WHERE id = :run_id
+              AND NOT COALESCE(log_overflow_paths, '[]'::jsonb) @> jsonb_build_array(jsonb_build_object('path', CAST(:path AS text)))
+        """),
+        {"entry": json.dumps(entry), "path": entry["path"], "run_id": run_id}
+    )
+    logger.info(f"Archived {len(overflow)} overflow log rows for run {dagster_run_id} to {entry['path']}")
+
+def compact_event_data(log: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the payload fields that run_log already stores in its own columns"""
+    return {key: value for key, value in log.items() if key not in EVENT_DATA_COLUMN_KEYS}
+
+def store_event_blob(conn, dagster_run_id: str, run_id: int, payloads: List[Dict[str, Any]]) -> str:
+    """Store raw payloads as one compressed NDJSON chunk and return its key.
+
+    The key is a hash of the chunk contents, so replaying a batch reuses its chunk.
+    """
+    ndjson = "\n".join(json.dumps(payload, separators=(",", ":")) for payload in payloads).encode("utf-8")
+    chunk_sha = hashlib.sha256(ndjson).hexdigest()
+    conn.execute(
+        text("""
+            INSERT INTO workflow.run_event_blob (dagster_run_id, run_id, chunk_sha, event_count, payload, created_at)
+            VALUES (:dagster_run_id, :run_id, :chunk_sha, :event_count, :payload, NOW())
+            ON CONFLICT (dagster_run_id, chunk_sha) DO NOTHING
+        """),
+        {
+            "dagster_run_id": dagster_run_id,
+            "run_id": run_id,
+            "chunk_sha": chunk_sha,
+            "event_count": len(payloads),
+            "payload": zlib.compress(ndjson)
+        }
+    )
+    return chunk_sha
+
+def encode_event_data(conn, dagster_run_id: str, run_id: int, log_rows: List[tuple]) -> List[tuple]:
+    """Serialise each row's event_data according to RUN_LOG_EVENT_DATA_MODE"""
+    if RUN_LOG_EVENT_DATA_MODE == "blob":
+        # Type-check summaries are built by us and small, so they always stay inline
+        raw_rows = [row for row in log_rows if row[2] != TYPE_CHECK_SUMMARY_EVENT_TYPE]
+        if not raw_rows:
+            return [row[:6] + (json.dumps(row[6]),) for row in log_rows]
+        chunk_sha = store_event_blob(conn, dagster_run_id, run_id, [row[6] for row in raw_rows])
+        encoded = [
+            row[:6] + (json.dumps({"_blob": {"chunk": chunk_sha, "line": line}}),)
+            for line, row in enumerate(raw_rows)
+        ]
+        encoded.extend(
+            row[:6] + (json.dumps(row[6]),)
+            for row in log_rows if row[2] == TYPE_CHECK_SUMMARY_EVENT_TYPE
+        )
+        return encoded
+    if RUN_LOG_EVENT_DATA_MODE == "compact":
+        return [
+            row[:6] + (json.dumps(
+                row[6] if row[2] == TYPE_CHECK_SUMMARY_EVENT_TYPE else compact_event_data(row[6])
+            ),)
+            for row in log_rows
+        ]
+    return [row[:6] + (json.dumps(row[6]),) for row in log_rows]
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> None:
+    """Stream rows into a table with COPY ... FROM STDIN (text format)"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+def write_run_events(conn, dagster_run_id: str, run_id: int, logs: List[Dict[str, Any]],
+                     event_cursor: Optional[str] = None) -> int:
+    """Write a batch of Dagster events to run_log and run_step_status.
+
+    Rows are COPYed into temp tables and applied with one upsert per target table,
+    so replaying a batch is idempotent under the existing unique constraints. Runs
+    inside the caller's transaction; the caller commits once for the whole batch.
+    MessageEvent volume above the configured caps is archived to S3 rather than stored.
+    Also advances run.last_activity to the batch's latest event time.
+
+    event_cursor is the Dagster cursor after the batch's last event. It is stored as
+    run.ingest_cursor in the same transaction, so the next sync fetches only later
+    events, including when the batch's rows were archived rather than stored.
+    Returns the number of run_log rows inserted or updated.
+    """
+    if event_cursor is not None:
+        conn.execute(
+            text("""
+                UPDATE workflow.run SET ingest_cursor = :event_cursor
+                WHERE id = :run_id AND ingest_cursor IS DISTINCT FROM :event_cursor
+            """),
+            {"run_id": run_id, "event_cursor": event_cursor}
+        )
+
+    log_rows, step_rows = build_ingestion_rows(dagster_run_id, logs)
+    if not log_rows:
+        return 0
+    latest_ts = max((row[5] for row in log_rows if row[5] is not None), default=None)
+
+    log_rows, overflow = govern_log_rows(conn, dagster_run_id, run_id, log_rows)
+    if overflow:
+        try:
+            with conn.begin_nested():
+                archive_overflow_rows(conn, dagster_run_id, run_id, overflow)
+        except Exception as e:
+            # Never drop logs we couldn't archive; store them instead
+            logger.error(f"Failed to archive overflow logs for run {dagster_run_id}, storing them: {str(e)}")
+            log_rows.extend(overflow)
+
+    log_rows = encode_event_data(conn, dagster_run_id, run_id, log_rows)
+
+    conn.execute(text("""
+        CREATE TEMP TABLE IF NOT EXISTS run_log_stage (
+            seq integer,
+            step_code text,
+            event_type text,
+            message text,
+            log_level text,
+            ts double precision,
+            event_data text
+        ) ON COMMIT DROP
+    """))
+    conn.execute(text("""
+        CREATE TEMP TABLE IF NOT EXISTS run_step_stage (
+            step_code text,
+            status text,
+            started_ts double precision,
+            finished_ts double precision,
+            error_message text
+        ) ON COMMIT DROP
+    """))
+    conn.execute(text("TRUNCATE run_log_stage, run_step_stage"))
+
+    cursor = conn.connection.cursor()
+    try:
+        copy_rows(cursor, "run_log_stage", LOG_STAGE_COLUMNS, log_rows)
+        if step_rows:
+            copy_rows(cursor, "run_step_stage", STEP_STAGE_COLUMNS, step_rows)
+    finally:
+        cursor.close()
+
+    if step_rows:
+        # One row per step; missing start/finish times keep what earlier batches wrote
+        conn.execute(
+            text("""
+                INSERT INTO workflow.run_step_status (
+                    dagster_run_id, step_code, status, started_at, finished_at, end_time, error_message, run_id
+                )
+                SELECT :dagster_run_id, step_code, status,
+                       TO_TIMESTAMP(started_ts), TO_TIMESTAMP(finished_ts), TO_TIMESTAMP(finished_ts),
+                       error_message, :run_id
+                FROM run_step_stage
+                ON CONFLICT (dagster_run_id, step_code)
+                DO UPDATE SET
+                    status = EXCLUDED.status,
+                    started_at = COALESCE(EXCLUDED.started_at, run_step_status.started_at),
+                    finished_at = CASE WHEN EXCLUDED.status = 'STARTED' THEN NULL
+                                       ELSE COALESCE(EXCLUDED.finished_at, run_step_status.finished_at) END,
+                    end_time = CASE WHEN EXCLUDED.status = 'STARTED' THEN NULL
+                                    ELSE COALESCE(EXCLUDED.end_time, run_step_status.end_time) END,
+                    error_message = CASE WHEN EXCLUDED.status = 'FAILURE' THEN EXCLUDED.error_message
+                                         WHEN EXCLUDED.status = 'STARTED' THEN NULL
+                                         ELSE run_step_status.error_message END,
+                    run_id = EXCLUDED.run_id
+                WHERE (run_step_status.status, run_step_status.started_at, run_step_status.finished_at,
+                       run_step_status.error_message, run_step_status.run_id)
+                      IS DISTINCT FROM
+                      (EXCLUDED.status, EXCLUDED.started_at, EXCLUDED.finished_at,
+                       EXCLUDED.error_message, EXCLUDED.run_id)
+            """),
+            {"dagster_run_id": dagster_run_id, "run_id": run_id}
+        )
+
+    # Duplicate (event_type, timestamp) pairs within a batch keep the latest event,
+    # since one INSERT ... ON CONFLICT can't update the same row twice
+    result = conn.execute(
+        text("""
+            INSERT INTO workflow.run_log (
+                dagster_run_id, run_id, step_code, event_type, message, log_level, timestamp, event_data
+            )
+            SELECT DISTINCT ON (event_type, ts, CASE WHEN ts IS NULL THEN seq END)
+                   :dagster_run_id, :run_id, step_code, event_type, message, log_level,
+                   COALESCE(TO_TIMESTAMP(ts), NOW()), CAST(event_data AS jsonb)
+            FROM run_log_stage
+            ORDER BY event_type, ts, CASE WHEN ts IS NULL THEN seq END, seq DESC
+            ON CONFLICT (dagster_run_id, event_type, timestamp)
+            DO UPDATE SET
+                step_code = EXCLUDED.step_code,
+                message = EXCLUDED.message,
+                log_level = EXCLUDED.log_level,
+                event_data = EXCLUDED.event_data
+        """),
+        {"dagster_run_id": dagster_run_id, "run_id": run_id}
+    )
+
+    # Only move forward, so replayed or out-of-order batches never rewind it
+    conn.execute(
+        text("""
+            UPDATE workflow.run
+            SET last_activity = COALESCE(TO_TIMESTAMP(:latest_ts), NOW())
+            WHERE id = :run_id AND last_activity < COALESCE(TO_TIMESTAMP(:latest_ts), NOW())
+        """),
+        {"run_id": run_id, "latest_ts": latest_ts}
+    )
+    return result.rowcount
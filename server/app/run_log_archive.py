@@ -0,0 +1,138 @@
+import io
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.s3_storage import get_s3_client, S3_BUCKET
+
+logger = logging.getLogger(__name__)
+
+# Must match the layout written by the maintenance_job_partitions Dagster job
+RUN_LOG_ARCHIVE_BUCKETS = 16
+
+# Partitions only leave run_log when archived, and the maintenance job runs daily at most
+OLDEST_PARTITION_CHECK_SECONDS = 300
+_oldest_partition = {"checked_at": 0.0, "month": None}
+
+def oldest_attached_month(db: Session) -> Optional[date]:
+    """First month of the oldest monthly partition still attached to run_log (cached)"""
+    if time.monotonic() - _oldest_partition["checked_at"] < OLDEST_PARTITION_CHECK_SECONDS:
+        return _oldest_partition["month"]
+    oldest = db.execute(text("""
+        SELECT MIN(c.relname)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'workflow.run_log'::regclass
+          AND c.relname ~ '^run_log_y[0-9]{4}m[0-9]{2}$'
+    """)).scalar()
+    month = date(int(oldest[9:13]), int(oldest[14:16]), 1) if oldest else None
+    _oldest_partition.update(checked_at=time.monotonic(), month=month)
+    return month
+
+def may_have_archived_logs(db: Session, started_at: Optional[datetime]) -> bool:
+    """False when the run started inside the attached partitions, so none of its logs were archived"""
+    if started_at is None:
+        return True
+    oldest_month = oldest_attached_month(db)
+    # Same one-day margin find_archived_months uses for runs crossing a month boundary
+    return oldest_month is None or (started_at - timedelta(days=1)).date() < oldest_month
+
+def find_archived_months(db: Session, run_id: int) -> List[Dict[str, Any]]:
+    """Return archived run_log months that overlap the run's lifetime"""
+    result = db.execute(
+        text("""
+            SELECT a.partition_month, a.s3_prefix
+            FROM workflow.run r
+            JOIN workflow.run_log_archive a
+              ON a.partition_month >= date_trunc('month', r.started_at - INTERVAL '1 day')::date
+             AND a.partition_month <= date_trunc('month', COALESCE(r.finished_at, NOW()))::date
+            WHERE r.id = :run_id
+            ORDER BY a.partition_month
+        """),
+        {"run_id": run_id}
+    ).fetchall()
+    return [dict(row._mapping) for row in result]
+
+def read_archived_run_logs(db: Session, run_id: int, started_at: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Read a run's logs back from the Parquet archive; returns [] if none were archived.
+
+    Pass the run's started_at to skip the archive lookup for runs newer than the oldest
+    attached partition.
+    """
+    if not may_have_archived_logs(db, started_at):
+        return []
+    months = find_archived_months(db, run_id)
+    if not months:
+        return []
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.error("pyarrow is not installed; archived run logs are unavailable")
+        return []
+
+    s3_client = get_s3_client()
+    logs = []
+    for month in months:
+        key = f"{month['s3_prefix']}/run_bucket={run_id % RUN_LOG_ARCHIVE_BUCKETS:02d}/data.parquet"
+        try:
+            body = s3_client.get_object(Bucket=S3_BUCKET, Key=key)["Body"].read()
+        except s3_client.exceptions.NoSuchKey:
+            continue
+        table = pq.read_table(io.BytesIO(body), filters=[("run_id", "=", run_id)])
+        for log in table.to_pylist():
+            # event_data is archived as text since Parquet has no jsonb type
+            log["event_data"] = json.loads(log["event_data"]) if log.get("event_data") else {}
+            logs.append(log)
+
+    logger.debug(f"Read {len(logs)} archived logs for run {run_id} from {len(months)} months")
+    return logs
+
+def read_archived_log(db: Session, run_id: int, log_id: int) -> Optional[Dict[str, Any]]:
+    """Find one archived log row; its event blob, if any, is looked up from the same month.
+
+    The row carries an "event_blob" key: the blob's compressed payload, or None when the
+    row has no blob pointer or the month was archived before blobs were archived with it.
+    """
+    months = find_archived_months(db, run_id)
+    if not months:
+        return None
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.error("pyarrow is not installed; archived run logs are unavailable")
+        return None
+
+    s3_client = get_s3_client()
+    bucket_dir = f"run_bucket={run_id % RUN_LOG_ARCHIVE_BUCKETS:02d}"
+    for month in months:
+        try:
+            body = s3_client.get_object(Bucket=S3_BUCKET, Key=f"{month['s3_prefix']}/{bucket_dir}/data.parquet")["Body"].read()
+        except s3_client.exceptions.NoSuchKey:
+            continue
+        rows = pq.read_table(io.BytesIO(body), filters=[("run_id", "=", run_id), ("id", "=", log_id)]).to_pylist()
+        if not rows:
+            continue
+
+        log = rows[0]
+        log["event_data"] = json.loads(log["event_data"]) if log.get("event_data") else {}
+        log["event_blob"] = None
+        pointer = log["event_data"].get("_blob")
+        if pointer:
+            try:
+                body = s3_client.get_object(Bucket=S3_BUCKET, Key=f"{month['s3_prefix']}/{bucket_dir}/blobs.parquet")["Body"].read()
+                blobs = pq.read_table(
+                    io.BytesIO(body),
+                    filters=[("dagster_run_id", "=", log["dagster_run_id"]), ("chunk_sha", "=", pointer["chunk"])]
+                ).to_pylist()
+                if blobs:
+                    log["event_blob"] = blobs[0]["payload"]
+            except s3_client.exceptions.NoSuchKey:
+                pass
+        return log
+
+    return None
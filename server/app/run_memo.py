@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from github import Github, GithubException
+
+logger = logging.getLogger(__name__)
+
+GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
+GITHUB_REPO_OWNER = os.getenv("GITHUB_REPO_OWNER", "seanjnugent")
+GITHUB_REPO_NAME = os.getenv("GITHUB_REPO_NAME", "DataWorkflowTool-Workflows")
+GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
+
+# Memo entries live as long as the run outputs they point at; keep this in line with the S3 output retention
+RUN_MEMO_TTL_DAYS = int(os.getenv("RUN_MEMO_TTL_DAYS", "30"))
+DAG_VERSION_CACHE_SECONDS = int(os.getenv("DAG_VERSION_CACHE_SECONDS", "60"))
+
+_dag_version_cache: Dict[int, Tuple[float, Optional[str]]] = {}
+
+def get_dag_version(workflow_id: int, fallback: Optional[str] = None) -> Optional[str]:
+    """Return the git blob SHA of the workflow's DAG file, or fallback if GitHub can't be reached"""
+    cached = _dag_version_cache.get(workflow_id)
+    if cached and time.time() - cached[0] < DAG_VERSION_CACHE_SECONDS:
+        return cached[1] or fallback
+
+    blob_sha = None
+    if GITHUB_ACCESS_TOKEN:
+        try:
+            repo = Github(GITHUB_ACCESS_TOKEN).get_repo(f"{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}")
+            blob_sha = repo.get_contents(f"DAGs/workflow_job_{workflow_id}.py", ref=GITHUB_BRANCH).sha
+        except GithubException as e:
+            logger.warning(f"Could not read DAG version for workflow {workflow_id}: {e.status}")
+        except Exception as e:
+            logger.warning(f"Could not read DAG version for workflow {workflow_id}: {str(e)}")
+
+    _dag_version_cache[workflow_id] = (time.time(), blob_sha)
+    return blob_sha or fallback
+
+def compute_run_fingerprint(workflow_id: int, dag_version: str, input_hashes: Dict[str, str],
+                            parameters: Dict[str, Any]) -> str:
+    """Hash everything that determines a run's outputs into a stable fingerprint"""
+    canonical = json.dumps(
+        {
+            "workflow_id": int(workflow_id),
+            "dag_version": dag_version,
+            "inputs": sorted(input_hashes.items()),
+            "parameters": parameters
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def find_memoized_run(db: Session, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Return the latest successful, unexpired run with this fingerprint"""
+    result = db.execute(
+        text("""
+            SELECT r.id, r.status, r.dagster_run_id, r.run_name, r.started_at,
+                   r.finished_at, r.output_file_path, r.input_file_path
+            FROM workflow.run_memo m
+            JOIN workflow.run r ON r.id = m.run_id
+            WHERE m.fingerprint = :fingerprint
+              AND m.expires_at > NOW()
+              AND r.status = 'Completed'
+            ORDER BY m.created_at DESC
+            LIMIT 1
+        """),
+        {"fingerprint": fingerprint}
+    ).fetchone()
+    return dict(result._mapping) if result else None
+
+def record_run_memo(db: Session, fingerprint: str, workflow_id: int, run_id: int) -> None:
+    """Store the fingerprint for a launched run and evict expired entries"""
+    try:
+        db.execute(
+            text("""
+                INSERT INTO workflow.run_memo (fingerprint, workflow_id, run_id, created_at, expires_at)
+                VALUES (:fingerprint, :workflow_id, :run_id, NOW(), NOW() + make_interval(days => :ttl_days))
+                ON CONFLICT (run_id) DO NOTHING
+            """),
+            {"fingerprint": fingerprint, "workflow_id": workflow_id, "run_id": run_id, "ttl_days": RUN_MEMO_TTL_DAYS}
+        )
+        db.execute(text("DELETE FROM workflow.run_memo WHERE expires_at <= NOW()"))
+        db.commit()
+    except Exception as e:
+        # Memoization is an optimisation; never fail a trigger because of it
+        logger.warning(f"Failed to record run memo for run {run_id}: {str(e)}")
+        db.rollback()
+
+def memo_input_hashes(input_paths: List[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """Pop content hashes added during upload; None if any input wasn't hashed"""
+    hashes = {}
+    complete = True
+    for file_info in input_paths:
+        content_hash = file_info.pop("content_sha256", None)
+        if content_hash is None:
+            complete = False
+        else:
+            hashes[file_info["name"]] = content_hash
+    return hashes if complete else None
@@ -0,0 +1,23 @@
+import os
+import threading
+import boto3
+
+S3_BUCKET = os.getenv("S3_BUCKET", "workflow-files")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_s3_client():
+    """Lazily create one S3/MinIO client per process, configured like the API's client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            s3_client_config = {
+                'region_name': os.getenv("S3_REGION", "us-east-1"),
+                'aws_access_key_id': os.getenv("S3_ACCESS_KEY_ID"),
+                'aws_secret_access_key': os.getenv("S3_SECRET_ACCESS_KEY"),
+            }
+            if os.getenv("S3_ENDPOINT"):
+                s3_client_config['endpoint_url'] = os.getenv("S3_ENDPOINT")
+            _client = boto3.client('s3', **s3_client_config)
+        return _client
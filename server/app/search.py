@@ -0,0 +1,33 @@
+from typing import Any, Dict, Tuple
+
+def like_pattern(search: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def numeric_search(search: str) -> bool:
+    return search.isdigit() and len(search) <= 9  # fits in an integer column
+
+def run_search_clause(search: str) -> Tuple[str, Dict[str, Any]]:
+    """WHERE predicate for the run list search box (table alias a).
+
+    Numeric input matches run and workflow ids exactly through their btree indexes;
+    anything else can only match status, which has a trigram index.
+    """
+    search = search.strip()
+    if numeric_search(search):
+        return "(a.id = :search_id OR a.workflow_id = :search_id)", {"search_id": int(search)}
+    return "a.status ILIKE :search", {"search": like_pattern(search)}
+
+def workflow_search_clause(search: str) -> Tuple[str, Dict[str, Any]]:
+    """WHERE predicate for the workflow list search box (table alias a).
+
+    name and description use trigram indexes; a numeric search also matches the id exactly.
+    """
+    search = search.strip()
+    params = {"search": like_pattern(search)}
+    clause = "a.name ILIKE :search OR a.description ILIKE :search"
+    if numeric_search(search):
+        clause += " OR a.id = :search_id"
+        params["search_id"] = int(search)
+    return f"({clause})", params
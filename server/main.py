@@ -5,8 +5,6 @@ import logging
 import os
 from fastapi.responses import JSONResponse
 
-app = FastAPI(root_path="/api")
-
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -14,6 +12,17 @@ logger = logging.getLogger(__name__)
 # Load environment variables FIRST
 load_dotenv()
 
+# Imported after load_dotenv() so RESPONSE_COMPRESSION_* in .env take effect
+from app.response_encoding import CompressionMiddleware, FastJSONResponse
+
+# orjson rendering for every route that doesn't return its own Response
+app = FastAPI(root_path="/api", default_response_class=FastJSONResponse)
+
+# Response cache for analytics and filter options; added before CORS so cached
+# responses still pass through the CORS middleware on the way out
+from app.response_cache import ResponseCacheMiddleware
+app.add_middleware(ResponseCacheMiddleware)
+
 # CORS setup
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +31,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression is outermost so cached and CORS-decorated responses are compressed too
+app.add_middleware(CompressionMiddleware)
+
 @app.get("/health")
 def health_check():
     return JSONResponse(content={"status": "ok"}, status_code=200)
@@ -40,9 +52,12 @@ from routes.runs.get_run import router as get_run_router
 from routes.runs.get_runs import router as get_runs_router
 from routes.runs.post_run_step_status import router as post_run_step_status_router
 from routes.runs.post_trigger_workflow import router as post_trigger_workflow_router
+from routes.runs.post_bulk_trigger_workflow import router as post_bulk_trigger_workflow_router
 from routes.runs.post_validate_file import router as post_validate_file_router
 from routes.runs.post_sync_run_status import router as post_sync_run_status_router
 from routes.runs.get_run_status import router as get_run_status_router
+from routes.runs.get_run_stream import router as get_run_stream_router
+from routes.runs.get_run_log_event import router as get_run_log_event_router
 
 from routes.connections.post_new_connection import router as connections_router
 from routes.workflows.post_update_workflow import router as update_workflow_router
@@ -56,6 +71,15 @@ from routes.users.get_user_activity import router as get_user_activity_router
 from routes.users.user_list import router as user_list
 from routes.dags.post_new_dag import router as post_new_dag_router
 from routes.dags.get_dag_repo_access import router as dag_repo_access
+from routes.config.post_new_config import router as post_new_config_router
+
+from routes.get_health_check import SessionLocal
+from app.config_manager import start_introspection_prewarm
+
+# Warm the job introspection cache whenever the Dagster code location loads
+@app.on_event("startup")
+def prewarm_job_introspection():
+    start_introspection_prewarm(SessionLocal)
 
 # Include routers
 app.include_router(health_check_router)
@@ -67,6 +91,7 @@ app.include_router(get_workflow_router)
 app.include_router(post_new_workflow_router)
 app.include_router(workflow_permissions)
 app.include_router(post_update_workflow_config_router)
+app.include_router(post_new_config_router)
 app.include_router(file_router)
 
 # Runs
@@ -80,8 +105,11 @@ app.include_router(update_workflow_router)
 app.include_router(post_new_dag_router)
 app.include_router(dag_repo_access)
 app.include_router(post_trigger_workflow_router)
+app.include_router(post_bulk_trigger_workflow_router)
 app.include_router(post_sync_run_status_router)
 app.include_router(get_run_status_router)
+app.include_router(get_run_stream_router)
+app.include_router(get_run_log_event_router)
 
 # Users
 app.include_router(user_authentication)
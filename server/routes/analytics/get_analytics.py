@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text, func
-from datetime import datetime, timedelta
-from ..get_health_check import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime, timedelta, timezone
+from ..get_health_check import get_async_read_db
+from app.ddsketch import duration_percentiles
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,77 +11,83 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/workflow-run-stats")
-async def get_workflow_run_stats(days: int = 30, db: Session = Depends(get_db)):
+async def get_workflow_run_stats(days: int = 30, db: AsyncSession = Depends(get_async_read_db)):
     """Get workflow run statistics for the last N days"""
     try:
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
+        start_day = datetime.utcnow().date() - timedelta(days=days)
 
-        # Aggregate run counts and status
-        run_stats = db.execute(
+        # Aggregate run counts and status from the trigger-maintained daily rollup
+        run_stats = (await db.execute(
             text("""
-                SELECT 
-                    DATE(started_at) as run_date,
-                    COUNT(*) as total_runs,
-SUM(CASE WHEN LOWER(status) = 'completed' THEN 1 ELSE 0 END) as successful_runs,
-SUM(CASE WHEN LOWER(status) IN ('failed', 'failure') THEN 1 ELSE 0 END) as failed_runs,
-                    AVG(duration_ms::float / 1000) as avg_duration_seconds
-                FROM workflow.run
-                WHERE started_at >= :start_date AND started_at <= :end_date
-                GROUP BY DATE(started_at)
+                SELECT
+                    day as run_date,
+                    SUM(run_count) as total_runs,
+                    SUM(run_count) FILTER (WHERE LOWER(status) = 'completed') as successful_runs,
+                    SUM(run_count) FILTER (WHERE LOWER(status) IN ('failed', 'failure')) as failed_runs,
+                    SUM(duration_sum_ms) / NULLIF(SUM(duration_count), 0) / 1000 as avg_duration_seconds,
+                    jsonb_agg(duration_sketch) FILTER (WHERE duration_count > 0) as duration_sketches
+                FROM workflow.run_daily_rollup
+                WHERE day >= :start_day
+                GROUP BY day
+                HAVING SUM(run_count) > 0
                 ORDER BY run_date
             """),
-            {"start_date": start_date, "end_date": end_date}
-        ).fetchall()
+            {"start_day": start_day}
+        )).fetchall()
 
+        # Percentiles come from merging the per-bucket DDSketches, never from raw runs
         return {
             "run_stats": [
                 {
                     "date": str(row.run_date),
                     "total_runs": row.total_runs,
-                    "successful_runs": row.successful_runs,
-                    "failed_runs": row.failed_runs,
-                    "avg_duration_seconds": round(row.avg_duration_seconds or 0, 2)
+                    "successful_runs": row.successful_runs or 0,
+                    "failed_runs": row.failed_runs or 0,
+                    "avg_duration_seconds": round(row.avg_duration_seconds or 0, 2),
+                    **duration_percentiles(row.duration_sketches or [])
                 } for row in run_stats
-            ]
+            ],
+            "overall": duration_percentiles(
+                sketch for row in run_stats for sketch in (row.duration_sketches or [])
+            )
         }
     except Exception as e:
         logger.error(f"Failed to fetch run stats: {str(e)}")
         raise HTTPException(500, f"Failed to fetch run stats: {str(e)}")
 
 @router.get("/failure-analysis")
-async def get_failure_analysis(days: int = 30, db: Session = Depends(get_db)):
+async def get_failure_analysis(days: int = 30, db: AsyncSession = Depends(get_async_read_db)):
     """Get details of failed runs"""
     try:
-        end_date = datetime.utcnow()
+        end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
 
-        failures = db.execute(
+        failures = (await db.execute(
             text("""
-                SELECT  
-    r.id,
-    r.workflow_id,
-    w.name AS workflow_name,
-    r.started_at,
-    r.dagster_run_id,
-    rss.error_message
-FROM workflow.run r
-JOIN workflow.workflow w ON r.workflow_id = w.id
-LEFT JOIN (
-    SELECT DISTINCT ON (run_id)
-        id,
-        run_id,
-        error_message
-    FROM workflow.run_step_status
-    ORDER BY run_id, id DESC
-) rss ON rss.run_id = r.id
-                WHERE lower(r.status) = 'failed' or lower(r.status) = 'failure'
-                AND r.started_at >= :start_date AND r.started_at <= :end_date
+                SELECT
+                    r.id,
+                    r.workflow_id,
+                    w.name AS workflow_name,
+                    r.started_at,
+                    r.dagster_run_id,
+                    rss.error_message
+                FROM workflow.run r
+                JOIN workflow.workflow w ON r.workflow_id = w.id
+                -- Latest step status per failed run only, through idx_run_step_status_run_id
+                LEFT JOIN LATERAL (
+                    SELECT s.error_message
+                    FROM workflow.run_step_status s
+                    WHERE s.run_id = r.id
+                    ORDER BY s.id DESC
+                    LIMIT 1
+                ) rss ON true
+                WHERE LOWER(r.status) IN ('failed', 'failure')
+                  AND r.started_at >= :start_date AND r.started_at <= :end_date
                 ORDER BY r.started_at DESC
                 LIMIT 50
             """),
             {"start_date": start_date, "end_date": end_date}
-        ).fetchall()
+        )).fetchall()
 
         return {
             "failures": [
@@ -98,35 +105,28 @@ LEFT JOIN (
         logger.error(f"Failed to fetch failure analysis: {str(e)}")
         raise HTTPException(500, f"Failed to fetch failure analysis: {str(e)}")
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import text
-from datetime import datetime, timedelta
-import logging
-
-logger = logging.getLogger(__name__)
-
 @router.get("/run-analysis")
-async def get_run_analysis(days: int = 30, db: Session = Depends(get_db)):
+async def get_run_analysis(days: int = 30, db: AsyncSession = Depends(get_async_read_db)):
     """Get aggregated run statistics by workflow and status within a date range"""
     try:
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
+        start_day = datetime.utcnow().date() - timedelta(days=days)
 
         query = text("""
-            SELECT  
-                r.workflow_id,
+            SELECT
+                d.workflow_id,
                 w.name AS workflow_name,
-                r.status,
-                COUNT(*) AS run_count
-            FROM workflow.run r
-            JOIN workflow.workflow w ON r.workflow_id = w.id
-            WHERE r.started_at BETWEEN :start_date AND :end_date
-            GROUP BY r.workflow_id, w.name, r.status
-            ORDER BY w.name, r.status;
+                d.status,
+                SUM(d.run_count) AS run_count,
+                jsonb_agg(d.duration_sketch) FILTER (WHERE d.duration_count > 0) AS duration_sketches
+            FROM workflow.run_daily_rollup d
+            JOIN workflow.workflow w ON d.workflow_id = w.id
+            WHERE d.day >= :start_day
+            GROUP BY d.workflow_id, w.name, d.status
+            HAVING SUM(d.run_count) > 0
+            ORDER BY w.name, d.status;
         """)
 
-        results = db.execute(query, {"start_date": start_date, "end_date": end_date}).fetchall()
+        results = (await db.execute(query, {"start_day": start_day})).fetchall()
 
         return {
             "analysis": [
@@ -134,7 +134,8 @@ async def get_run_analysis(days: int = 30, db: Session = Depends(get_db)):
                     "workflow_id": row.workflow_id,
                     "workflow_name": row.workflow_name,
                     "status": row.status,
-                    "run_count": row.run_count
+                    "run_count": row.run_count,
+                    **duration_percentiles(row.duration_sketches or [])
                 }
                 for row in results
             ]
@@ -144,13 +145,13 @@ async def get_run_analysis(days: int = 30, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to fetch run analysis: {str(e)}")
 
 @router.get("/user-activity")
-async def get_user_activity(days: int = 30, db: Session = Depends(get_db)):
+async def get_user_activity(days: int = 30, db: AsyncSession = Depends(get_async_read_db)):
     """Get user activity metrics"""
     try:
-        end_date = datetime.utcnow()
+        end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
 
-        user_activity = db.execute(
+        user_activity = (await db.execute(
             text("""
                 SELECT 
                     u.id,
@@ -167,7 +168,7 @@ async def get_user_activity(days: int = 30, db: Session = Depends(get_db)):
                 ORDER BY trigger_count DESC
             """),
             {"start_date": start_date, "end_date": end_date}
-        ).fetchall()
+        )).fetchall()
 
         return {
             "users": [
@@ -186,41 +187,42 @@ async def get_user_activity(days: int = 30, db: Session = Depends(get_db)):
         raise HTTPException(500, f"Failed to fetch user activity: {str(e)}")
 
 @router.get("/step-performance")
-async def get_step_performance(days: int = 30, db: Session = Depends(get_db)):
+async def get_step_performance(days: int = 30, db: AsyncSession = Depends(get_async_read_db)):
     """Get performance metrics for workflow steps"""
     try:
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
+        start_day = datetime.utcnow().date() - timedelta(days=days)
 
-        step_stats = db.execute(
+        step_stats = (await db.execute(
             text("""
-SELECT 
-    w.id AS workflow_id,
-    w.name AS workflow_name,
-    rss.step_code,
-    COUNT(rss.id) AS execution_count,
-    SUM(CASE WHEN rss.status = 'failed' THEN 1 ELSE 0 END) AS failure_count,
-    AVG(rss.duration_ms::float / 1000) AS avg_duration_seconds
-FROM workflow.run_step_status rss
-JOIN workflow.workflow w ON rss.workflow_id = w.id
-WHERE rss.started_at >= :start_date AND rss.started_at <= :end_date
-GROUP BY w.id, w.name, rss.step_code
-ORDER BY failure_count DESC, avg_duration_seconds DESC
-
+                SELECT
+                    w.id AS workflow_id,
+                    w.name AS workflow_name,
+                    d.step_code,
+                    SUM(d.execution_count) AS execution_count,
+                    COALESCE(SUM(d.execution_count) FILTER (WHERE LOWER(d.status) IN ('failed', 'failure')), 0) AS failure_count,
+                    SUM(d.duration_sum_ms) / NULLIF(SUM(d.duration_count), 0) / 1000 AS avg_duration_seconds,
+                    jsonb_agg(d.duration_sketch) FILTER (WHERE d.duration_count > 0) AS duration_sketches
+                FROM workflow.step_daily_rollup d
+                JOIN workflow.workflow w ON d.workflow_id = w.id
+                WHERE d.day >= :start_day
+                GROUP BY w.id, w.name, d.step_code
+                HAVING SUM(d.execution_count) > 0
+                ORDER BY failure_count DESC, avg_duration_seconds DESC NULLS LAST
             """),
-            {"start_date": start_date, "end_date": end_date}
-        ).fetchall()
+            {"start_day": start_day}
+        )).fetchall()
 
         return {
             "step_stats": [
                 {
                     "workflow_id": row.workflow_id,
                     "workflow_name": row.workflow_name,
-                    "step_label": row.step_label,
+                    "step_label": row.step_code,
                     "step_code": row.step_code,
                     "execution_count": row.execution_count,
                     "failure_count": row.failure_count,
-                    "avg_duration_seconds": round(row.avg_duration_seconds or 0, 2)
+                    "avg_duration_seconds": round(row.avg_duration_seconds or 0, 2),
+                    **duration_percentiles(row.duration_sketches or [])
                 } for row in step_stats
             ]
         }
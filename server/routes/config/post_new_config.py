@@ -1,9 +1,15 @@
+import json
+import logging
 import os
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from ...app.config_manager import ConfigTemplateManager, WorkflowConfig
+from app.config_manager import ConfigTemplateManager
 from ..get_health_check import get_db
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/config", tags=["configuration"])
 
 def get_config_manager():
@@ -16,34 +22,44 @@ async def generate_config(
     db: Session = Depends(get_db),
     manager: ConfigTemplateManager = Depends(get_config_manager)
 ):
-    """Generate or regenerate config template"""
+    """Generate or regenerate config template from the cached introspection of the workflow's Dagster job"""
     try:
         # Check existing config
         if not force:
-            existing = await _get_existing_config(workflow_id, db)
+            existing = await run_in_threadpool(_get_existing_config, workflow_id, db)
             if existing:
                 return {"message": "Config exists", "config": existing}
-        
+
         # Generate new template
-        template = await manager.generate_template(workflow_id)
-        
+        template = await manager.generate_template(workflow_id, db)
+
         # Save to database
-        await db.execute(
-            "UPDATE workflow.workflow SET config_template = :template WHERE id = :id",
-            {"template": json.dumps(template), "id": workflow_id}
-        )
-        db.commit()
-        
+        saved = await run_in_threadpool(_save_config_template, workflow_id, template, db)
+        if not saved:
+            raise HTTPException(status_code=404, detail=f"Workflow {workflow_id} not found")
+
         return {"template": template, "generated": True}
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
-        raise HTTPException(500, f"Generation failed: {str(e)}")
+        logger.error(f"Config generation failed for workflow {workflow_id}: {str(e)}")
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
-async def _get_existing_config(workflow_id: int, db: Session) -> Optional[Dict]:
-    result = await db.execute(
-        "SELECT config_template FROM workflow.workflow WHERE id = :id",
+def _get_existing_config(workflow_id: int, db: Session) -> Optional[Dict[str, Any]]:
+    row = db.execute(
+        text("SELECT config_template FROM workflow.workflow WHERE id = :id"),
         {"id": workflow_id}
+    ).fetchone()
+    if not row or not row[0]:
+        return None
+    return json.loads(row[0]) if isinstance(row[0], str) else row[0]
+
+def _save_config_template(workflow_id: int, template: Dict[str, Any], db: Session) -> bool:
+    result = db.execute(
+        text("UPDATE workflow.workflow SET config_template = CAST(:template AS jsonb) WHERE id = :id"),
+        {"template": json.dumps(template), "id": workflow_id}
     )
-    row = result.fetchone()
-    return json.loads(row[0]) if row and row[0] else None
\ No newline at end of file
+    db.commit()
+    return result.rowcount > 0
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
 import boto3
 from botocore.exceptions import ClientError
 from github import Github, GithubException
@@ -8,6 +10,7 @@ import os
 from dotenv import load_dotenv
 import logging
 import requests
+from app.db_pools import DB_READ_CONNECT_TIMEOUT, ReplicaLagMonitor, pool_metrics, pool_settings, timed_pool_class
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -61,14 +64,15 @@ if not DATABASE_URL:
 if not DATABASE_URL:
     raise ValueError("Database URL cannot be None")
 
-# Create database engine
+# Optional read replica for GET routes that tolerate a few seconds of lag
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+# Create database engine; pools are tunable as DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
 try:
     engine = create_engine(
         DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=1800
+        poolclass=timed_pool_class(QueuePool, "primary"),
+        **pool_settings("DB", pool_size=5, max_overflow=10)
     )
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
@@ -87,6 +91,24 @@ if not GITHUB_ACCESS_TOKEN:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read engine, tunable as DB_READ_POOL_SIZE etc. Not verified at startup: while the replica
+# is unreachable the lag monitor keeps reads on the primary
+if DATABASE_READ_URL:
+    read_engine = create_engine(
+        DATABASE_READ_URL,
+        poolclass=timed_pool_class(QueuePool, "replica"),
+        pool_pre_ping=True,
+        connect_args={"connect_timeout": DB_READ_CONNECT_TIMEOUT},
+        **pool_settings("DB_READ", pool_size=10, max_overflow=10)
+    )
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    replica_monitor = ReplicaLagMonitor(read_engine)
+    logger.info("Read replica engine created")
+else:
+    read_engine = None
+    ReadSessionLocal = None
+    replica_monitor = None
+
 def get_db():
     db = SessionLocal()
     try:
@@ -94,6 +116,112 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """Session for read-only routes: the replica while it is within DB_READ_MAX_LAG_SECONDS, else the primary"""
+    use_replica = replica_monitor is not None and replica_monitor.replica_usable()
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Async engine for routes that shouldn't block the event loop on database I/O
+def to_async_database_url(url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_database_url(DATABASE_URL)
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL") or (
+    to_async_database_url(DATABASE_READ_URL) if DATABASE_READ_URL else None
+)
+
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool, "async_primary"),
+        **pool_settings("ASYNC_DB", pool_size=20, max_overflow=20)
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    logger.info("Async database engine created successfully")
+
+    if ASYNC_DATABASE_READ_URL and replica_monitor is not None:
+        async_read_engine = create_async_engine(
+            ASYNC_DATABASE_READ_URL,
+            poolclass=timed_pool_class(AsyncAdaptedQueuePool, "async_replica"),
+            pool_pre_ping=True,
+            connect_args={"timeout": DB_READ_CONNECT_TIMEOUT},
+            **pool_settings("ASYNC_DB_READ", pool_size=20, max_overflow=20)
+        )
+        AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+        logger.info("Async read replica engine created")
+    else:
+        async_read_engine = None
+        AsyncReadSessionLocal = None
+except ImportError as e:
+    async_engine = None
+    AsyncSessionLocal = None
+    async_read_engine = None
+    AsyncReadSessionLocal = None
+    logger.error(f"asyncpg is not installed, async routes will run their queries in a threadpool: {str(e)}")
+
+class ThreadpoolSession:
+    """Awaitable wrapper over a sync Session, used by get_async_db when asyncpg is unavailable"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(self.session.execute, *args, **kwargs)
+
+    async def commit(self):
+        await run_in_threadpool(self.session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.session.close)
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        db = ThreadpoolSession(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def replica_usable() -> bool:
+    """Lag-checked replica availability; the check itself is sync, so it runs in the threadpool"""
+    if replica_monitor is None:
+        return False
+    if replica_monitor.needs_refresh():
+        await run_in_threadpool(replica_monitor.refresh)
+    return replica_monitor.usable
+
+async def get_async_read_db():
+    """Async counterpart of get_read_db"""
+    use_replica = await replica_usable()
+    if AsyncSessionLocal is None:
+        db = ThreadpoolSession(ReadSessionLocal() if use_replica else SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+
+    session_factory = AsyncReadSessionLocal if use_replica and AsyncReadSessionLocal else AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
 router = APIRouter()
 
 def check_dagster_health():
@@ -180,4 +308,18 @@ def health_check():
             "s3_bucket": S3_BUCKET,
             "s3_endpoint": S3_ENDPOINT
         }
+    }
+
+@router.get("/health_check/db-pools")
+def db_pool_health():
+    """Connection pool usage and checkout wait times per engine, and whether reads are on the replica"""
+    engines = {
+        "primary": engine,
+        "replica": read_engine,
+        "async_primary": async_engine.sync_engine if async_engine else None,
+        "async_replica": async_read_engine.sync_engine if async_read_engine else None,
+    }
+    return {
+        "pools": [pool_metrics(name, pool_engine) for name, pool_engine in engines.items() if pool_engine is not None],
+        "read_routing": replica_monitor.status() if replica_monitor else {"replica_in_use": False, "configured": False},
     }
\ No newline at end of file
@@ -1,22 +1,182 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from sqlalchemy.orm import Session
 import logging
-from typing import Optional
-from ..get_health_check import get_db
+from typing import Any, Dict, List, Optional, Tuple
+from ..get_health_check import get_read_db
+from app.run_log_archive import read_archived_run_logs
+from app.response_cache import (
+    cache_run_response, conditional_run_response, etag_matches, run_etag, run_response_cache,
+    run_response_headers
+)
+from fastapi.responses import Response
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/runs", tags=["runs"])
 
+# fields= name -> (SQL expression, join it needs)
+RUN_FIELDS = {
+    "id": ("r.id", None),
+    "dagster_run_id": ("r.dagster_run_id", None),
+    "workflow_id": ("r.workflow_id", None),
+    "status": ("r.status", None),
+    "started_at": ("r.started_at", None),
+    "finished_at": ("r.finished_at", None),
+    "duration_ms": ("r.duration_ms", None),
+    "error_message": ("r.error_message", None),
+    "run_name": ("r.run_name", None),
+    "triggered_by": ("r.triggered_by", None),
+    "input_file_path": ("r.input_file_path", None),
+    "output_file_path": ("r.output_file_path", None),
+    "last_activity": ("r.last_activity", None),
+    "updated_at": ("r.updated_at", None),
+    "workflow_name": ("w.name", "workflow"),
+    "workflow_description": ("w.description", "workflow"),
+    "triggered_by_email": ("u.email", "user"),
+    "triggered_by_username": ("concat(u.first_name, ' ', u.surname)", "user"),
+}
+# Always projected: the response cache keys on them
+REQUIRED_RUN_FIELDS = ("id", "status", "updated_at")
+RUN_JOINS = {
+    "workflow": "LEFT JOIN workflow.workflow w ON r.workflow_id = w.id",
+    "user": "LEFT JOIN workflow.user u ON r.triggered_by = u.id",
+}
+RUN_INCLUDES = ("steps", "logs", "config")
+
+
+def parse_list_param(value: Optional[str], allowed, name: str) -> Optional[List[str]]:
+    """Split a comma-separated query param, rejecting unknown entries with a 400"""
+    if value is None:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name}: {', '.join(unknown)}")
+    return items
+
+
+def run_select(fields: Optional[List[str]], include: List[str]) -> str:
+    """Run query projecting only the requested fields and joining only what they need"""
+    if fields is None:
+        return """
+            SELECT
+                r.*,
+                w.name AS workflow_name,
+                w.description AS workflow_description, run_name,
+                u.email AS triggered_by_email,
+                concat(u.first_name, ' ', u.surname) AS triggered_by_username
+            FROM workflow.run r
+            LEFT JOIN workflow.workflow w ON r.workflow_id = w.id
+            LEFT JOIN workflow.user u ON r.triggered_by = u.id
+            WHERE r.id = :id
+        """
+
+    names = list(dict.fromkeys(list(REQUIRED_RUN_FIELDS) + fields))
+    columns = [f"{RUN_FIELDS[name][0]} AS {name}" for name in names]
+    if "config" in include:
+        columns += ["r.config", "r.config_used"]
+    joins = [RUN_JOINS[join] for join in RUN_JOINS if any(RUN_FIELDS[name][1] == join for name in names)]
+    return f"""
+        SELECT {', '.join(columns)}
+        FROM workflow.run r
+        {' '.join(joins)}
+        WHERE r.id = :id
+    """
+
+
+def fetch_run_logs(db: Session, run_id: int, limit: int, offset: int, sort_desc: bool,
+                   started_at: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """One page of a run's logs, merging in any that were moved to the Parquet archive"""
+    archived_logs = read_archived_run_logs(db, run_id, started_at)
+    if archived_logs:
+        # Part of the run has been moved to the Parquet archive, so merge and page in memory
+        live_logs = db.execute(
+            text("""
+                SELECT rl.* FROM workflow.run_log rl
+                WHERE rl.run_id = :run_id
+            """),
+            {"run_id": run_id}
+        ).fetchall()
+        all_logs = archived_logs + [dict(log._mapping) for log in live_logs]
+        all_logs.sort(key=lambda log: (log["timestamp"], log["id"]), reverse=sort_desc)
+        logs = []
+        for log in all_logs[offset:offset + limit]:
+            log["step_label"] = log["step_code"]
+            logs.append(log)
+        return logs
+
+    order_by = "rl.timestamp DESC" if sort_desc else "rl.timestamp ASC"
+    logs_query = f"""
+        SELECT
+            rl.*,
+            rl.step_code AS step_label
+        FROM workflow.run_log rl
+        WHERE rl.run_id = :run_id
+        ORDER BY {order_by}
+        LIMIT :limit OFFSET :offset
+    """
+    return [
+        dict(log._mapping) for log in db.execute(
+            text(logs_query),
+            {"run_id": run_id, "limit": limit, "offset": offset}
+        ).fetchall()
+    ]
+
+
+def fetch_run_steps(db: Session, run_id: int) -> List[Dict[str, Any]]:
+    step_status_query = """
+        SELECT
+            rss.id,
+            rss.run_id,
+            rss.step_code,
+            rss.status,
+            rss.started_at,
+            rss.finished_at,
+            rss.duration_ms,
+            rss.error_message,
+            rss.step_code AS step_label
+        FROM workflow.run_step_status rss
+        WHERE rss.run_id = :run_id
+        ORDER BY rss.started_at
+    """
+    return [dict(status._mapping) for status in db.execute(text(step_status_query), {"run_id": run_id}).fetchall()]
+
+
+def cached_or_not_modified(request: Request, db: Session, run_id: int, cache_key: str,
+                           variant: str, always_check: bool = False) -> Tuple[Optional[Response], Optional[Any]]:
+    """Serve a cached terminal response or a 304 before doing any real work.
+
+    Returns (response, version); version is the run's (status, updated_at, started_at) row when it was looked up.
+    """
+    cached = run_response_cache.get(cache_key)
+    if cached:
+        return conditional_run_response(request, cached["body"], cached["etag"], terminal=True), None
+
+    if not (always_check or request.headers.get("if-none-match")):
+        return None, None
+    version = db.execute(
+        text("SELECT status, updated_at, started_at FROM workflow.run WHERE id = :id"),
+        {"id": run_id}
+    ).fetchone()
+    if not version:
+        raise HTTPException(status_code=404, detail="Run not found")
+    etag = run_etag(run_id, version.updated_at, variant)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=run_response_headers(etag, terminal=False)), version
+    return None, version
+
 
 @router.get("/run/{run_id}")
-async def get_run(
+def get_run(
     run_id: int,
+    request: Request,
     limit_logs: Optional[int] = Query(100, ge=1, le=1000),
     offset_logs: Optional[int] = Query(0, ge=0),
     include_steps: bool = True,
     sort_logs_desc: bool = False,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated run fields to return"),
+    include: Optional[str] = Query(None, description="Comma-separated parts to include: steps, logs, config"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get detailed run information including workflow, user, steps, and logs.
@@ -27,82 +187,127 @@ async def get_run(
     - `offset_logs`: Offset for pagination
     - `include_steps`: Whether to include step statuses
     - `sort_logs_desc`: Sort logs by timestamp descending if True; ascending otherwise
+    - `fields`: Run fields to project in SQL (id, status and updated_at are always returned);
+      all run columns when omitted
+    - `include`: Parts to return besides the run; defaults to steps (unless include_steps is
+      false) and logs. `config` adds config and config_used when `fields` is given.
+
+    Large parts are also available on their own: `/run/{run_id}/logs` and `/run/{run_id}/config`.
+
+    Live runs carry an ETag derived from run.updated_at and answer If-None-Match with a 304
+    after a single-row version check. Terminal runs are served from an in-process LRU for
+    RUN_RESPONSE_CACHE_TTL_SECONDS, with an ETag taken from the response body so a renamed
+    workflow or user shows up once that expires.
     """
 
     try:
+        field_list = parse_list_param(fields, RUN_FIELDS, "fields")
+        include_list = parse_list_param(include, RUN_INCLUDES, "include")
+        if include_list is None:
+            include_list = ["steps", "logs"] if include_steps else ["logs"]
+
+        variant = (f"{limit_logs}:{offset_logs}:{sort_logs_desc}:"
+                   f"{','.join(sorted(field_list)) if field_list is not None else '*'}:{','.join(sorted(include_list))}")
+        cache_key = f"run:{run_id}:{variant}"
+        response, _ = cached_or_not_modified(request, db, run_id, cache_key, variant)
+        if response:
+            return response
+
         logger.info(f"Fetching run {run_id}")
 
-        # Fetch run details with workflow and user info
-        run = db.execute(
-            text("""
-                SELECT
-                    r.*,
-                    w.name AS workflow_name,
-                    w.description AS workflow_description, run_name,
-                    u.email AS triggered_by_email,
-                    concat(u.first_name, ' ', u.surname) AS triggered_by_username
-                FROM workflow.run r
-                LEFT JOIN workflow.workflow w ON r.workflow_id = w.id
-                LEFT JOIN workflow.user u ON r.triggered_by = u.id
-                WHERE r.id = :id
-            """),
-            {"id": run_id}
-        ).fetchone()
+        # Fetch run details, joining workflow and user only for the fields that need them
+        run = db.execute(text(run_select(field_list, include_list)), {"id": run_id}).fetchone()
 
         if not run:
             logger.error(f"Run {run_id} not found")
             raise HTTPException(status_code=404, detail="Run not found")
 
-        # Fetch run logs with pagination and consistent ordering
-        order_by = "rl.timestamp DESC" if sort_logs_desc else "rl.timestamp ASC"
-        logs_query = f"""
-            SELECT
-                rl.*,
-                rl.step_code AS step_label
-            FROM workflow.run_log rl
-            WHERE rl.run_id = :run_id
-            ORDER BY {order_by}
-            LIMIT :limit OFFSET :offset
-        """
+        payload = {"run": dict(run._mapping)}
+        if "logs" in include_list:
+            payload["logs"] = fetch_run_logs(
+                db, run_id, limit_logs, offset_logs, sort_logs_desc, run._mapping.get("started_at")
+            )
+        if "steps" in include_list:
+            payload["step_statuses"] = fetch_run_steps(db, run_id)
+        elif fields is None:
+            payload["step_statuses"] = []
 
-        logs = db.execute(
-            text(logs_query),
-            {"run_id": run_id, "limit": limit_logs, "offset": offset_logs}
-        ).fetchall()
+        logger.info(f"Run {run_id} retrieved successfully")
+        etag = run_etag(run_id, run.updated_at, variant)
+        body, etag, terminal = cache_run_response(cache_key, payload, etag, run.status)
+        return conditional_run_response(request, body, etag, terminal)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch run {run_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch run: {str(e)}")
 
-        # Fetch step statuses if requested
-        step_statuses = []
-        if include_steps:
-            step_status_query = """
-      SELECT
-                    rss.id,
-                    rss.run_id,
-                    rss.step_code,
-                    rss.status,
-                    rss.started_at,
-                    rss.finished_at,
-                    rss.duration_ms,
-                    rss.error_message,
-                    rss.step_code AS step_label
-                FROM workflow.run_step_status rss
-                WHERE rss.run_id = :run_id
-                ORDER BY rss.started_at
-            """
-
-            step_statuses = db.execute(
-                text(step_status_query),
-                {"run_id": run_id}
-            ).fetchall()
 
-        logger.info(f"Run {run_id} retrieved successfully")
-        return {
-            "run": dict(run._mapping),
-            "logs": [dict(log._mapping) for log in logs],
-            "step_statuses": [dict(status._mapping) for status in step_statuses]
+@router.get("/run/{run_id}/logs")
+def get_run_logs(
+    run_id: int,
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    sort_desc: bool = False,
+    db: Session = Depends(get_read_db)
+):
+    """Get one page of a run's logs; has_more tells the client whether to ask for the next page"""
+    try:
+        variant = f"logs:{limit}:{offset}:{sort_desc}"
+        cache_key = f"run:{run_id}:{variant}"
+        response, version = cached_or_not_modified(request, db, run_id, cache_key, variant, always_check=True)
+        if response:
+            return response
+
+        logs = fetch_run_logs(db, run_id, limit + 1, offset, sort_desc, version.started_at)
+        payload = {
+            "run_id": run_id,
+            "logs": logs[:limit],
+            "limit": limit,
+            "offset": offset,
+            "has_more": len(logs) > limit
         }
+        etag = run_etag(run_id, version.updated_at, variant)
+        body, etag, terminal = cache_run_response(cache_key, payload, etag, version.status)
+        return conditional_run_response(request, body, etag, terminal)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to fetch run {run_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to fetch run: {str(e)}")
\ No newline at end of file
+        logger.error(f"Failed to fetch logs for run {run_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch run logs: {str(e)}")
+
+
+@router.get("/run/{run_id}/config")
+def get_run_config(run_id: int, request: Request, db: Session = Depends(get_read_db)):
+    """Get the config a run was triggered with and the config Dagster actually used"""
+    try:
+        variant = "config"
+        cache_key = f"run:{run_id}:{variant}"
+        cached = run_response_cache.get(cache_key)
+        if cached:
+            return conditional_run_response(request, cached["body"], cached["etag"], terminal=True)
+
+        run = db.execute(
+            text("SELECT r.id, r.status, r.updated_at, r.config, r.config_used FROM workflow.run r WHERE r.id = :id"),
+            {"id": run_id}
+        ).fetchone()
+        if not run:
+            raise HTTPException(status_code=404, detail="Run not found")
+
+        etag = run_etag(run_id, run.updated_at, variant)
+        body, etag, terminal = cache_run_response(
+            cache_key,
+            {"run_id": run.id, "config": run.config, "config_used": run.config_used},
+            etag,
+            run.status
+        )
+        return conditional_run_response(request, body, etag, terminal)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch config for run {run_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch run config: {str(e)}")
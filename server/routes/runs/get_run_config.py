@@ -1,47 +1,111 @@
 import os
 import json
+import hashlib
 import logging
+import threading
 import requests
+from typing import Any, Dict, Optional, Tuple
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from app.dagster_workspace import dagster_graphql_url, get_location_version
 
 # Define the DAGSTER_API_URL using an environment variable or a default value
 DAGSTER_API_URL = os.getenv('DAGSTER_API_URL', 'http://localhost:3500')
+DEFAULT_LOCATION_NAME = "server.app.dagster.repo"
+DEFAULT_REPOSITORY_NAME = "workflow_repository"
+VALIDATION_CACHE_MAX_ENTRIES = int(os.getenv("CONFIG_VALIDATION_CACHE_MAX_ENTRIES", "1000"))
 
 logger = logging.getLogger(__name__)
 
-def get_validated_config(job_name: str, config: dict) -> tuple[bool, str]:
-    """Validate a Dagster job configuration via GraphQL API."""
+VALIDATE_CONFIG_QUERY = """
+query ValidateConfig($selector: JobSelector!, $runConfigData: RunConfigData!) {
+    runConfigValidation(selector: $selector, runConfigData: $runConfigData) {
+        __typename
+        ... on RunConfigValidationValid {
+            __typename
+        }
+        ... on RunConfigValidationInvalid {
+            errors {
+                message
+                reason
+            }
+        }
+    }
+}
+"""
+
+# Keys are (location, job, location version, config shape); only valid shapes are cached,
+# since an invalid config may be invalid because of a value rather than its shape
+_validation_cache: Dict[Tuple[str, str, str, str], bool] = {}
+_validation_cache_lock = threading.Lock()
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+_session = _create_session()
+
+def config_shape(value: Any) -> Any:
+    """Strip scalar values from a config, keeping its keys, nesting and scalar types"""
+    if isinstance(value, dict):
+        return {key: config_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [config_shape(item) for item in value]
+    return type(value).__name__
+
+def config_shape_hash(config: Dict[str, Any]) -> str:
+    shape = json.dumps(config_shape(config), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(shape.encode("utf-8")).hexdigest()
+
+def _cache_key(job_name: str, config: Dict[str, Any], location_name: str) -> Optional[Tuple[str, str, str, str]]:
+    location_version = get_location_version(location_name)
+    if location_version is None:
+        return None
+    return (location_name, job_name, location_version, config_shape_hash(config))
+
+def _remember_valid(key: Tuple[str, str, str, str]) -> None:
+    with _validation_cache_lock:
+        # Drop entries from earlier loads of this location; they can never be hit again
+        stale = [k for k in _validation_cache if k[0] == key[0] and k[2] != key[2]]
+        for k in stale:
+            del _validation_cache[k]
+        if len(_validation_cache) >= VALIDATION_CACHE_MAX_ENTRIES:
+            _validation_cache.pop(next(iter(_validation_cache)))
+        _validation_cache[key] = True
+
+def mark_config_valid(job_name: str, config: Dict[str, Any], location_name: str = DEFAULT_LOCATION_NAME) -> None:
+    """Record a config shape as valid, e.g. after Dagster accepted a launch with it"""
+    key = _cache_key(job_name, config, location_name)
+    if key is not None:
+        _remember_valid(key)
+
+def validate_run_config(job_name: str, config: dict, location_name: str = DEFAULT_LOCATION_NAME,
+                        repository_name: str = DEFAULT_REPOSITORY_NAME) -> Tuple[Optional[bool], str]:
+    """Validate a config, using the shape cache when possible.
+
+    Returns (None, message) when Dagster couldn't give an answer, so callers can tell
+    an invalid config apart from a failed validation request.
+    """
+    key = _cache_key(job_name, config, location_name)
+    if key is not None:
+        with _validation_cache_lock:
+            if key in _validation_cache:
+                logger.debug(f"Config shape for {job_name} already validated at location version {key[2]}")
+                return True, "Configuration is valid"
+
     try:
-        session = requests.Session()
-        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        response = session.post(
-            f"{DAGSTER_API_URL}/graphql",
+        response = _session.post(
+            dagster_graphql_url(DAGSTER_API_URL),
             json={
-                "query": """
-                query ValidateConfig($selector: JobSelector!, $runConfigData: RunConfigData!) {
-                    runConfigValidation(selector: $selector, runConfigData: $runConfigData) {
-                        __typename
-                        ... on RunConfigValidationValid {
-                            __typename
-                        }
-                        ... on RunConfigValidationInvalid {
-                            errors {
-                                message
-                                reason
-                            }
-                        }
-                    }
-                }
-                """,
+                "query": VALIDATE_CONFIG_QUERY,
                 "variables": {
                     "selector": {
-                        "repositoryLocationName": "server.app.dagster.repo",
-                        "repositoryName": "workflow_repository",
+                        "repositoryLocationName": location_name,
+                        "repositoryName": repository_name,
                         "jobName": job_name
                     },
                     "runConfigData": config
@@ -57,11 +121,13 @@ def get_validated_config(job_name: str, config: dict) -> tuple[bool, str]:
         if "errors" in data and data["errors"]:
             error_msg = f"GraphQL errors: {json.dumps(data['errors'], indent=2)}"
             logger.error(error_msg)
-            return False, error_msg
+            return None, error_msg
 
         validation = data.get("data", {}).get("runConfigValidation", {})
 
         if validation.get("__typename") == "RunConfigValidationValid":
+            if key is not None:
+                _remember_valid(key)
             return True, "Configuration is valid"
         elif validation.get("__typename") == "RunConfigValidationInvalid":
             errors = [f"{err['message']} (Reason: {err['reason']})" for err in validation.get("errors", [])]
@@ -71,13 +137,19 @@ def get_validated_config(job_name: str, config: dict) -> tuple[bool, str]:
         else:
             error_msg = f"Unexpected validation response: {json.dumps(validation, indent=2)}"
             logger.error(error_msg)
-            return False, error_msg
+            return None, error_msg
 
     except requests.RequestException as e:
         error_msg = f"Request failed: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return None, error_msg
     except Exception as e:
         error_msg = f"Validation failed: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return None, error_msg
+
+def get_validated_config(job_name: str, config: dict, location_name: str = DEFAULT_LOCATION_NAME,
+                         repository_name: str = DEFAULT_REPOSITORY_NAME) -> tuple[bool, str]:
+    """Validate a Dagster job configuration via GraphQL API."""
+    valid, message = validate_run_config(job_name, config, location_name, repository_name)
+    return bool(valid), message
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+import json
+import logging
+import zlib
+from app.run_log_archive import read_archived_log
+from ..get_health_check import get_db
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/runs", tags=["runs"])
+
+
+def expand_compact_event(log: dict) -> dict:
+    """Rebuild a Dagster event from run_log columns plus its compacted event_data"""
+    event = {
+        "__typename": log["event_type"],
+        "stepKey": log["step_code"],
+        "timestamp": str(int(log["timestamp"].timestamp() * 1000)) if log["timestamp"] else None,
+    }
+    if log["event_type"] == "MessageEvent":
+        event["message"] = log["message"]
+        event["level"] = (log["log_level"] or "INFO").upper()
+    event.update(log["event_data"] or {})
+    return event
+
+
+@router.get("/run/{run_id}/logs/{log_id}/event")
+def get_run_log_event(run_id: int, log_id: int, db: Session = Depends(get_db)):
+    """
+    Get the full Dagster event behind a run log entry, for when a user expands it.
+    """
+    try:
+        row = db.execute(
+            text("""
+                SELECT id, dagster_run_id, step_code, event_type, message, log_level, "timestamp", event_data
+                FROM workflow.run_log
+                WHERE id = :log_id AND run_id = :run_id
+            """),
+            {"log_id": log_id, "run_id": run_id}
+        ).fetchone()
+        # Entries from partitions older than RUN_LOG_RETENTION_MONTHS are only in the archive
+        log = dict(row._mapping) if row else read_archived_log(db, run_id, log_id)
+
+        if not log:
+            raise HTTPException(status_code=404, detail="Log entry not found")
+
+        pointer = (log["event_data"] or {}).get("_blob")
+        if not pointer:
+            return {"id": log["id"], "event_data": expand_compact_event(log)}
+
+        # Archived months keep their blobs in the archive, except ones archived before blobs
+        # were, whose blobs are still in the table
+        payload = log.get("event_blob")
+        if payload is None:
+            blob = db.execute(
+                text("""
+                    SELECT payload
+                    FROM workflow.run_event_blob
+                    WHERE dagster_run_id = :dagster_run_id AND chunk_sha = :chunk_sha
+                """),
+                {"dagster_run_id": log["dagster_run_id"], "chunk_sha": pointer["chunk"]}
+            ).fetchone()
+            payload = blob.payload if blob else None
+
+        if payload is None:
+            logger.error(f"Event blob {pointer['chunk']} for log {log_id} not found")
+            raise HTTPException(status_code=404, detail="Event payload not found")
+
+        lines = zlib.decompress(bytes(payload)).decode("utf-8").split("\n")
+        return {"id": log["id"], "event_data": json.loads(lines[pointer["line"]])}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch event for log {log_id} of run {run_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch log event: {str(e)}")
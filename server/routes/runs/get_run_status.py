@@ -1,22 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 from sqlalchemy import text
-from ..get_health_check import get_db
+from ..get_health_check import get_async_db
+from app.response_cache import cache_run_response, conditional_run_response, run_etag, run_response_cache
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/status/{run_id}")
-async def get_run_status(run_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Get the current status of a workflow run"""
+async def get_run_status(run_id: int, request: Request, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """Get the current status of a workflow run; terminal runs are served from the in-process run cache"""
     try:
-        result = db.execute(
+        cache_key = f"status:{run_id}"
+        cached = run_response_cache.get(cache_key)
+        if cached:
+            return conditional_run_response(request, cached["body"], cached["etag"], terminal=True)
+
+        result = await db.execute(
             text("""
                 SELECT r.id, r.dagster_run_id, r.workflow_id, r.status, r.started_at,
                        r.finished_at, r.input_file_path, r.output_file_path,
-                       r.error_message, r.duration_ms, w.name as workflow_name
+                       r.error_message, r.duration_ms, r.updated_at, w.name as workflow_name
                 FROM workflow.run r
                 LEFT JOIN workflow.workflow w ON r.workflow_id = w.id
                 WHERE r.id = :run_id
@@ -28,7 +34,8 @@ async def get_run_status(run_id: int, db: Session = Depends(get_db)) -> Dict[str
         if not run_record:
             raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
 
-        return {
+        etag = run_etag(run_id, run_record.updated_at, "status")
+        body, etag, terminal = cache_run_response(cache_key, {
             "run_id": run_record.id,
             "dagster_run_id": run_record.dagster_run_id,
             "workflow_id": run_record.workflow_id,
@@ -40,7 +47,8 @@ async def get_run_status(run_id: int, db: Session = Depends(get_db)) -> Dict[str
             "output_file_path": run_record.output_file_path,
             "error_message": run_record.error_message,
             "duration_ms": run_record.duration_ms
-        }
+        }, etag, run_record.status)
+        return conditional_run_response(request, body, etag, terminal)
 
     except HTTPException:
         raise
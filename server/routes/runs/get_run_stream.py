@@ -0,0 +1,148 @@
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from typing import Dict, Any, Optional
+import asyncio
+import json
+import logging
+from app.run_events import RunEventBroker
+from ..get_health_check import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/runs", tags=["runs"])
+
+TERMINAL_STATUSES = {"Completed", "Failed", "Cancelled"}
+KEEPALIVE_SECONDS = 15
+MAX_LOGS_PER_EVENT = 500
+
+# Single LISTEN connection per API worker; started on the first subscription
+run_event_broker = RunEventBroker(engine.url.set(drivername="postgresql").render_as_string(hide_password=False))
+
+def fetch_run_changes(run_id: int, after_log_id: int) -> Optional[Dict[str, Any]]:
+    """Read the run status, step statuses and any run_log rows newer than after_log_id"""
+    db = SessionLocal()
+    try:
+        run = db.execute(
+            text("""
+                SELECT id, status, started_at, finished_at, duration_ms, error_message, output_file_path
+                FROM workflow.run
+                WHERE id = :run_id
+            """),
+            {"run_id": run_id}
+        ).fetchone()
+        if not run:
+            return None
+
+        logs = db.execute(
+            text("""
+                SELECT rl.*, rl.step_code AS step_label
+                FROM workflow.run_log rl
+                WHERE rl.run_id = :run_id AND rl.id > :after_log_id
+                ORDER BY rl.id
+                LIMIT :limit
+            """),
+            {"run_id": run_id, "after_log_id": after_log_id, "limit": MAX_LOGS_PER_EVENT}
+        ).fetchall()
+
+        step_statuses = db.execute(
+            text("""
+                SELECT rss.id, rss.run_id, rss.step_code, rss.status, rss.started_at,
+                       rss.finished_at, rss.duration_ms, rss.error_message,
+                       rss.step_code AS step_label
+                FROM workflow.run_step_status rss
+                WHERE rss.run_id = :run_id
+                ORDER BY rss.started_at
+            """),
+            {"run_id": run_id}
+        ).fetchall()
+
+        return {
+            "run": dict(run._mapping),
+            "logs": [dict(log._mapping) for log in logs],
+            "step_statuses": [dict(step._mapping) for step in step_statuses]
+        }
+    finally:
+        db.close()
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.get("/run/{run_id}/stream")
+async def stream_run(
+    run_id: int,
+    request: Request,
+    after_log_id: int = Query(0, ge=0)
+):
+    """
+    Stream run changes as Server-Sent Events.
+
+    Events:
+    - `logs`: new run_log rows (ids greater than the last one sent)
+    - `status`: run row and step statuses, sent whenever they change
+    - `end`: the run reached a terminal status and everything has been sent
+
+    Writers emit NOTIFY on commit, so the database is only read when something changed.
+    Pass `after_log_id` to resume a dropped stream.
+    """
+    # Subscribe before the snapshot so a NOTIFY landing in between (possibly the terminal
+    # transition) is queued rather than lost; a redundant wakeup just re-reads unchanged state
+    queue = run_event_broker.subscribe(run_id)
+    try:
+        initial = await run_in_threadpool(fetch_run_changes, run_id, after_log_id)
+    except Exception:
+        run_event_broker.unsubscribe(run_id, queue)
+        raise
+    if initial is None:
+        run_event_broker.unsubscribe(run_id, queue)
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    async def event_stream():
+        last_log_id = after_log_id
+        last_status = None
+        changes = initial
+        try:
+            while True:
+                while changes["logs"]:
+                    last_log_id = changes["logs"][-1]["id"]
+                    yield format_sse("logs", changes["logs"])
+                    if len(changes["logs"]) < MAX_LOGS_PER_EVENT:
+                        break
+                    changes = await run_in_threadpool(fetch_run_changes, run_id, last_log_id)
+                    if changes is None:
+                        return
+
+                status = {"run": changes["run"], "step_statuses": changes["step_statuses"]}
+                if status != last_status:
+                    last_status = status
+                    yield format_sse("status", status)
+
+                if changes["run"]["status"] in TERMINAL_STATUSES:
+                    yield format_sse("end", {"run_id": run_id, "status": changes["run"]["status"]})
+                    return
+
+                # Wait for a notification, sending keepalives so proxies keep the connection open
+                while True:
+                    try:
+                        await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected():
+                            return
+                        yield ": keepalive\n\n"
+
+                # Coalesce notifications that arrived while we were busy
+                while not queue.empty():
+                    queue.get_nowait()
+
+                changes = await run_in_threadpool(fetch_run_changes, run_id, last_log_id)
+                if changes is None:
+                    return
+        finally:
+            run_event_broker.unsubscribe(run_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
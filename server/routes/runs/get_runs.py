@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 import logging
-from ..get_health_check import get_db
+from ..get_health_check import get_async_read_db
+from app.search import run_search_clause
+from app.pagination import decode_cursor, encode_cursor, keyset_clauses, keyset_page, count_rows
+from app.list_query import ListQuery, split_values
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
@@ -10,32 +13,33 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/runs", tags=["runs"])
 
 @router.get("/filter-options")
-async def get_filter_options(db: Session = Depends(get_db)):
-    """Get unique filter options for runs"""
+async def get_filter_options(db: AsyncSession = Depends(get_async_read_db)):
+    """Get unique filter options for runs from the trigger-maintained workflow.filter_option table"""
     try:
         logger.info("Fetching filter options")
-        
-        # Fetch unique statuses
-        statuses = db.execute(
-            text("SELECT DISTINCT status FROM workflow.run WHERE status IS NOT NULL")
-        ).fetchall()
-        statuses = [row[0] for row in statuses]
-
-        # Fetch unique workflow IDs
-        workflow_ids = db.execute(
-            text("SELECT DISTINCT workflow_id FROM workflow.run WHERE workflow_id IS NOT NULL")
-        ).fetchall()
-        workflow_ids = [row[0] for row in workflow_ids]
-
-        # Fetch unique user names
-        user_names = db.execute(
+
+        # Fetch unique statuses and workflow IDs
+        options = (await db.execute(
+            text("""
+                SELECT kind, value
+                FROM workflow.filter_option
+                WHERE scope = 'run' AND kind IN ('status', 'workflow_id') AND ref_count > 0
+                ORDER BY kind, value
+            """)
+        )).fetchall()
+        statuses = [row.value for row in options if row.kind == 'status']
+        workflow_ids = sorted(int(row.value) for row in options if row.kind == 'workflow_id')
+
+        # Fetch unique user names; names are joined at read time so user updates show up immediately
+        user_names = (await db.execute(
             text("""
                 SELECT DISTINCT CONCAT(b.first_name, ' ', b.surname) as user_name
-                FROM workflow.run a
-                LEFT JOIN workflow.user b ON a.triggered_by = b.id
-                WHERE b.first_name IS NOT NULL AND b.surname IS NOT NULL
+                FROM workflow.filter_option f
+                JOIN workflow.user b ON b.id = f.value::bigint
+                WHERE f.scope = 'run' AND f.kind = 'triggered_by' AND f.ref_count > 0
+                  AND b.first_name IS NOT NULL AND b.surname IS NOT NULL
             """)
-        ).fetchall()
+        )).fetchall()
         user_names = [row[0] for row in user_names]
 
         logger.info("Filter options retrieved successfully")
@@ -49,6 +53,14 @@ async def get_filter_options(db: Session = Depends(get_db)):
         logger.error(f"Failed to fetch filter options: {str(e)}")
         raise HTTPException(500, f"Failed to fetch filter options: {str(e)}")
 
+# sort_by -> (cursor sort key, SQL column, result field, descending)
+RUN_SORTS = {
+    'Newest first': ('started_at_desc', 'a.started_at', 'started_at', True),
+    'Oldest first': ('started_at_asc', 'a.started_at', 'started_at', False),
+    'A-Z': ('id_asc', 'a.id', 'id', False),
+    'Z-A': ('id_desc', 'a.id', 'id', True)
+}
+
 @router.get("/")
 async def get_runs(
     page: int = 1,
@@ -58,81 +70,75 @@ async def get_runs(
     workflow_id: Optional[str] = None,
     user_name: Optional[str] = None,
     sort_by: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque next/prev cursor from a previous page"),
+    count: str = Query("estimate", pattern="^(exact|estimate|none)$"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get a list of runs with pagination, filtering, and sorting"""
+    """Get a list of runs with pagination, filtering, and sorting.
+
+    Pass `cursor` from a previous response for keyset pagination; `page` is only used without one.
+    """
     try:
         logger.info("Fetching runs")
-        offset = (page - 1) * limit
+        sort_key, sort_column, sort_field, descending = RUN_SORTS.get(sort_by, RUN_SORTS['Newest first'])
+        try:
+            decoded_cursor = decode_cursor(cursor, sort_key) if cursor else None
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+        # Shared FROM/WHERE for the page and the total; list filters bind one array each
+        list_query = ListQuery("FROM workflow.run a", {
+            "b": "LEFT JOIN workflow.user b ON a.triggered_by = b.id",
+            "w": "LEFT JOIN workflow.workflow w ON a.workflow_id = w.id",
+        })
 
-        # Base query
-        query = """
+        # Apply filters
+        if search and search.strip():
+            list_query.where(*run_search_clause(search))
+        list_query.any_of("a.status", "statuses", split_values(status))
+        try:
+            list_query.any_of("a.workflow_id", "workflow_ids", split_values(workflow_id, int))
+        except ValueError:
+            raise HTTPException(400, "workflow_id must be a comma-separated list of integers")
+        list_query.any_of("CONCAT(b.first_name, ' ', b.surname)", "user_names", split_values(user_name), joins=("b",))
+
+        # Apply sorting and pagination; cursors seek on (sort column, id) instead of skipping rows
+        keyset_where, order_by, keyset_params, backwards = keyset_clauses(sort_column, "a.id", descending, decoded_cursor)
+        query = f"""
             SELECT a.id, a.workflow_id, a.triggered_by, a.status, a.started_at, a.finished_at, a.error_message,
-                   a.output_file_path, a.dagster_run_id, a.input_file_path, w."name", 
+                   a.output_file_path, a.dagster_run_id, a.input_file_path, w."name",
                    CONCAT(b.first_name, ' ', b.surname) as user_name, a.run_name
-            FROM workflow.run a
-            LEFT JOIN workflow.user b ON a.triggered_by = b.id
-            LEFT JOIN workflow.workflow w ON a.workflow_id = w.id
-            WHERE 1=1
+            {list_query.from_where()}{keyset_where}
+            ORDER BY {order_by}
+            LIMIT :limit OFFSET :offset
         """
-        count_query = "SELECT COUNT(*) FROM workflow.run a LEFT JOIN workflow.user b ON a.triggered_by = b.id LEFT JOIN workflow.workflow w ON a.workflow_id = w.id WHERE 1=1"
-        params = {"limit": limit, "offset": offset}
-
-        # Apply filters
-        if search:
-            query += " AND (a.id::text ILIKE :search OR a.workflow_id::text ILIKE :search OR a.status ILIKE :search)"
-            count_query += " AND (a.id::text ILIKE :search OR a.workflow_id::text ILIKE :search OR a.status ILIKE :search)"
-            params["search"] = f"%{search}%"
-
-        if status:
-            status_list = status.split(',')
-            query += f" AND a.status IN ({','.join([':status' + str(i) for i in range(len(status_list))])})"
-            count_query += f" AND a.status IN ({','.join([':status' + str(i) for i in range(len(status_list))])})"
-            for i, s in enumerate(status_list):
-                params[f"status{i}"] = s.strip()
-
-        if workflow_id:
-            workflow_id_list = workflow_id.split(',')
-            query += f" AND a.workflow_id IN ({','.join([':workflow_id' + str(i) for i in range(len(workflow_id_list))])})"
-            count_query += f" AND a.workflow_id IN ({','.join([':workflow_id' + str(i) for i in range(len(workflow_id_list))])})"
-            for i, wid in enumerate(workflow_id_list):
-                params[f"workflow_id{i}"] = int(wid.strip())
-
-        if user_name:
-            user_name_list = user_name.split(',')
-            query += f" AND CONCAT(b.first_name, ' ', b.surname) IN ({','.join([':user_name' + str(i) for i in range(len(user_name_list))])})"
-            count_query += f" AND CONCAT(b.first_name, ' ', b.surname) IN ({','.join([':user_name' + str(i) for i in range(len(user_name_list))])})"
-            for i, un in enumerate(user_name_list):
-                params[f"user_name{i}"] = un.strip()
-
-        # Apply sorting
-        sort_mapping = {
-            'Newest first': 'a.started_at DESC',
-            'Oldest first': 'a.started_at ASC',
-            'A-Z': 'a.id ASC',
-            'Z-A': 'a.id DESC'
-        }
-        sort_clause = sort_mapping.get(sort_by, 'a.started_at DESC')
-        query += f" ORDER BY {sort_clause}"
-
-        # Add pagination
-        query += " LIMIT :limit OFFSET :offset"
+        # OFFSET is always bound (0 with a cursor) so the statement text doesn't change with the page
+        offset = (page - 1) * limit if not decoded_cursor and page > 1 else 0
+        page_params = {**list_query.params, **keyset_params, "limit": limit + 1, "offset": offset}
 
         # Execute queries
-        runs = db.execute(text(query), params).fetchall()
-        total = db.execute(text(count_query), params).scalar()
+        rows = [dict(run._mapping) for run in (await db.execute(text(query), page_params)).fetchall()]
+        runs, next_cursor, prev_cursor = keyset_page(rows, limit, sort_key, sort_field, decoded_cursor, backwards)
+        if not decoded_cursor and page > 1 and runs:
+            prev_cursor = encode_cursor(sort_key, runs[0][sort_field], runs[0]["id"], "prev")
+        total, total_is_estimate = await count_rows(db, list_query.count_query(), list_query.params, count)
 
         logger.info("Runs retrieved successfully")
         return {
-            "runs": [dict(run._mapping) for run in runs],
+            "runs": runs,
             "pagination": {
                 "page": page,
                 "limit": limit,
                 "total": total,
-                "pages": (total + limit - 1) // limit
+                "total_is_estimate": total_is_estimate,
+                "pages": (total + limit - 1) // limit if total is not None else None,
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch runs: {str(e)}")
-        raise HTTPException(500, f"Failed to fetch runs: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Failed to fetch runs: {str(e)}")
@@ -0,0 +1,230 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from pydantic import BaseModel
+from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import json
+import logging
+import os
+import requests
+from ..get_health_check import get_db
+from .post_trigger_workflow import (
+    validate_workflow,
+    validate_parameters,
+    validate_required_files,
+    build_dagster_config,
+    launch_dagster_run
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/runs", tags=["runs"])
+
+BULK_TRIGGER_MAX_RUNS = int(os.getenv("BULK_TRIGGER_MAX_RUNS", "500"))
+BULK_LAUNCH_CONCURRENCY = int(os.getenv("BULK_LAUNCH_CONCURRENCY", "8"))
+
+class BulkRunItem(BaseModel):
+    run_name: str
+    parameters: Dict[str, Any] = {}
+    inputs: Dict[str, str] = {}
+
+class BulkTriggerRequest(BaseModel):
+    workflow_id: int
+    triggered_by: int
+    runs: List[BulkRunItem]
+
+def build_input_paths(workflow: Dict[str, Any], inputs: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Turn {input name: S3 path} into the input_paths structure used by single triggers"""
+    input_config = workflow.get("input_file_path", [])
+    file_configs = {fc["name"]: fc for fc in input_config} if isinstance(input_config, list) else {}
+
+    input_paths = []
+    for name, path in inputs.items():
+        if file_configs and name not in file_configs:
+            raise HTTPException(status_code=400, detail=f"Unknown input file: {name}")
+        file_config = file_configs.get(name)
+        input_paths.append({
+            "path": path,
+            "name": name,
+            "description": file_config.get("description", f"{name.replace('_', ' ').title()} input file") if file_config else "Input file"
+        })
+    return input_paths
+
+def launch_dagster_runs(workflow: Dict[str, Any], configs: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Launch runs concurrently over one pooled HTTP session, returning the result or error for each index"""
+    results: Dict[int, Dict[str, Any]] = {}
+    if not configs:
+        return results
+
+    workers = max(1, min(BULK_LAUNCH_CONCURRENCY, len(configs)))
+    with requests.Session() as session:
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+
+        def launch(index: int) -> None:
+            try:
+                results[index] = {"result": launch_dagster_run(workflow, configs[index], http=session)}
+            except HTTPException as e:
+                results[index] = {"error": e.detail}
+            except Exception as e:
+                results[index] = {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(launch, configs.keys()))
+
+    return results
+
+def create_run_records(db: Session, workflow_id: int, triggered_by: int, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Insert all launched runs in one statement, returning run ids keyed by dagster_run_id; raises on failure"""
+    if not rows:
+        return {}
+    try:
+        result = db.execute(
+            text("""
+                INSERT INTO workflow.run (
+                    workflow_id, triggered_by, status, input_file_path,
+                    dagster_run_id, config_used, started_at, run_name
+                )
+                SELECT :workflow_id, :triggered_by, r.status, r.input_file_path,
+                       r.dagster_run_id, r.config_used, NOW(), r.run_name
+                FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+                    status text, input_file_path text, dagster_run_id text,
+                    config_used jsonb, run_name text
+                )
+                RETURNING id, dagster_run_id
+            """),
+            {
+                "workflow_id": workflow_id,
+                "triggered_by": triggered_by,
+                "rows": json.dumps(rows, default=str)
+            }
+        )
+        run_ids = {row.dagster_run_id: row.id for row in result.fetchall()}
+        db.commit()
+        logger.info(f"Created {len(run_ids)} run records for workflow {workflow_id}")
+        return run_ids
+    except Exception as e:
+        logger.error(f"Failed to create run records: {str(e)}")
+        db.rollback()
+        raise
+
+@router.post("/trigger/bulk")
+def trigger_workflow_runs_bulk(
+    bulk_request: BulkTriggerRequest,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Trigger many runs of one workflow, e.g. a backfill over monthly files or a parameter sweep.
+
+    Each item's `inputs` maps input file names to files already in S3. The workflow is
+    validated once, runs are launched concurrently and all run records are inserted together.
+    Items are reported individually; a bad item does not stop the others. If the records
+    can't be inserted the response is a 500 that still lists every launched dagster_run_id.
+    """
+    try:
+        if not bulk_request.runs:
+            raise HTTPException(status_code=400, detail="No runs provided")
+        if len(bulk_request.runs) > BULK_TRIGGER_MAX_RUNS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many runs: {len(bulk_request.runs)} (maximum {BULK_TRIGGER_MAX_RUNS})"
+            )
+
+        workflow = validate_workflow(bulk_request.workflow_id, db)
+        default_params = workflow.get("default_parameters", {})
+
+        items: List[Dict[str, Any]] = []
+        configs: Dict[int, Dict[str, Any]] = {}
+        input_paths_by_index: Dict[int, List[Dict[str, Any]]] = {}
+
+        for index, run in enumerate(bulk_request.runs):
+            item = {"index": index, "run_name": run.run_name}
+            items.append(item)
+            try:
+                if workflow.get("parameters"):
+                    validate_parameters(run.parameters, workflow["parameters"])
+                input_paths = build_input_paths(workflow, run.inputs)
+                validate_required_files(workflow, input_paths)
+
+                run_params = {**default_params, **run.parameters}
+                configs[index] = build_dagster_config(workflow, input_paths, run_params)
+                input_paths_by_index[index] = input_paths
+            except HTTPException as e:
+                item.update({"status": "invalid", "error": e.detail})
+            except Exception as e:
+                item.update({"status": "invalid", "error": str(e)})
+
+        launches = launch_dagster_runs(workflow, configs)
+
+        rows = []
+        launched_indexes = []
+        for index, launch in sorted(launches.items()):
+            if "error" in launch:
+                items[index].update({"status": "launch_failed", "error": launch["error"]})
+                continue
+            rows.append({
+                "status": launch["result"]["status"],
+                "input_file_path": json.dumps(input_paths_by_index[index]),
+                "dagster_run_id": launch["result"]["run_id"],
+                "config_used": configs[index],
+                "run_name": items[index]["run_name"]
+            })
+            launched_indexes.append(index)
+
+        try:
+            run_ids = create_run_records(db, workflow["id"], bulk_request.triggered_by, rows)
+        except Exception as e:
+            # The runs are already executing in Dagster; report their ids so the records can be reconciled
+            logger.error(
+                f"Launched {len(rows)} runs for workflow {workflow['id']} but could not record them; "
+                f"dagster_run_ids: {', '.join(row['dagster_run_id'] for row in rows)}"
+            )
+            for index, row in zip(launched_indexes, rows):
+                items[index].update({
+                    "status": "unrecorded",
+                    "dagster_run_id": row["dagster_run_id"],
+                    "dagster_status": row["status"],
+                    "error": "Launched in Dagster but the run record could not be saved"
+                })
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "success": False,
+                    "detail": f"Failed to create run records: {str(e)}",
+                    "workflow_id": workflow["id"],
+                    "workflow_name": workflow["name"],
+                    "requested": len(items),
+                    "launched": len(rows),
+                    "failed": len(items),
+                    "runs": items
+                }
+            )
+
+        for index, row in zip(launched_indexes, rows):
+            items[index].update({
+                "status": "launched",
+                "run_id": run_ids.get(row["dagster_run_id"]),
+                "dagster_run_id": row["dagster_run_id"],
+                "dagster_status": row["status"]
+            })
+
+        launched = sum(1 for item in items if item["status"] == "launched")
+        logger.info(f"Bulk triggered workflow {workflow['id']}: {launched} of {len(items)} runs launched")
+        return {
+            "success": launched == len(items),
+            "workflow_id": workflow["id"],
+            "workflow_name": workflow["name"],
+            "requested": len(items),
+            "launched": launched,
+            "failed": len(items) - launched,
+            "runs": items
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk workflow trigger failed: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Bulk workflow trigger failed: {str(e)}")
@@ -10,7 +10,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/runs", tags=["runs"])
 
 @router.post("/{run_id}/steps/{step_id}/status")
-async def update_step_status(
+def update_step_status(
     run_id: int,
     step_id: int,
     status: str = Body(..., embed=True),
@@ -71,7 +71,7 @@ async def update_step_status(
         logger.error(f"Failed to update step status: {str(e)}")
         raise HTTPException(500, f"Failed to update step status: {str(e)}")
 @router.post("/{run_id}/steps/{step_id}/complete")
-async def complete_step(
+def complete_step(
     run_id: int,
     step_id: int,
     status: str = Body(..., embed=True, regex="^(success|failed|skipped)$"),
@@ -8,22 +8,14 @@ import os
 from sqlalchemy import text
 from datetime import datetime
 from ..get_health_check import get_db
+from app.run_events import notify_run_event
+from app.run_ingestion import write_run_events
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/runs", tags=["runs"])
 DAGSTER_HOST = os.getenv("DAGSTER_HOST", "localhost")
 DAGSTER_PORT = os.getenv("DAGSTER_PORT", "3500")
 
-# Event types we care about
-RELEVANT_EVENT_TYPES = {
-    "MessageEvent",
-    "ExecutionStepFailureEvent",
-    "ExecutionStepInputEvent",
-    "ExecutionStepOutputEvent",
-    "ExecutionStepStartEvent",
-    "ExecutionStepSuccessEvent"
-}
-
 # Status mapping for Dagster to application status
 status_mapping = {
     "SUCCESS": "Completed",
@@ -187,10 +179,9 @@ def extract_legacy_output_paths(run_config: Dict) -> List[Dict[str, str]]:
         logger.warning(f"Legacy output path extraction failed: {str(e)}")
         return []
 
-def insert_run_logs_and_steps(db: Session, dagster_run_id: str, logs: List[Dict[str, Any]]) -> int:
-    """Insert or update logs into run_log and steps into run_step_status"""
-    log_count = 0
-
+def insert_run_logs_and_steps(db: Session, dagster_run_id: str, logs: List[Dict[str, Any]],
+                              event_cursor: Optional[str] = None) -> int:
+    """Insert or update logs into run_log and steps into run_step_status as one batch; the caller commits"""
     try:
         # Get run_id from workflow.run table
         run_info = db.execute(
@@ -201,153 +192,21 @@ def insert_run_logs_and_steps(db: Session, dagster_run_id: str, logs: List[Dict[
         if not run_info:
             raise HTTPException(status_code=404, detail=f"Run not found for dagster_run_id {dagster_run_id}")
 
-        run_id = run_info.id
-
-        for log in logs:
-            event_type = log.get("__typename", "UnknownEvent")
-            if event_type not in RELEVANT_EVENT_TYPES:
-                continue  # Skip irrelevant events
-
-            step_key = log.get("stepKey")
-            timestamp = None
-            try:
-                raw_ts = log.get("timestamp")
-                if raw_ts:
-                    timestamp = float(raw_ts) / 1000  # Convert ms → seconds
-            except (TypeError, ValueError):
-                pass
-
-            # --- STEP STATUS UPDATES ---
-            if step_key:
-                if event_type == "ExecutionStepStartEvent":
-                    db.execute(
-                        text("""
-                        INSERT INTO workflow.run_step_status (
-                            dagster_run_id, step_code, status, started_at, run_id
-                        ) VALUES (
-                            :dagster_run_id, :step_code, 'STARTED', to_timestamp(:timestamp), :run_id
-                        )
-                        ON CONFLICT (dagster_run_id, step_code)
-                        DO UPDATE SET
-                            status = EXCLUDED.status,
-                            started_at = EXCLUDED.started_at
-                        """),
-                        {
-                            "dagster_run_id": dagster_run_id,
-                            "step_code": step_key,
-                            "timestamp": timestamp,
-                            "run_id": run_id
-                        }
-                    )
-                elif event_type in ["ExecutionStepSuccessEvent", "ExecutionStepOutputEvent"]:
-                    db.execute(
-                        text("""
-                        UPDATE workflow.run_step_status
-                        SET status = 'SUCCESS',
-                            finished_at = to_timestamp(:timestamp),
-                            end_time = to_timestamp(:timestamp)
-                        WHERE dagster_run_id = :dagster_run_id AND step_code = :step_code
-                        """),
-                        {
-                            "dagster_run_id": dagster_run_id,
-                            "step_code": step_key,
-                            "timestamp": timestamp
-                        }
-                    )
-                elif event_type == "ExecutionStepFailureEvent":
-                    error = log.get("error", {})
-                    db.execute(
-                        text("""
-                        UPDATE workflow.run_step_status
-                        SET status = 'FAILURE',
-                            finished_at = to_timestamp(:timestamp),
-                            end_time = to_timestamp(:timestamp),
-                            error_message = :error_message
-                        WHERE dagster_run_id = :dagster_run_id AND step_code = :step_code
-                        """),
-                        {
-                            "dagster_run_id": dagster_run_id,
-                            "step_code": step_key,
-                            "timestamp": timestamp,
-                            "error_message": error.get("message", "Unknown error")
-                        }
-                    )
-
-            # --- LOG MESSAGE ---
-            if event_type == "MessageEvent":
-                message = log.get("message", "No message")
-                level = log.get("level", "INFO")
-            elif event_type == "ExecutionStepFailureEvent":
-                error = log.get("error", {})
-                message = error.get("message", "Step failed")
-                level = "ERROR"
-            elif event_type in ["ExecutionStepInputEvent", "ExecutionStepOutputEvent"]:
-                name = log.get("inputName") or log.get("outputName", "unknown")
-                type_check = log.get("typeCheck", {})
-                success = type_check.get("success", False)
-                message = f"{event_type} for {name}: {'Success' if success else 'Failed'}"
-                level = "INFO" if success else "ERROR"
-            else:
-                message = "Unknown event type"
-                level = "INFO"
-
-            # Insert into run_log
-            result = db.execute(
-                text("""
-                    INSERT INTO workflow.run_log (
-                        dagster_run_id,
-                        run_id,
-                        step_code,
-                        event_type,
-                        message,
-                        log_level,
-                        timestamp,
-                        event_data
-                    ) VALUES (
-                        :dagster_run_id,
-                        :run_id,
-                        :step_code,
-                        :event_type,
-                        :message,
-                        :log_level,
-                        CASE WHEN :timestamp IS NOT NULL THEN to_timestamp(:timestamp) ELSE NULL END,
-                        CAST(:event_data AS jsonb)
-                    )
-                    ON CONFLICT (dagster_run_id, event_type, timestamp)
-                    DO UPDATE SET
-                        step_code = EXCLUDED.step_code,
-                        message = EXCLUDED.message,
-                        log_level = EXCLUDED.log_level,
-                        event_data = EXCLUDED.event_data
-                    RETURNING id
-                """),
-                {
-                    "dagster_run_id": dagster_run_id,
-                    "run_id": run_id,
-                    "step_code": step_key,
-                    "event_type": event_type,
-                    "message": message,
-                    "log_level": level,
-                    "timestamp": timestamp,
-                    "event_data": json.dumps(log)
-                }
-            )
-            if result.fetchone():
-                log_count += 1
-
-        return log_count
+        return write_run_events(db.connection(), dagster_run_id, run_info.id, logs, event_cursor)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to insert logs and steps for {dagster_run_id}: {str(e)}")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to process logs and steps: {str(e)}")
 
 @router.post("/sync/{dagster_run_id}")
-async def sync_run_status_from_dagster(dagster_run_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+def sync_run_status_from_dagster(dagster_run_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Sync run status and logs from Dagster GraphQL API with dynamic output extraction"""
     try:
         query = """
-        query RunLogsQuery($runId: ID!) {
+        query RunLogsQuery($runId: ID!, $afterCursor: String) {
             pipelineRunOrError(runId: $runId) {
                 __typename
                 ... on Run {
@@ -364,7 +223,8 @@ async def sync_run_status_from_dagster(dagster_run_id: str, db: Session = Depend
                             key
                         }
                     }
-                    eventConnection {
+                    eventConnection(afterCursor: $afterCursor) {
+                        cursor
                         events {
                             __typename
                             ... on MessageEvent {
@@ -420,10 +280,15 @@ async def sync_run_status_from_dagster(dagster_run_id: str, db: Session = Depend
             }
         }
         """
+        # Resume after the last ingested event rather than re-reading the whole run
+        ingest_cursor = db.execute(
+            text("SELECT ingest_cursor FROM workflow.run WHERE dagster_run_id = :dagster_run_id"),
+            {"dagster_run_id": dagster_run_id}
+        ).scalar()
         dagster_url = f"http://{DAGSTER_HOST}:{DAGSTER_PORT}/graphql"
         request_body = {
             "query": query,
-            "variables": {"runId": dagster_run_id}
+            "variables": {"runId": dagster_run_id, "afterCursor": ingest_cursor}
         }
         response = requests.post(
             dagster_url,
@@ -465,8 +330,9 @@ async def sync_run_status_from_dagster(dagster_run_id: str, db: Session = Depend
             output_file_paths = extract_dynamic_output_paths(db, dagster_run_id, run_config)
             logger.debug(f"Extracted {len(output_file_paths)} output paths for run {dagster_run_id}: {output_file_paths}")
 
-        logs = run_data.get("eventConnection", {}).get("events", [])
-        log_count = insert_run_logs_and_steps(db, dagster_run_id, logs)
+        event_connection = run_data.get("eventConnection") or {}
+        logs = event_connection.get("events", [])
+        log_count = insert_run_logs_and_steps(db, dagster_run_id, logs, event_connection.get("cursor"))
 
         update_result = db.execute(
             text("""
@@ -494,6 +360,7 @@ async def sync_run_status_from_dagster(dagster_run_id: str, db: Session = Depend
                 media_type="application/json"
             )
 
+        notify_run_event(db, updated_record.id, "status")
         db.commit()
         logger.info(f"Updated run {dagster_run_id} to status {status}, processed {log_count} logs, stored {len(output_file_paths)} output paths")
         return {
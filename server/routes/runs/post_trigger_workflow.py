@@ -1,4 +1,5 @@
 from fastapi import APIRouter, File, UploadFile, Form, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import text  
 from typing import Dict, Any, List
@@ -9,8 +10,14 @@ import os
 import boto3
 from botocore.exceptions import ClientError
 from app.file_parser import parser_map
+from app.run_memo import (
+    get_dag_version, compute_run_fingerprint, find_memoized_run,
+    record_run_memo, memo_input_hashes
+)
 from ..get_health_check import get_db  
+from .get_run_config import validate_run_config, mark_config_valid
 import datetime
+import hashlib
 import requests
 
 logger = logging.getLogger(__name__)
@@ -44,7 +51,7 @@ def validate_workflow(workflow_id: int, db: Session) -> Dict[str, Any]:
                        config_template, default_parameters, parameters, resources_config,
                        dagster_location_name, dagster_repository_name, requires_file,
                        output_file_pattern, output_file_paths, supported_file_types, 
-                       destination_config, source_config
+                       destination_config, source_config, commit_sha
                 FROM workflow.workflow
                 WHERE id = :workflow_id AND status = 'Active'
             """),
@@ -72,7 +79,8 @@ def validate_workflow(workflow_id: int, db: Session) -> Dict[str, Any]:
             "output_file_paths": workflow_row.output_file_paths,      # New dynamic output config
             "supported_file_types": workflow_row.supported_file_types,
             "destination_config": workflow_row.destination_config,
-            "source_config": workflow_row.source_config
+            "source_config": workflow_row.source_config,
+            "commit_sha": workflow_row.commit_sha
         }
 
         json_fields = ["input_structure", "config_template", "default_parameters", "parameters", 
@@ -127,7 +135,8 @@ async def handle_single_file_upload(file: UploadFile, workflow: Dict[str, Any],
         file_name_part = file_config["name"] if file_config else "input"
         s3_key = f"runs/{workflow_id}/{file_name_part}_{timestamp}.{file_ext}"
 
-        s3_client.put_object(
+        await run_in_threadpool(
+            s3_client.put_object,
             Bucket=S3_BUCKET,
             Key=s3_key,
             Body=content,
@@ -138,7 +147,8 @@ async def handle_single_file_upload(file: UploadFile, workflow: Dict[str, Any],
         return {
             "path": f"{S3_BUCKET}/{s3_key}",
             "name": file_name_part,
-            "description": file_config.get("description", f"{file_name_part.replace('_', ' ').title()} input file") if file_config else "Input file"
+            "description": file_config.get("description", f"{file_name_part.replace('_', ' ').title()} input file") if file_config else "Input file",
+            "content_sha256": hashlib.sha256(content).hexdigest()
         }
     except ClientError as e:
         logger.error(f"S3 upload failed: {e.response['Error']['Message']}")
@@ -423,14 +433,19 @@ def create_run_record(db: Session, workflow_id: int, triggered_by: int, file_map
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create run record: {str(e)}")
 
-async def execute_dagster_workflow_direct(workflow: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, str]:
-    """Execute Dagster workflow via direct GraphQL API call"""
+def launch_dagster_run(workflow: Dict[str, Any], config: Dict[str, Any], http=requests) -> Dict[str, str]:
+    """Launch a Dagster run via GraphQL. Pass a requests.Session as http to reuse connections across launches"""
     try:
         workflow_id = workflow["id"]
         job_name = f"workflow_job_{workflow_id}"
         location_name = workflow.get("dagster_location_name", "server.app.dagster.repo")
         repository_name = workflow.get("dagster_repository_name", "__repository__")
 
+        # Configs with an already-validated shape skip this; a definite rejection saves a failed launch
+        valid, validation_message = validate_run_config(job_name, config, location_name, repository_name)
+        if valid is False:
+            raise HTTPException(status_code=400, detail=f"Config validation failed: {validation_message}")
+
         mutation = """
         mutation LaunchPipelineExecution(
             $repositoryLocationName: String!
@@ -498,7 +513,7 @@ async def execute_dagster_workflow_direct(workflow: Dict[str, Any], config: Dict
 
         dagster_url = f"http://{DAGSTER_HOST}:{DAGSTER_PORT}/graphql"
 
-        response = requests.post(
+        response = http.post(
             dagster_url,
             json={
                 "query": mutation,
@@ -534,6 +549,7 @@ async def execute_dagster_workflow_direct(workflow: Dict[str, Any], config: Dict
             run_id = run_info["runId"]
             status = run_info.get("status", "SUBMITTED")
             logger.info(f"Successfully submitted Dagster job {job_name} with run_id: {run_id}")
+            mark_config_valid(job_name, config, location_name)
             return {
                 "run_id": run_id,
                 "status": status
@@ -561,6 +577,8 @@ async def execute_dagster_workflow_direct(workflow: Dict[str, Any], config: Dict
             logger.error(error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
 
+    except HTTPException:
+        raise
     except requests.exceptions.RequestException as e:
         logger.error(f"HTTP request failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to connect to Dagster: {str(e)}")
@@ -568,6 +586,93 @@ async def execute_dagster_workflow_direct(workflow: Dict[str, Any], config: Dict
         logger.error(f"Error executing Dagster workflow: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
 
+def start_workflow_run(db: Session, workflow: Dict[str, Any], input_params: Dict[str, Any],
+                       input_paths: List[Dict[str, Any]], triggered_by: int, run_name: str,
+                       force_rerun: bool) -> Dict[str, Any]:
+    """Everything after the uploads: memo lookup, Dagster launch and run record.
+
+    All of it blocks (sync Session, GitHub and Dagster HTTP calls), so the async
+    trigger route runs it in the threadpool.
+    """
+    default_params = workflow.get("default_parameters", {})
+    run_params = {**default_params, **input_params}
+
+    # Fingerprint the trigger; skipped when the DAG version or an input hash is unknown
+    fingerprint = None
+    input_hashes = memo_input_hashes(input_paths)
+    dag_version = get_dag_version(workflow["id"], workflow.get("commit_sha"))
+    if input_hashes is not None and dag_version:
+        fingerprint = compute_run_fingerprint(workflow["id"], dag_version, input_hashes, run_params)
+
+    if fingerprint and not force_rerun:
+        memoized_run = find_memoized_run(db, fingerprint)
+        if memoized_run:
+            logger.info(f"Reusing run {memoized_run['id']} for workflow {workflow['id']} (fingerprint {fingerprint[:12]})")
+            return {
+                "success": True,
+                "memoized": True,
+                "run_id": memoized_run["id"],
+                "status": memoized_run["status"],
+                "dagster_run_id": memoized_run["dagster_run_id"],
+                "workflow_name": workflow["name"],
+                "workflow_id": workflow["id"],
+                "run_name": memoized_run["run_name"],
+                "started_at": memoized_run["started_at"].isoformat() if memoized_run["started_at"] else None,
+                "finished_at": memoized_run["finished_at"].isoformat() if memoized_run["finished_at"] else None,
+                "output_file_path": memoized_run["output_file_path"],
+                "message": f"Identical run {memoized_run['id']} already completed; returning its outputs. Set force_rerun to run again.",
+                "input_file_paths": input_paths
+            }
+
+    dagster_config = build_dagster_config(workflow, input_paths, run_params)
+    execution_result = launch_dagster_run(workflow, dagster_config)
+
+    run_record = create_run_record(
+        db, workflow["id"], triggered_by, input_paths,
+        execution_result["run_id"], execution_result["status"], dagster_config, run_name
+    )
+
+    if fingerprint:
+        record_run_memo(db, fingerprint, workflow["id"], run_record["id"])
+
+    output_path = None
+    output_file_url = None
+
+    for op_name, op_config in dagster_config.get("ops", {}).items():
+        if "save_epc_report" in op_name and "config" in op_config:
+            output_path = op_config["config"].get("output_path")
+            if output_path:
+                output_file_url = s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={
+                        'Bucket': S3_BUCKET,
+                        'Key': output_path.replace(f"{S3_BUCKET}/", "")
+                    },
+                    ExpiresIn=3600
+                )
+            break
+
+    response = {
+        "success": True,
+        "memoized": False,
+        "run_id": run_record["id"],
+        "status": run_record["status"],
+        "dagster_run_id": run_record["dagster_run_id"],
+        "workflow_name": workflow["name"],
+        "workflow_id": workflow["id"],
+        "run_name": run_name,
+        "started_at": run_record["started_at"].isoformat() if run_record.get("started_at") else None,
+        "message": f"Workflow '{workflow['name']}' triggered successfully with status: {execution_result['status']}",
+        "input_file_paths": input_paths
+    }
+
+    if output_file_url:
+        response["output_file_url"] = output_file_url
+        response["expected_output_path"] = output_path
+
+    logger.info(f"Successfully triggered workflow {workflow['id']} with run ID {run_record['id']}")
+    return response
+
 @router.post("/trigger")
 async def trigger_workflow_run(
     workflow_id: int = Form(...),
@@ -576,78 +681,37 @@ async def trigger_workflow_run(
     parameters: str = Form("{}"),
     file: UploadFile = File(None),
     file_mapping: str = Form("{}"),
+    force_rerun: bool = Form(False),
     request: Request = None,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
-    """Trigger a workflow run with support for multiple files"""
+    """Trigger a workflow run with support for multiple files.
+
+    If an identical run (same DAG version, input contents and parameters) already
+    completed, its outputs are returned instead of launching a new run, unless
+    force_rerun is set.
+    """
     try:
-        workflow = validate_workflow(workflow_id, db)
+        workflow = await run_in_threadpool(validate_workflow, workflow_id, db)
         input_params = json.loads(parameters)
         
         if workflow.get("parameters"):
             validate_parameters(input_params, workflow["parameters"])
 
-        # Handle multiple files
+        # Handle multiple files; only the upload reads stay on the event loop
         input_paths = await handle_multiple_file_uploads(workflow, file, file_mapping, request)
         
         # Validate required files
         validate_required_files(workflow, input_paths)
 
-        default_params = workflow.get("default_parameters", {})
-        run_params = {**default_params, **input_params}
-
-        dagster_config = build_dagster_config(workflow, input_paths, run_params)
-        execution_result = await execute_dagster_workflow_direct(workflow, dagster_config)
-
-        # Store input_paths as JSON in database
-        input_paths_json = json.dumps(input_paths) if input_paths else ""
-        
-        run_record = create_run_record(
-            db, workflow["id"], triggered_by, input_paths,
-            execution_result["run_id"], execution_result["status"], dagster_config, run_name
+        return await run_in_threadpool(
+            start_workflow_run, db, workflow, input_params, input_paths, triggered_by, run_name, force_rerun
         )
 
-        output_path = None
-        output_file_url = None
-
-        for op_name, op_config in dagster_config.get("ops", {}).items():
-            if "save_epc_report" in op_name and "config" in op_config:
-                output_path = op_config["config"].get("output_path")
-                if output_path:
-                    output_file_url = s3_client.generate_presigned_url(
-                        'get_object',
-                        Params={
-                            'Bucket': S3_BUCKET,
-                            'Key': output_path.replace(f"{S3_BUCKET}/", "")
-                        },
-                        ExpiresIn=3600
-                    )
-                break
-
-        response = {
-            "success": True,
-            "run_id": run_record["id"],
-            "status": run_record["status"],
-            "dagster_run_id": run_record["dagster_run_id"],
-            "workflow_name": workflow["name"],
-            "workflow_id": workflow["id"],
-            "run_name": run_name,
-            "started_at": run_record["started_at"].isoformat() if run_record.get("started_at") else None,
-            "message": f"Workflow '{workflow['name']}' triggered successfully with status: {execution_result['status']}",
-            "input_file_paths": input_paths
-        }
-
-        if output_file_url:
-            response["output_file_url"] = output_file_url
-            response["expected_output_path"] = output_path
-
-        logger.info(f"Successfully triggered workflow {workflow_id} with run ID {run_record['id']}")
-        return response
-
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Workflow run failed: {str(e)}")
         if 'db' in locals():
-            db.rollback()
+            await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
\ No newline at end of file
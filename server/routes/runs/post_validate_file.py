@@ -1,6 +1,8 @@
 from fastapi import APIRouter, File, UploadFile, Form, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
+import asyncio
 import json
 import logging
 import pandas as pd
@@ -145,6 +147,11 @@ def validate_file_structure(df: pd.DataFrame, expected_structure: List[Dict[str,
         logger.error(f"File structure validation failed for {filename} ({file_name}): {str(e)}")
         raise HTTPException(status_code=400, detail=f"File structure validation failed for {filename} ({file_name}): {str(e)}")
 
+def parse_and_validate(parser, content: bytes, parse_kwargs: Dict[str, Any], expected_structure: List[Dict[str, Any]], filename: str, file_name: str) -> None:
+    """Parse and check a file off the event loop; the parsers only wrap blocking pandas calls"""
+    df = asyncio.run(parser.parse(content, **parse_kwargs))
+    validate_file_structure(df, expected_structure, filename, file_name)
+
 async def validate_single_file(file: UploadFile, workflow: Dict[str, Any], file_config: Dict[str, Any] = None) -> Dict[str, Any]:
     """Validate the structure of a single uploaded file in memory"""
     if not file or not file.filename:
@@ -184,11 +191,12 @@ async def validate_single_file(file: UploadFile, workflow: Dict[str, Any], file_
         content = await file.read()
         # Sample up to 100 rows for CSVs only for validation
         parse_kwargs = {"nrows": 100} if file_ext == "csv" else {}
-        df = await parser_map[file_ext].parse(content, **parse_kwargs)
-
         # Get the structure from the file_config
         expected_structure = file_config.get("structure", []) if file_config else []
-        validate_file_structure(df, expected_structure, file.filename, file_name)
+        await run_in_threadpool(
+            parse_and_validate, parser_map[file_ext], content, parse_kwargs,
+            expected_structure, file.filename, file_name
+        )
 
         response = {
             "name": file_name,
@@ -216,7 +224,7 @@ async def validate_file_structure_endpoint(
 ) -> Dict[str, Any]:
     """Validate the structure of uploaded files against the workflow's expected schema"""
     try:
-        workflow = validate_workflow(workflow_id, db)
+        workflow = await run_in_threadpool(validate_workflow, workflow_id, db)
         input_config = workflow.get("input_file_path", [])
         
         # Validate required files
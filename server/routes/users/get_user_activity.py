@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict
-from ..get_health_check import get_db
+from ..get_health_check import get_async_db
 from sqlalchemy import text
 import logging
 
@@ -13,17 +13,18 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def get_user_recent_activity(
     user_id: int = Query(..., description="ID of the user"),
     limit: int = Query(3, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> List[Dict]:
     """
     Get recent activity for a specific user using the PostgreSQL function.
     Returns list of runs with status, workflow name, ID, user, time, and latest activity.
+    The function reads the user's latest runs straight off (triggered_by, last_activity DESC).
     """
     try:
         logger.info(f"Fetching recent activity for user {user_id}, limit={limit}")
 
         # Call the PostgreSQL function directly
-        result = db.execute(
+        result = await db.execute(
             text("""
                 SELECT * FROM workflow.get_recent_activity(:user_id, :limit)
             """),
@@ -37,6 +38,8 @@ async def get_user_recent_activity(
 
         return rows
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch recent activity for user {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
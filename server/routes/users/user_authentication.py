@@ -1,13 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import logging
-from ..get_health_check import get_db
+from ..get_health_check import get_async_db
 from fastapi import Body
 logger = logging.getLogger(__name__)
 
@@ -72,16 +72,16 @@ def verify_token(token: str):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 @router.post("/user/authenticate", response_model=TokenResponse)
-async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)):
+async def authenticate_user(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
     email = user_login.email_address
     password = user_login.password
 
     try:
         # Check if user exists (before checking locked status)
-        user_exists = db.execute(
+        user_exists = (await db.execute(
             text("SELECT EXISTS(SELECT 1 FROM workflow.\"user\" WHERE email = :email)"),
             {"email": email}
-        ).scalar()
+        )).scalar()
 
         if not user_exists:
             raise HTTPException(
@@ -94,7 +94,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
             )
 
         # Check if user is locked
-        locked_user = db.execute(
+        locked_user = (await db.execute(
             text("""
                 SELECT is_locked, locked_until 
                 FROM workflow."user" 
@@ -103,7 +103,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
                 AND locked_until > CURRENT_TIMESTAMP
             """),
             {"email": email}
-        ).fetchone()
+        )).fetchone()
 
         if locked_user:
             raise HTTPException(
@@ -117,7 +117,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
             )
 
         # Validate login
-        result = db.execute(
+        result = await db.execute(
             text("SELECT * FROM workflow.validate_login(:email, :password)"),
             {"email": email, "password": password}
         )
@@ -125,7 +125,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
 
         if not user:
             # Track failed login attempts
-            failed_attempts_result = db.execute(
+            failed_attempts_result = await db.execute(
                 text("""
                     UPDATE workflow."user"
                     SET
@@ -162,7 +162,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
             raise HTTPException(status_code=401, detail=detail)
 
         # Reset failed attempts on success
-        db.execute(
+        await db.execute(
             text("""
                 UPDATE workflow."user"
                 SET
@@ -175,7 +175,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
         )
 
         # Delete existing refresh tokens for the user to prevent multi-tab conflicts
-        db.execute(
+        await db.execute(
             text("DELETE FROM workflow.refresh_tokens WHERE user_id = :user_id"),
             {"user_id": user.user_id}
         )
@@ -191,10 +191,10 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
         )
 
         # Store new refresh token in database
-        db.execute(
+        await db.execute(
             text("""
                 INSERT INTO workflow.refresh_tokens (user_id, token, expires_at)
-                VALUES (:user_id, :token, :expires_at)
+                VALUES (:user_id, :token, CAST(:expires_at AS timestamptz))
             """),
             {
                 "user_id": user.user_id,
@@ -202,7 +202,7 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
                 "expires_at": datetime.now(timezone.utc) + refresh_token_expires
             }
         )
-        db.commit()
+        await db.commit()
 
         return {
             "access_token": access_token,
@@ -215,10 +215,10 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
         }
 
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as err:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error during login: {str(err)}", exc_info=True)
         raise HTTPException(
             status_code=500,
@@ -229,23 +229,24 @@ async def authenticate_user(user_login: UserLogin, db: Session = Depends(get_db)
         )
     
 @router.post("/user/refresh")
-async def refresh_token(refresh_token: str = Body(..., embed=True), db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str = Body(..., embed=True), db: AsyncSession = Depends(get_async_db)):
     try:
         payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-        token_data = db.execute(
+        token_data = (await db.execute(
             text("""
-                SELECT expires_at 
+                SELECT expires_at, expires_at > CURRENT_TIMESTAMP AS is_valid
                 FROM workflow.refresh_tokens 
                 WHERE user_id = :user_id AND token = :token
             """),
             {"user_id": int(user_id), "token": refresh_token}
-        ).fetchone()
+        )).fetchone()
 
-        if not token_data or token_data.expires_at < datetime.now(timezone.utc):
+        # Compared in SQL: expires_at is a timestamp without time zone
+        if not token_data or not token_data.is_valid:
             raise HTTPException(status_code=401, detail="Refresh token expired or invalid")
 
         access_token = create_access_token(
@@ -262,21 +263,21 @@ async def verify_user(credentials: HTTPAuthorizationCredentials = Security(secur
     return {"user_id": token_data["user_id"], "status": "authenticated"}
 
 @router.post("/user/logout")
-async def logout_user(request: LogoutRequest, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+async def logout_user(request: LogoutRequest, credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_async_db)):
     try:
         # Verify access token
         token_data = verify_token(credentials.credentials)
         user_id = int(token_data["user_id"])
 
         # Delete refresh token from database
-        result = db.execute(
+        result = await db.execute(
             text("""
                 DELETE FROM workflow.refresh_tokens 
                 WHERE user_id = :user_id AND token = :token
             """),
             {"user_id": user_id, "token": request.refresh_token}
         )
-        db.commit()
+        await db.commit()
 
         if result.rowcount == 0:
             logger.warning(f"No refresh token found for user_id {user_id}")
@@ -285,6 +286,6 @@ async def logout_user(request: LogoutRequest, credentials: HTTPAuthorizationCred
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid access token")
     except Exception as err:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error during logout: {str(err)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
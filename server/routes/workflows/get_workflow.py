@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
-from ..get_health_check import get_db
+from ..get_health_check import get_async_db
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
@@ -11,13 +11,13 @@ router = APIRouter(prefix="/workflows", tags=["workflows"])
 @router.get("/workflow/{workflow_id}")
 async def get_workflow(
     workflow_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get workflow details including steps and destination"""
     try:
         logger.info(f"Fetching workflow {workflow_id}")
         # Get workflow metadata including new columns
-        workflow = db.execute(
+        workflow = (await db.execute(
             text("""
              SELECT a.id, name, description, status, schedule, last_run_at, 
                     next_run_at, input_structure, parameters, config_template,
@@ -29,14 +29,14 @@ async def get_workflow(
                 WHERE a.id = :id
             """),
             {"id": workflow_id}
-        ).fetchone()
+        )).fetchone()
 
         if not workflow:
             logger.error(f"Workflow {workflow_id} not found")
             raise HTTPException(404, "Workflow not found")
 
         # Get recent runs
-        runs = db.execute(
+        runs = (await db.execute(
             text("""
                 SELECT a.id, status, started_at, finished_at, 
                        CONCAT(first_name, ' ', surname) as triggered_by_name, duration_ms
@@ -47,12 +47,26 @@ async def get_workflow(
                 LIMIT 5
             """),
             {"workflow_id": workflow_id}
-        ).fetchall()
+        )).fetchall()
+
+        # Run statistics are maintained on write by the trg_workflow_run_stats trigger
+        stats = (await db.execute(
+            text("""
+                SELECT total_runs, successful_runs, failed_runs, last_run_at, last_status, avg_duration_ms
+                FROM workflow.workflow_run_stats
+                WHERE workflow_id = :workflow_id
+            """),
+            {"workflow_id": workflow_id}
+        )).fetchone()
 
         logger.info(f"Workflow {workflow_id} retrieved successfully")
         return {
             "workflow": dict(workflow._mapping),
-            "recent_runs": [dict(run._mapping) for run in runs]
+            "recent_runs": [dict(run._mapping) for run in runs],
+            "stats": dict(stats._mapping) if stats else {
+                "total_runs": 0, "successful_runs": 0, "failed_runs": 0,
+                "last_run_at": None, "last_status": None, "avg_duration_ms": None
+            }
         }
 
     except HTTPException:
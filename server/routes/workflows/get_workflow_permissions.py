@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
 @router.get("/")
-async def get_workflows(db: Session = Depends(get_db)):
+def get_workflows(db: Session = Depends(get_db)):
     """
     Get all workflows.
     """
@@ -29,7 +29,7 @@ async def get_workflows(db: Session = Depends(get_db)):
         raise HTTPException(500, f"Failed to fetch workflows: {str(e)}")
 
 @router.get("/permissions")
-async def get_workflow_permissions(
+def get_workflow_permissions(
     workflow_id: int = Query(None, description="Filter by workflow_id"),
     db: Session = Depends(get_db)
 ):
@@ -69,7 +69,7 @@ async def get_workflow_permissions(
         raise HTTPException(500, f"Failed to fetch permissions: {str(e)}")
 
 @router.post("/permissions")
-async def add_workflow_permission(
+def add_workflow_permission(
     permission: dict,
     db: Session = Depends(get_db)
 ):
@@ -97,7 +97,7 @@ async def add_workflow_permission(
         raise HTTPException(500, f"Failed to add permission: {str(e)}")
 
 @router.delete("/permissions/{permission_id}")
-async def remove_workflow_permission(
+def remove_workflow_permission(
     permission_id: int,
     db: Session = Depends(get_db)
 ):
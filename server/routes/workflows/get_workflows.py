@@ -1,48 +1,47 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
-from ..get_health_check import get_db
+from ..get_health_check import get_async_read_db
+from app.search import workflow_search_clause
+from app.pagination import decode_cursor, encode_cursor, keyset_clauses, keyset_page, count_rows
+from app.list_query import ListQuery, split_values
 from sqlalchemy import text
-from typing import Optional, List
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
 @router.get("/filter-options")
-async def get_filter_options(db: Session = Depends(get_db)):
-    """Get unique filter options for workflows"""
+async def get_filter_options(db: AsyncSession = Depends(get_async_read_db)):
+    """Get unique filter options for workflows from the trigger-maintained workflow.filter_option table"""
     try:
         logger.info("Fetching filter options")
-        
-        # Fetch unique statuses
-        statuses = db.execute(
-            text("SELECT DISTINCT status FROM workflow.workflow WHERE status IS NOT NULL")
-        ).fetchall()
-        statuses = [row[0] for row in statuses]
 
-        # Fetch unique owners
-        owners = db.execute(
+        # Fetch unique statuses
+        statuses = (await db.execute(
             text("""
-                SELECT DISTINCT CONCAT(b.first_name, ' ', b.surname) as owner
-                FROM workflow.workflow a
-                LEFT JOIN workflow.user b ON a.created_by = b.id
-                WHERE b.first_name IS NOT NULL AND b.surname IS NOT NULL
+                SELECT value FROM workflow.filter_option
+                WHERE scope = 'workflow' AND kind = 'status' AND ref_count > 0
+                ORDER BY value
             """)
-        ).fetchall()
-        owners = [row[0] for row in owners]
+        )).fetchall()
+        statuses = [row[0] for row in statuses]
 
-        # Fetch unique group names
-        group_names = db.execute(
+        # Fetch unique owners and their groups; names are joined at read time so user updates show up immediately
+        owners_and_groups = (await db.execute(
             text("""
-                SELECT DISTINCT d."name" as group_name
-                FROM workflow.workflow a
-                LEFT JOIN workflow.user b ON a.created_by = b.id
+                SELECT CONCAT(b.first_name, ' ', b.surname) as owner,
+                       b.first_name IS NOT NULL AND b.surname IS NOT NULL as has_name,
+                       d."name" as group_name
+                FROM workflow.filter_option f
+                JOIN workflow.user b ON b.id = f.value::bigint
                 LEFT JOIN workflow.user_group d ON b.user_group_id = d.id
-                WHERE d."name" IS NOT NULL
+                WHERE f.scope = 'workflow' AND f.kind = 'created_by' AND f.ref_count > 0
             """)
-        ).fetchall()
-        group_names = [row[0] for row in group_names]
+        )).fetchall()
+        owners = sorted({row.owner for row in owners_and_groups if row.has_name})
+        group_names = sorted({row.group_name for row in owners_and_groups if row.group_name is not None})
 
         logger.info("Filter options retrieved successfully")
         return {
@@ -55,6 +54,14 @@ async def get_filter_options(db: Session = Depends(get_db)):
         logger.error(f"Failed to fetch filter options: {str(e)}")
         raise HTTPException(500, f"Failed to fetch filter options: {str(e)}")
 
+# sort_by -> (cursor sort key, SQL column, result field, descending)
+WORKFLOW_SORTS = {
+    'Newest first': ('created_at_desc', 'a.created_at', 'created_at', True),
+    'Oldest first': ('created_at_asc', 'a.created_at', 'created_at', False),
+    'A-Z': ('name_asc', 'a.name', 'name', False),
+    'Z-A': ('name_desc', 'a.name', 'name', True)
+}
+
 @router.get("/")
 async def list_workflows(
     page: int = Query(1, ge=1),
@@ -65,88 +72,67 @@ async def list_workflows(
     owner: Optional[str] = None,
     group_name: Optional[str] = None,
     sort_by: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque next/prev cursor from a previous page"),
+    count: str = Query("estimate", pattern="^(exact|estimate|none)$"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """List all workflows with pagination, filtering, and sorting"""
+    """List all workflows with pagination, filtering, and sorting.
+
+    Pass `cursor` from a previous response for keyset pagination; `page` is only used without one.
+    """
     try:
         logger.info(f"Listing workflows, page {page}, limit {limit}, user_id={user_id}")
-        offset = (page - 1) * limit
+        sort_key, sort_column, sort_field, descending = WORKFLOW_SORTS.get(sort_by, WORKFLOW_SORTS['Newest first'])
+        try:
+            decoded_cursor = decode_cursor(cursor, sort_key) if cursor else None
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+        # Joins and filters shared by the page and the total; list filters bind one array each
+        list_query = ListQuery("FROM workflow.workflow a", {
+            "s": "LEFT JOIN workflow.workflow_run_stats s ON a.id = s.workflow_id",
+            "c": "LEFT JOIN workflow.user c ON a.created_by = c.id",
+            "d": "LEFT JOIN workflow.user_group d ON c.user_group_id = d.id",
+        })
+
+        # Apply user filter; only workflows with at least one permission are listed
+        if user_id is not None:
+            list_query.where(
+                "EXISTS (SELECT 1 FROM workflow.workflow_permission e WHERE e.workflow_id = a.id AND e.user_id = :user_id)",
+                {"user_id": user_id}
+            )
+        else:
+            list_query.where("EXISTS (SELECT 1 FROM workflow.workflow_permission e WHERE e.workflow_id = a.id)")
 
-        # Base query
-        query = """
+        # Apply filters
+        if search and search.strip():
+            list_query.where(*workflow_search_clause(search))
+        list_query.any_of("a.status", "statuses", split_values(status))
+        list_query.any_of("CONCAT(c.first_name, ' ', c.surname)", "owners", split_values(owner), joins=("c",))
+        list_query.any_of('d."name"', "group_names", split_values(group_name), joins=("c", "d"))
+
+        # Apply sorting and pagination; cursors seek on (sort column, id) instead of skipping rows
+        keyset_where, order_by, keyset_params, backwards = keyset_clauses(sort_column, "a.id", descending, decoded_cursor)
+        query = f"""
             SELECT a.id, a.name, a.description, a.status, a.created_at, a.destination,
-                   MAX(b.started_at) as last_run,
+                   s.last_run_at as last_run, s.last_status as last_run_status,
+                   COALESCE(s.total_runs, 0) as total_runs,
                    CONCAT(c.first_name, ' ', c.surname) as owner,
                    c.id as owner_id, d."name" as group_name
-            FROM workflow.workflow a
-            LEFT JOIN workflow.run b ON a.id = b.workflow_id
-            LEFT JOIN workflow.user c ON a.created_by = c.id
-            LEFT JOIN workflow.user_group d ON c.user_group_id = d.id
-            INNER JOIN workflow.workflow_permission e ON a.id = e.workflow_id
-            WHERE 1=1
+            {list_query.from_where()}{keyset_where}
+            ORDER BY {order_by}
+            LIMIT :limit OFFSET :offset
         """
-        count_query = """
-            SELECT COUNT(*)
-            FROM workflow.workflow a
-            LEFT JOIN workflow.user c ON a.created_by = c.id
-            LEFT JOIN workflow.user_group d ON c.user_group_id = d.id
-            LEFT JOIN workflow.workflow_permission e ON a.id = e.workflow_id
-            WHERE 1=1
-        """
-        params = {"limit": limit, "offset": offset}
-
-        # Apply user filter
-        if user_id is not None:
-            query += " AND e.user_id = :user_id"
-            count_query += " AND e.user_id = :user_id"
-            params["user_id"] = user_id
-
-        # Apply filters
-        if search:
-            query += " AND (a.name ILIKE :search OR a.description ILIKE :search OR a.id::text ILIKE :search)"
-            count_query += " AND (a.name ILIKE :search OR a.description ILIKE :search OR a.id::text ILIKE :search)"
-            params["search"] = f"%{search}%"
-
-        if status:
-            status_list = status.split(',')
-            query += f" AND a.status IN ({','.join([':status' + str(i) for i in range(len(status_list))])})"
-            count_query += f" AND a.status IN ({','.join([':status' + str(i) for i in range(len(status_list))])})"
-            for i, s in enumerate(status_list):
-                params[f"status{i}"] = s.strip()
-
-        if owner:
-            owner_list = owner.split(',')
-            query += f" AND CONCAT(c.first_name, ' ', c.surname) IN ({','.join([':owner' + str(i) for i in range(len(owner_list))])})"
-            count_query += f" AND CONCAT(c.first_name, ' ', c.surname) IN ({','.join([':owner' + str(i) for i in range(len(owner_list))])})"
-            for i, o in enumerate(owner_list):
-                params[f"owner{i}"] = o.strip()
-
-        if group_name:
-            group_name_list = group_name.split(',')
-            query += f" AND d.\"name\" IN ({','.join([':group_name' + str(i) for i in range(len(group_name_list))])})"
-            count_query += f" AND d.\"name\" IN ({','.join([':group_name' + str(i) for i in range(len(group_name_list))])})"
-            for i, g in enumerate(group_name_list):
-                params[f"group_name{i}"] = g.strip()
-
-        # Apply sorting
-        sort_mapping = {
-            'Newest first': 'a.created_at DESC',
-            'Oldest first': 'a.created_at ASC',
-            'A-Z': 'a.name ASC',
-            'Z-A': 'a.name DESC'
-        }
-        sort_clause = sort_mapping.get(sort_by, 'a.created_at DESC')
-        query += f" GROUP BY a.id, a.name, a.description, a.status, a.created_at, a.destination, c.first_name, c.surname, c.id, d.\"name\" ORDER BY {sort_clause}"
-
-        # Add pagination
-        query += " LIMIT :limit OFFSET :offset"
+        # OFFSET is always bound (0 with a cursor) so the statement text doesn't change with the page
+        offset = (page - 1) * limit if not decoded_cursor and page > 1 else 0
+        page_params = {**list_query.params, **keyset_params, "limit": limit + 1, "offset": offset}
 
         # Execute queries
-        result = db.execute(text(query), params)
-        workflows = [dict(row._mapping) for row in result.fetchall()]
-
-        count_result = db.execute(text(count_query), params)
-        total = count_result.scalar()
+        rows = [dict(row._mapping) for row in (await db.execute(text(query), page_params)).fetchall()]
+        workflows, next_cursor, prev_cursor = keyset_page(rows, limit, sort_key, sort_field, decoded_cursor, backwards)
+        if not decoded_cursor and page > 1 and workflows:
+            prev_cursor = encode_cursor(sort_key, workflows[0][sort_field], workflows[0]["id"], "prev")
+        total, total_is_estimate = await count_rows(db, list_query.count_query(), list_query.params, count)
 
         logger.info(f"Retrieved {len(workflows)} workflows, total {total}")
         return {
@@ -155,10 +141,15 @@ async def list_workflows(
                 "page": page,
                 "limit": limit,
                 "total": total,
-                "pages": (total + limit - 1) // limit
+                "total_is_estimate": total_is_estimate,
+                "pages": (total + limit - 1) // limit if total is not None else None,
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch workflows: {str(e)}")
-        raise HTTPException(500, f"Failed to fetch workflows: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Failed to fetch workflows: {str(e)}")
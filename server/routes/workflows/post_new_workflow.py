@@ -949,7 +949,7 @@ def {workflow.etl_config.functionName}(df: pd.DataFrame, parameters: Optional[Di
         return None
 
 @router.post("/workflow/create-full")
-async def create_full_workflow_with_dag(
+def create_full_workflow_with_dag(
     workflow: FullWorkflowCreate,
     db: Session = Depends(get_db)
 ):
@@ -1312,7 +1312,7 @@ def workflow_job_{actual_workflow_id}():
         raise HTTPException(500, f"Workflow creation failed: {str(e)}")
 
 @router.post("/workflow/{workflow_id}/update-etl")
-async def update_workflow_etl_logic(
+def update_workflow_etl_logic(
     workflow_id: int,
     etl_logic: str,
     function_name: Optional[str] = "process_data",
@@ -1427,7 +1427,7 @@ def {function_name}(df: pd.DataFrame, parameters: Optional[Dict[str, Any]] = Non
         raise HTTPException(500, f"Failed to update ETL logic: {str(e)}")
 
 @router.get("/workflow/{workflow_id}/dag-preview")
-async def get_workflow_dag_preview(
+def get_workflow_dag_preview(
     workflow_id: int,
     db: Session = Depends(get_db)
 ):
@@ -1483,7 +1483,7 @@ async def get_workflow_dag_preview(
         raise HTTPException(500, f"Failed to generate DAG preview: {str(e)}")
 
 @router.get("/workflow/{workflow_id}/etl-template")
-async def get_etl_template(
+def get_etl_template(
     workflow_id: int,
     processing_type: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -30,7 +30,7 @@ class ConfigTemplateUpdate(BaseModel):
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
 @router.patch("/workflow/update")
-async def update_workflow(
+def update_workflow(
     workflow_update: WorkflowUpdate,
     db: Session = Depends(get_db)
 ):
@@ -72,7 +72,7 @@ async def update_workflow(
         raise HTTPException(500, f"Workflow update failed: {str(e)}")
 
 @router.patch("/workflow/update_parameters")
-async def update_workflow_parameters(
+def update_workflow_parameters(
     params_update: ParametersUpdate,
     db: Session = Depends(get_db)
 ):
@@ -110,7 +110,7 @@ async def update_workflow_parameters(
         raise HTTPException(500, f"Workflow parameters update failed: {str(e)}")
 
 @router.patch("/workflow/update_destination_config")
-async def update_workflow_destination_config(
+def update_workflow_destination_config(
     config_update: DestinationConfigUpdate,
     db: Session = Depends(get_db)
 ):
@@ -148,7 +148,7 @@ async def update_workflow_destination_config(
         raise HTTPException(500, f"Workflow destination config update failed: {str(e)}")
     
 @router.patch("/workflow/update_config_template")
-async def update_workflow_config_template(
+def update_workflow_config_template(
     config_template_update: ConfigTemplateUpdate,
     db: Session = Depends(get_db)
 ):
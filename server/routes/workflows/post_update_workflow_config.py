@@ -26,7 +26,7 @@ def encrypt_token(token: str) -> str:
         raise HTTPException(status_code=500, detail=f"Failed to encrypt token: {str(e)}")
 
 @router.post("/{workflow_id}/destination_config")
-async def update_destination_config(
+def update_destination_config(
     workflow_id: int,
     api_url: str = Form(...),
     api_token: str = Form(...),
@@ -18,7 +18,7 @@ class WorkflowDestinationCreate(BaseModel):
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
 @router.post("/workflow/{workflow_id}/destination")
-async def set_workflow_destination(
+def set_workflow_destination(
     workflow_id: int,
     destination: WorkflowDestinationCreate,
     db: Session = Depends(get_db)